@@ -16,18 +16,23 @@ from fastapi import (
     HTTPException,
 )
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from starlette.concurrency import run_in_threadpool
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from ...db import get_db
+from ...core import changes
+from ...core.templates import templates
+from ...db import get_db, get_read_db, run_db, run_db_write
 from ...models.event import Event, EventType
 from ...models.pilot import Pilot
 from ...models.qualification import QualificationResult
 from ...models.bracket import BracketRace, BracketRaceResult
-from ...utils.formatting import format_ms
+from ...services import bracket, import_jobs, posters
+from ...services.pilot_stats import event_pilot_ids, refresh_event_pilot_stats
+from ...services.rh_import import resolve_pilots
+from ...services.standings import recompute_event_standings
 
 
 # --- простая Basic-авторизация admin/admin ------------------------
@@ -54,9 +59,6 @@ router = APIRouter(
     dependencies=[Depends(admin_auth)],
 )
 
-templates = Jinja2Templates(directory="backend/app/templates")
-templates.env.filters["format_ms"] = format_ms
-
 
 # ----------------------------------------------------------------
 # helpers
@@ -73,14 +75,189 @@ def get_or_create_pilot(db: Session, nickname: str) -> Pilot:
     return p
 
 
+def _all_events(db: Session) -> list[Event]:
+    stmt = select(Event).order_by(Event.date.desc())
+    return list(db.scalars(stmt).all())
+
+
+def _save_new_event(db: Session, event: Event) -> int:
+    db.add(event)
+    db.flush()
+    # id — до commit: чтение после него снова заняло бы соединение писателя
+    # до конца запроса (notify, задача импорта), а воркеру оно нужно сразу
+    event_id = event.id
+    db.commit()
+    return event_id
+
+
+def _load_event_for_edit(
+    db: Session, event_id: int
+) -> tuple[Event, list[QualificationResult]] | None:
+    # всё, что трогает шаблон, грузим заранее: шаблон рендерится в event loop
+    event = db.scalar(
+        select(Event)
+        .where(Event.id == event_id)
+        .options(
+            selectinload(Event.bracket_races)
+            .selectinload(BracketRace.results)
+            .joinedload(BracketRaceResult.pilot)
+        )
+    )
+    if not event:
+        return None
+
+    stmt = (
+        select(QualificationResult)
+        .where(QualificationResult.event_id == event_id)
+        .options(joinedload(QualificationResult.pilot))
+        .order_by(QualificationResult.rank.asc())
+    )
+    qualification = list(db.scalars(stmt).all())
+    return event, qualification
+
+
+def _update_event(db: Session, event_id: int, name: str | None, poster: str | None) -> bool:
+    event = db.get(Event, event_id)
+    if not event:
+        return False
+
+    event.name = name or event.name
+    if poster is not None:
+        event.poster = poster
+    db.commit()
+    return True
+
+
+async def _store_poster(upload: Any) -> str | None:
+    """Сохраняет афишу из формы (services.posters); None — файл не выбран."""
+    if upload is None or not getattr(upload, "filename", None):
+        return None
+    try:
+        # копирование и уменьшение — блокирующий ввод-вывод, не в event loop
+        return await run_in_threadpool(posters.save_poster, upload.file)
+    except posters.PosterError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    finally:
+        await upload.close()
+
+
+async def _spool_rh_json(upload: Any) -> tuple[str, int] | None:
+    """Кладёт RH JSON из формы в спул импорта; None — файл не выбран."""
+    if upload is None or not getattr(upload, "filename", None):
+        return None
+    try:
+        return await run_in_threadpool(import_jobs.spool_file, upload.file)
+    except import_jobs.ImportJobError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    finally:
+        await upload.close()
+
+
+def _create_bracket(db: Session, event_id: int, size: int) -> bool:
+    """Создаёт сетку и рассаживает топ квалификации. False — если события нет."""
+    event = db.get(Event, event_id)
+    if not event:
+        return False
+
+    existing = db.scalar(
+        select(BracketRace).where(BracketRace.event_id == event_id)
+    )
+    if existing:
+        return True
+
+    bracket.create_bracket(db, event_id, size)
+    db.flush()
+    refresh_event_pilot_stats(db, event_id)
+    recompute_event_standings(db, event_id)
+    db.commit()
+    return True
+
+
+def _int_or_none(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float_or_none(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_bracket_form(form: Any) -> Dict[int, Dict[str, Any]]:
+    """Поля br_{id}_* → result_id → {поле: значение}."""
+    rows: Dict[int, Dict[str, Any]] = {}
+    for key, value in form.items():
+        if not key.startswith("br_"):
+            continue
+        parts = key.split("_", 2)
+        # чужие или обрезанные ключи (br_5) пропускаем, а не падаем на распаковке
+        if len(parts) < 3 or not parts[2]:
+            continue
+        _, result_id, field = parts
+        result_id = _int_or_none(result_id)
+        if result_id is None:
+            continue
+        rows.setdefault(result_id, {})[field] = value.strip() if isinstance(value, str) else value
+    return rows
+
+
+def _save_bracket(db: Session, event_id: int, rows: Dict[int, Dict[str, Any]]) -> bool:
+    """
+    Сохраняет правки сетки, пересчитывает места в изменённых гонках и
+    продвигает пилотов дальше — всё одной транзакцией.
+    """
+    event = db.get(Event, event_id)
+    if not event:
+        return False
+
+    races = bracket.load_bracket(db, event_id)
+    results = [(race, r) for race in races for r in race.results if r.id in rows]
+    previous = bracket.placements(races)
+
+    nicknames = {rows[r.id].get("nickname") for _, r in results} - {None, ""}
+    pilot_ids, _ = resolve_pilots(db, nicknames)
+    previous_pilot_ids = event_pilot_ids(db, event_id)
+
+    changed_races: set[int] = set()
+    for race, r in results:
+        fields = rows[r.id]
+        values = {
+            "pilot_id": pilot_ids.get(fields.get("nickname") or ""),
+            **{
+                name: _int_or_none(fields.get(f"r{i}"))
+                for i, name in enumerate(bracket.HEAT_FIELDS, start=1)
+            },
+        }
+        # без очков по вылетам сумма и место вводятся вручную
+        if not any(values[name] is not None for name in bracket.HEAT_FIELDS):
+            values["total_points"] = _float_or_none(fields.get("total"))
+            values["final_position"] = _int_or_none(fields.get("pos"))
+
+        for name, value in values.items():
+            if getattr(r, name) != value:
+                setattr(r, name, value)
+                changed_races.add(race.number)
+
+    if changed_races:
+        bracket.advance(races, changed_races, previous)
+        db.flush()
+        refresh_event_pilot_stats(db, event_id, previous_pilot_ids)
+        recompute_event_standings(db, event_id)
+    db.commit()
+    return True
+
+
 # ----------------------------------------------------------------
 # views
 # ----------------------------------------------------------------
 
 @router.get("/", include_in_schema=False, name="admin_index")
-async def admin_index(request: Request, db: Session = Depends(get_db)):
-    stmt = select(Event).order_by(Event.date.desc())
-    events = db.scalars(stmt).all()
+async def admin_index(request: Request, db: Session = Depends(get_read_db)):
+    events = await run_db(_all_events, db)
 
     return templates.TemplateResponse(
         "admin_index.html",
@@ -125,13 +302,21 @@ async def admin_create_event(
         location=location,
         description=description,
         event_type=etype,
+        poster=await _store_poster(poster),
     )
-    db.add(event)
-    db.commit()
-    db.refresh(event)
+    rh_upload = await _spool_rh_json(rh_json_file)
+    event_id = await run_db_write(_save_new_event, db, event)
+    await changes.notify(event_id)
+
+    if rh_upload is not None:
+        # квалификация появится на странице события, когда задача отработает
+        job_id = await run_db_write(
+            import_jobs.create_job, db, import_jobs.KIND_RH_QUALIFICATION, event_id, *rh_upload
+        )
+        import_jobs.jobs.submit(job_id)
 
     return RedirectResponse(
-        url=request.url_for("event_detail", event_id=event.id),
+        url=request.url_for("event_detail", event_id=event_id),
         status_code=303,
     )
 
@@ -140,18 +325,12 @@ async def admin_create_event(
 async def admin_edit_event(
     event_id: int,
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    event = db.get(Event, event_id)
-    if not event:
+    loaded = await run_db(_load_event_for_edit, db, event_id)
+    if loaded is None:
         raise HTTPException(status_code=404, detail="Event not found")
-
-    stmt = (
-        select(QualificationResult)
-        .where(QualificationResult.event_id == event_id)
-        .order_by(QualificationResult.rank.asc())
-    )
-    qualification = db.scalars(stmt).all()
+    event, qualification = loaded
 
     return templates.TemplateResponse(
         "admin_event_edit.html",
@@ -169,18 +348,14 @@ async def admin_update_event(
     request: Request,
     db: Session = Depends(get_db),
 ):
-    event = db.get(Event, event_id)
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    # логика обновления оставлена без изменений
     form = await request.form()
-    name = form.get("name") or event.name
-    event.name = name
-    db.commit()
+    poster = await _store_poster(form.get("poster"))
+    if not await run_db_write(_update_event, db, event_id, form.get("name"), poster):
+        raise HTTPException(status_code=404, detail="Event not found")
+    await changes.notify(event_id)
 
     return RedirectResponse(
-        url=request.url_for("admin_edit_event", event_id=event.id),
+        url=request.url_for("admin_edit_event", event_id=event_id),
         status_code=303,
     )
 
@@ -193,51 +368,36 @@ async def admin_update_event(
 async def admin_create_bracket(
     event_id: int,
     request: Request,
+    size: int = Form(bracket.DEFAULT_FORMAT),
     db: Session = Depends(get_db),
 ):
-    event = db.get(Event, event_id)
-    if not event:
+    if size not in bracket.BRACKET_FORMATS:
+        raise HTTPException(status_code=400, detail="Неизвестный формат сетки")
+    if not await run_db_write(_create_bracket, db, event_id, size):
         raise HTTPException(status_code=404, detail="Event not found")
+    await changes.notify(event_id)
 
-    existing = db.scalar(
-        select(BracketRace).where(BracketRace.event_id == event_id)
+    return RedirectResponse(
+        url=request.url_for("admin_edit_event", event_id=event_id),
+        status_code=303,
     )
-    if existing:
-        return RedirectResponse(
-            url=request.url_for("admin_edit_event", event_id=event_id),
-            status_code=303,
-        )
 
-    config = [
-        (1, "upper_1_16", "1/16"),
-        (2, "upper_1_16", "1/16"),
-        (3, "upper_1_16", "1/16"),
-        (4, "upper_1_16", "1/16"),
-        (5, "lower_1_16", "1/16"),
-        (6, "upper_1_8", "1/8"),
-        (7, "lower_1_16", "1/16"),
-        (8, "upper_1_8", "1/8"),
-        (9, "lower_1_8", "1/8"),
-        (10, "lower_1_8", "1/8"),
-        (11, "upper_1_4", "1/4"),
-        (12, "lower_1_4", "1/4"),
-        (13, "semi", "Полуфинал"),
-        (14, "final", "Финал"),
-    ]
-
-    for number, stage, short_label in config:
-        side = "final" if stage == "final" else ("upper" if "upper" in stage else "lower")
-        race = BracketRace(
-            event_id=event_id,
-            number=number,
-            name=f"Гонка {number}",
-            stage=stage,
-            short_label=short_label,
-            bracket_side=side,
-        )
-        db.add(race)
 
-    db.commit()
+@router.post(
+    "/events/{event_id}/bracket",
+    include_in_schema=False,
+    name="admin_save_bracket",
+)
+async def admin_save_bracket(
+    event_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    form = await request.form()
+    rows = _parse_bracket_form(form)
+    if not await run_db_write(_save_bracket, db, event_id, rows):
+        raise HTTPException(status_code=404, detail="Event not found")
+    await changes.notify(event_id)
 
     return RedirectResponse(
         url=request.url_for("admin_edit_event", event_id=event_id),
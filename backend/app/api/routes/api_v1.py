@@ -0,0 +1,509 @@
+# backend/app/api/routes/api_v1.py
+
+"""
+Публичный JSON API (/api/v1) для бота и оверлеев.
+
+Данные берутся теми же read-запросами, что и HTML-страницы
+(services.event_page, services.pilot_search), но без рендера шаблонов;
+у списков событий и участий пилота — свои keyset-запросы. Ответы
+проходят через page_cache — ETag/304 и сброс после записи работают так
+же, как для страниц.
+
+Списки событий, пилотов и участий пилота — с курсорной пагинацией:
+{"items": [...], "next_cursor": "..."}; следующая страница —
+?after=<next_cursor>. Параметр ?fields=id,name оставляет в объектах
+только перечисленные поля.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import literal, select, tuple_
+from sqlalchemy.orm import Session
+
+from ...core.page_cache import page_cache
+from ...core.responses import FastJSONResponse
+from ...db import get_read_db, run_db
+from ...models.event import Event
+from ...models.pilot import Pilot
+from ...models.pilot_stats import PilotStats
+from ...models.qualification import QualificationResult
+from ...services.event_page import (
+    QualRow,
+    RaceView,
+    load_event_info,
+    load_qualification,
+    load_races,
+)
+from ...services.lap_analytics import (
+    EventAnalytics,
+    PilotAnalytics,
+    load_event_analytics,
+    load_pilot_analytics,
+)
+from ...services.pilot_search import DEFAULT_SORT, PILOT_SORTS, decode_cursor, encode_cursor, list_pilots
+from .admin import admin_auth
+
+router = APIRouter(prefix="/api/v1", tags=["api"], default_response_class=FastJSONResponse)
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+Getter = Callable[[Any], Any]
+
+
+# ----------------------------------------------------------------
+# поля ресурсов
+# ----------------------------------------------------------------
+
+EVENT_FIELDS: dict[str, Getter] = {
+    name: attrgetter(name)
+    for name in ("id", "name", "event_type", "date", "location", "description", "poster")
+}
+
+QUAL_FIELDS: dict[str, Getter] = {
+    "id": attrgetter("id"),
+    "rank": attrgetter("rank"),
+    "rh_position": attrgetter("rh_position"),
+    "pilot_id": attrgetter("pilot_id"),
+    "nickname": attrgetter("nickname"),
+    "best3_avg_ms": attrgetter("best3_ms"),
+    "consecutives_count": attrgetter("consec"),
+    "best_lap_ms": attrgetter("bestlap_ms"),
+    "laps_total": attrgetter("laps_total"),
+    "attempts_count": attrgetter("attempts_count"),
+}
+
+RACE_FIELDS: dict[str, Getter] = {
+    name: attrgetter(name)
+    for name in ("id", "number", "name", "short_label", "stage", "bracket_side", "heat_count")
+}
+
+RESULT_FIELDS: dict[str, Getter] = {
+    "id": attrgetter("id"),
+    "pilot_id": attrgetter("pilot_id"),
+    "nickname": attrgetter("nickname"),
+    "slot_index": attrgetter("slot_index"),
+    "points": lambda r: list(r.points),
+    "total_points": attrgetter("total_points"),
+    "final_position": attrgetter("final_position"),
+}
+
+PILOT_FIELDS: dict[str, Getter] = {
+    name: attrgetter(name)
+    for name in ("id", "nickname", "first_name", "last_name", "callsign", "city", "club")
+}
+
+STATS_FIELDS: dict[str, Getter] = {
+    name: attrgetter(name)
+    for name in (
+        "events_entered",
+        "best_qual_rank",
+        "avg_qual_rank",
+        "best_lap_ms",
+        "best3_avg_ms",
+        "bracket_events",
+        "bracket_races",
+        "finals",
+        "podiums",
+        "wins",
+    )
+}
+
+HISTORY_FIELDS: dict[str, Getter] = {
+    "event_id": lambda p: p["event"].id,
+    "event_name": lambda p: p["event"].name,
+    "date": lambda p: p["event"].date,
+    "rank": lambda p: p["qual"].rank,
+    "best_lap_ms": lambda p: p["qual"].best_lap_ms,
+    "best3_avg_ms": lambda p: p["qual"].best3_avg_ms,
+    "laps_total": lambda p: p["qual"].laps_total,
+    "consecutives_count": lambda p: p["qual"].consecutives_count,
+}
+
+LAP_STATS_NAMES = (
+    "laps",
+    "best_ms",
+    "p10_ms",
+    "p25_ms",
+    "median_ms",
+    "p75_ms",
+    "p90_ms",
+    "mean_ms",
+    "stdev_ms",
+    "consistency_pct",
+    "gap_pct",
+    "field_percentile",
+)
+
+LAP_STATS_FIELDS: dict[str, Getter] = {
+    "pilot_id": attrgetter("pilot_id"),
+    **{name: attrgetter(name) for name in LAP_STATS_NAMES},
+}
+
+PILOT_ANALYTICS_FIELDS: dict[str, Getter] = {
+    "event_id": attrgetter("event_id"),
+    "date": attrgetter("date"),
+    **{name: attrgetter(f"stats.{name}") for name in LAP_STATS_NAMES},
+}
+
+FIELD_SUMMARY = (
+    "laps",
+    "field_best_ms",
+    "field_median_best_ms",
+    "spread_pct",
+    "p10_ms",
+    "median_ms",
+    "p90_ms",
+)
+
+
+def _select(fields: str | None, available: dict[str, Getter]) -> list[tuple[str, Getter]]:
+    """?fields=a,b → [(имя, getter)] в запрошенном порядке; неизвестное поле — 400."""
+    if not fields:
+        return list(available.items())
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}; available: {', '.join(available)}",
+        )
+    return [(name, available[name]) for name in names]
+
+
+def _project(obj: Any, getters: list[tuple[str, Getter]]) -> dict[str, Any]:
+    return {name: get(obj) for name, get in getters}
+
+
+def _respond(request: Request, content: Any):
+    return page_cache.put(request, FastJSONResponse(content))
+
+
+# ----------------------------------------------------------------
+# запросы
+# ----------------------------------------------------------------
+
+def _list_events(db: Session, after: str | None, limit: int) -> tuple[list[Event], str | None]:
+    """События от новых к старым, keyset по (date, id)."""
+    keys = (Event.date, Event.id)
+    stmt = select(Event).order_by(Event.date.desc(), Event.id.desc()).limit(limit + 1)
+    last = decode_cursor(after, len(keys))
+    if last is not None:
+        stmt = stmt.where(tuple_(*keys) < tuple_(*(literal(v) for v in last)))
+    events = list(db.scalars(stmt))
+    page, extra = events[:limit], events[limit:]
+    next_cursor = None
+    if extra:
+        next_cursor = encode_cursor([page[-1].date.isoformat(), page[-1].id])
+    return page, next_cursor
+
+
+def _list_pilot_events(
+    db: Session, pilot_id: int, after: str | None, limit: int
+) -> tuple[list[dict], str | None] | None:
+    """
+    Участия пилота (как на его странице) от новых событий к старым, keyset
+    по (date, id события, id строки квалификации). None — пилота нет.
+    """
+    if db.get(Pilot, pilot_id) is None:
+        return None
+    keys = (Event.date, Event.id, QualificationResult.id)
+    stmt = (
+        select(QualificationResult, Event)
+        .join(Event, QualificationResult.event_id == Event.id)
+        .where(QualificationResult.pilot_id == pilot_id)
+        .order_by(*(key.desc() for key in keys))
+        .limit(limit + 1)
+    )
+    last = decode_cursor(after, len(keys))
+    if last is not None:
+        stmt = stmt.where(tuple_(*keys) < tuple_(*(literal(v) for v in last)))
+    rows = db.execute(stmt).all()
+    page, extra = rows[:limit], rows[limit:]
+    next_cursor = None
+    if extra:
+        qual, event = page[-1]
+        next_cursor = encode_cursor([event.date.isoformat(), event.id, qual.id])
+    return [{"event": event, "qual": qual} for qual, event in page], next_cursor
+
+
+def _load_pilot(db: Session, pilot_id: int) -> tuple[Pilot, PilotStats | None] | None:
+    pilot = db.get(Pilot, pilot_id)
+    if pilot is None:
+        return None
+    return pilot, db.get(PilotStats, pilot_id)
+
+
+def _find_by_telegram(db: Session, telegram_id: int) -> tuple[Pilot, PilotStats | None] | None:
+    pilot = db.scalar(select(Pilot).where(Pilot.telegram_id == telegram_id).order_by(Pilot.id).limit(1))
+    if pilot is None:
+        return None
+    return pilot, db.get(PilotStats, pilot.id)
+
+
+def _pilot_payload(pilot: Pilot, stats: PilotStats | None, getters: list[tuple[str, Getter]]) -> dict:
+    payload = _project(pilot, getters)
+    payload["stats"] = _project(stats, list(STATS_FIELDS.items())) if stats is not None else None
+    return payload
+
+
+def _race_payload(
+    race: RaceView,
+    race_getters: list[tuple[str, Getter]],
+    result_getters: list[tuple[str, Getter]],
+) -> dict:
+    payload = _project(race, race_getters)
+    payload["results"] = [_project(r, result_getters) for r in race.results]
+    return payload
+
+
+# ----------------------------------------------------------------
+# события
+# ----------------------------------------------------------------
+
+@router.get("/events", name="api_events")
+async def api_events(
+    request: Request,
+    after: str | None = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    getters = _select(fields, EVENT_FIELDS)
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    events, next_cursor = await run_db(_list_events, db, after, limit)
+    return _respond(request, {"items": [_project(e, getters) for e in events], "next_cursor": next_cursor})
+
+
+@router.get("/events/{event_id}", name="api_event")
+async def api_event(
+    event_id: int,
+    request: Request,
+    fields: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    getters = _select(fields, EVENT_FIELDS)
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    info = await run_db(load_event_info, db, event_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return _respond(request, _project(info, getters))
+
+
+def _load_qualification(db: Session, event_id: int) -> list[QualRow] | None:
+    if db.get(Event, event_id) is None:
+        return None
+    return load_qualification(db, event_id)
+
+
+def _load_bracket(db: Session, event_id: int) -> list[RaceView] | None:
+    if db.get(Event, event_id) is None:
+        return None
+    return load_races(db, event_id)
+
+
+@router.get("/events/{event_id}/qualification", name="api_event_qualification")
+async def api_event_qualification(
+    event_id: int,
+    request: Request,
+    fields: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    getters = _select(fields, QUAL_FIELDS)
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    rows = await run_db(_load_qualification, db, event_id)
+    if rows is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return _respond(request, {"items": [_project(q, getters) for q in rows]})
+
+
+def _load_event_analytics(db: Session, event_id: int) -> EventAnalytics | None:
+    return load_event_analytics(db, [event_id]).get(event_id)
+
+
+def _load_pilot_analytics(db: Session, pilot_id: int) -> PilotAnalytics | None:
+    if db.get(Pilot, pilot_id) is None:
+        return None
+    return load_pilot_analytics(db, pilot_id)
+
+
+@router.get("/events/{event_id}/bracket", name="api_event_bracket")
+async def api_event_bracket(
+    event_id: int,
+    request: Request,
+    fields: str | None = None,
+    result_fields: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    race_getters = _select(fields, RACE_FIELDS)
+    result_getters = _select(result_fields, RESULT_FIELDS)
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    races = await run_db(_load_bracket, db, event_id)
+    if races is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return _respond(
+        request,
+        {"items": [_race_payload(race, race_getters, result_getters) for race in races]},
+    )
+
+
+@router.get("/events/{event_id}/analytics", name="api_event_analytics")
+async def api_event_analytics(
+    event_id: int,
+    request: Request,
+    fields: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    """Распределения кругов пилотов и поля (services.lap_analytics)."""
+    getters = _select(fields, LAP_STATS_FIELDS)
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    analytics = await run_db(_load_event_analytics, db, event_id)
+    if analytics is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return _respond(
+        request,
+        {
+            "field": {name: getattr(analytics, name) for name in FIELD_SUMMARY},
+            "items": [_project(a, getters) for a in analytics.pilots.values()],
+        },
+    )
+
+
+# ----------------------------------------------------------------
+# пилоты
+# ----------------------------------------------------------------
+
+@router.get("/pilots", name="api_pilots")
+async def api_pilots(
+    request: Request,
+    sort: str = DEFAULT_SORT,
+    q: str | None = None,
+    after: str | None = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    if sort not in PILOT_SORTS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort; available: {', '.join(PILOT_SORTS)}")
+    getters = _select(fields, PILOT_FIELDS)
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    page = await run_db(list_pilots, db, sort, q, after, limit)
+    return _respond(
+        request,
+        {
+            "items": [_pilot_payload(pilot, stats, getters) for pilot, stats in page.rows],
+            "next_cursor": page.next_cursor,
+        },
+    )
+
+
+# поиск по Telegram — для бота, под той же Basic-авторизацией, что и админка:
+# иначе перебором id можно сопоставить аккаунты с пилотами
+@router.get(
+    "/pilots/by-telegram/{telegram_id}",
+    name="api_pilot_by_telegram",
+    dependencies=[Depends(admin_auth)],
+)
+async def api_pilot_by_telegram(
+    telegram_id: int,
+    request: Request,
+    fields: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    getters = _select(fields, PILOT_FIELDS)
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    loaded = await run_db(_find_by_telegram, db, telegram_id)
+    if loaded is None:
+        raise HTTPException(status_code=404, detail="Pilot not found")
+    return _respond(request, _pilot_payload(*loaded, getters))
+
+
+@router.get("/pilots/{pilot_id}", name="api_pilot")
+async def api_pilot(
+    pilot_id: int,
+    request: Request,
+    fields: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    getters = _select(fields, PILOT_FIELDS)
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    loaded = await run_db(_load_pilot, db, pilot_id)
+    if loaded is None:
+        raise HTTPException(status_code=404, detail="Pilot not found")
+    return _respond(request, _pilot_payload(*loaded, getters))
+
+
+@router.get("/pilots/{pilot_id}/events", name="api_pilot_events")
+async def api_pilot_events(
+    pilot_id: int,
+    request: Request,
+    after: str | None = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    getters = _select(fields, HISTORY_FIELDS)
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    loaded = await run_db(_list_pilot_events, db, pilot_id, after, limit)
+    if loaded is None:
+        raise HTTPException(status_code=404, detail="Pilot not found")
+    participations, next_cursor = loaded
+    return _respond(
+        request,
+        {"items": [_project(p, getters) for p in participations], "next_cursor": next_cursor},
+    )
+
+
+@router.get("/pilots/{pilot_id}/analytics", name="api_pilot_analytics")
+async def api_pilot_analytics(
+    pilot_id: int,
+    request: Request,
+    fields: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    """Круги пилота по событиям и динамика отставания от лучшего круга поля."""
+    getters = _select(fields, PILOT_ANALYTICS_FIELDS)
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    analytics = await run_db(_load_pilot_analytics, db, pilot_id)
+    if analytics is None:
+        raise HTTPException(status_code=404, detail="Pilot not found")
+    return _respond(
+        request,
+        {
+            "trend_pct_per_month": analytics.trend_pct_per_month,
+            "gap_change_pct": analytics.gap_change_pct,
+            "items": [_project(e, getters) for e in analytics.events],
+        },
+    )
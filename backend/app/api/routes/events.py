@@ -2,23 +2,21 @@
 
 from datetime import date
 
-from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Request, HTTPException, Depends, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from ...db import get_db
+from ...core.live import broadcaster
+from ...core.page_cache import page_cache
+from ...core.templates import templates
+from ...db import get_db, get_read_db, run_db
 from ...models.event import Event, EventType
-from ...models.qualification import QualificationResult
+from ...services import event_live
+from ...services.event_page import events_stmt, load_event_page
 
 router = APIRouter(prefix="/events", tags=["events"])
 
-templates = Jinja2Templates(directory="backend/app/templates")
-from ...utils.formatting import format_ms
-from ...utils.jinja_filters import format_float_clean
-templates.env.filters["float_clean"] = format_float_clean
-templates.env.filters["format_ms"] = format_ms
-
 
 @router.get("/dev/create_sample", include_in_schema=False)
 def create_sample_events(db: Session = Depends(get_db)):
@@ -46,17 +44,27 @@ def create_sample_events(db: Session = Depends(get_db)):
     return {"status": "created", "count": 2}
 
 
+def _all_events(db: Session) -> list[Event]:
+    return list(db.scalars(events_stmt()).all())
+
+
 @router.get("", include_in_schema=False, name="events")
 async def events_list(
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    stmt = select(Event).order_by(Event.date.desc())
-    events = db.scalars(stmt).all()
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
 
-    return templates.TemplateResponse(
-        "events_list.html",
-        {"request": request, "events": events},
+    events = await run_db(_all_events, db)
+
+    return page_cache.put(
+        request,
+        templates.TemplateResponse(
+            "events_list.html",
+            {"request": request, "events": events},
+        ),
     )
 
 
@@ -64,25 +72,50 @@ async def events_list(
 async def event_detail(
     request: Request,
     event_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    event = db.get(Event, event_id)
-    if not event:
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    # seq берём до чтения: страница не может оказаться старше своего seq
+    live_seq = broadcaster.seq(event_id)
+    page = await run_db(load_event_page, db, event_id)
+    if page is None:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    # Квалификация в порядке, как её посчитал RH (rank)
-    stmt = (
-        select(QualificationResult)
-        .where(QualificationResult.event_id == event_id)
-        .order_by(QualificationResult.rank.asc())
+    return page_cache.put(
+        request,
+        templates.TemplateResponse(
+            "event_detail.html",
+            {
+                "request": request,
+                "event": page.event,
+                "qualification": page.qualification,
+                "races": page.races,
+                "bracket_size": page.bracket_size,
+                "analytics": page.analytics,
+                "live_seq": live_seq,
+            },
+        ),
     )
-    qual_results = db.scalars(stmt).all()
-
-    return templates.TemplateResponse(
-        "event_detail.html",
-        {
-            "request": request,
-            "event": event,
-            "qualification": qual_results,
-        },
+
+
+@router.get("/{event_id}/live", include_in_schema=False, name="event_live")
+async def event_live_stream(
+    event_id: int,
+    since: int = 0,
+    last_event_id: int | None = Header(None),
+):
+    """SSE: изменения квалификации и сетки события."""
+    if not await event_live.ensure_state(event_id):
+        raise HTTPException(status_code=404, detail="Event not found")
+    # при переподключении EventSource сам присылает Last-Event-ID
+    if last_event_id is not None:
+        since = max(since, last_event_id)
+
+    return StreamingResponse(
+        event_live.stream(event_id, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
@@ -0,0 +1,14 @@
+# backend/app/api/routes/monitoring.py
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ...core.metrics import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False, name="metrics")
+async def metrics_text():
+    # текстовый формат Prometheus 0.0.4
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,34 +1,40 @@
 # backend/app/api/routes/pages.py
 
 from fastapi import APIRouter, Request, Depends
-from fastapi.templating import Jinja2Templates
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from ...db import get_db
+from ...core.page_cache import page_cache
+from ...core.templates import templates
+from ...db import get_read_db, run_db
 from ...models.event import Event
+from ...services.event_page import events_stmt
 
 router = APIRouter()
 
-templates = Jinja2Templates(directory="backend/app/templates")
-from ...utils.formatting import format_ms
-templates.env.filters["format_ms"] = format_ms
 
+def _latest_events(db: Session, limit: int = 5) -> list[Event]:
+    # последние N событий
+    return list(db.scalars(events_stmt(limit)).all())
 
 
 @router.get("/", include_in_schema=False, name="index")
 async def index(
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    # последние N событий
-    stmt = select(Event).order_by(Event.date.desc()).limit(5)
-    events = db.scalars(stmt).all()
-
-    return templates.TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "events": events,
-        },
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    events = await run_db(_latest_events, db)
+
+    return page_cache.put(
+        request,
+        templates.TemplateResponse(
+            "index.html",
+            {
+                "request": request,
+                "events": events,
+            },
+        ),
     )
@@ -1,69 +1,99 @@
 # backend/app/api/routes/pilots.py
 
-from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.templating import Jinja2Templates
-from sqlalchemy import select
+from fastapi import APIRouter, Request, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
 
-from ...db import get_db
-from ...models.pilot import Pilot
-from ...models.event import Event
-from ...models.qualification import QualificationResult
-from ...utils.formatting import format_ms
+from ...core.page_cache import page_cache
+from ...core.templates import templates
+from ...db import get_read_db, run_db
+from ...services.lap_analytics import load_pilot_analytics
+from ...services.pilot_page import load_pilot_page
+from ...services.pilot_search import DEFAULT_SORT, PILOT_SORTS, list_pilots, search_pilots
 
 router = APIRouter(prefix="/pilots", tags=["pilots"])
 
-templates = Jinja2Templates(directory="backend/app/templates")
-templates.env.filters["format_ms"] = format_ms
-
 
 @router.get("", include_in_schema=False, name="pilots")
 async def pilots_list(
     request: Request,
-    db: Session = Depends(get_db),
+    sort: str = DEFAULT_SORT,
+    q: str | None = None,
+    after: str | None = None,
+    db: Session = Depends(get_read_db),
 ):
-    stmt = select(Pilot).order_by(Pilot.nickname.asc())
-    pilots = db.scalars(stmt).all()
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    if sort not in PILOT_SORTS:
+        sort = DEFAULT_SORT
+    page = await run_db(list_pilots, db, sort, q, after)
 
-    return templates.TemplateResponse(
-        "pilots_list.html",
-        {"request": request, "pilots": pilots},
+    return page_cache.put(
+        request,
+        templates.TemplateResponse(
+            "pilots_list.html",
+            {
+                "request": request,
+                "pilots": page.rows,
+                "next_cursor": page.next_cursor,
+                "sort": sort,
+                "q": q or "",
+                "after": after,
+            },
+        ),
     )
 
 
+@router.get("/search.json", include_in_schema=False, name="pilots_search")
+async def pilots_search(
+    request: Request,
+    q: str = "",
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+):
+    """Подсказки для поиска пилотов (type-ahead)."""
+    pilots = await run_db(search_pilots, db, q, limit)
+    return [
+        {
+            "id": p.id,
+            "nickname": p.nickname,
+            "full_name": p.full_name(),
+            "city": p.city,
+            "club": p.club,
+            "url": str(request.url_for("pilot_detail", pilot_id=p.id)),
+        }
+        for p in pilots
+    ]
+
+
 @router.get("/{pilot_id}", include_in_schema=False, name="pilot_detail")
 async def pilot_detail(
     pilot_id: int,
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    pilot = db.get(Pilot, pilot_id)
-    if not pilot:
-        raise HTTPException(status_code=404, detail="Pilot not found")
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
 
-    # все участия пилота в событиях по таблице квалификации
-    stmt = (
-        select(QualificationResult, Event)
-        .join(Event, QualificationResult.event_id == Event.id)
-        .where(QualificationResult.pilot_id == pilot_id)
-        .order_by(Event.date.desc(), QualificationResult.rank.asc())
-    )
-    rows = db.execute(stmt).all()
+    loaded = await run_db(load_pilot_page, db, pilot_id)
+    if loaded is None:
+        raise HTTPException(status_code=404, detail="Pilot not found")
+    pilot, stats, participations = loaded
+    analytics = await run_db(load_pilot_analytics, db, pilot_id)
 
-    participations = []
-    for q, e in rows:
-        participations.append(
+    return page_cache.put(
+        request,
+        templates.TemplateResponse(
+            "pilot_detail.html",
             {
-                "event": e,
-                "qual": q,
-            }
-        )
-
-    return templates.TemplateResponse(
-        "pilot_detail.html",
-        {
-            "request": request,
-            "pilot": pilot,
-            "participations": participations,
-        },
+                "request": request,
+                "pilot": pilot,
+                "stats": stats,
+                "participations": participations,
+                "analytics": analytics,
+                "event_analytics": {e.event_id: e.stats for e in analytics.events},
+            },
+        ),
     )
@@ -0,0 +1,59 @@
+# backend/app/api/routes/standings.py
+
+from fastapi import APIRouter, Request, HTTPException, Depends
+from sqlalchemy.orm import Session
+
+from ...core.page_cache import page_cache
+from ...core.templates import templates
+from ...db import get_read_db, run_db
+from ...services.standings import StandingRow, list_seasons, load_standings
+
+router = APIRouter(prefix="/standings", tags=["standings"])
+
+
+def _load_page(db: Session, season: int | None) -> tuple[list[int], int | None, list[StandingRow]]:
+    seasons = list_seasons(db)
+    if season is None:
+        season = seasons[0] if seasons else None
+    rows = load_standings(db, season) if season in seasons else []
+    return seasons, season, rows
+
+
+async def _render(request: Request, db: Session, season: int | None):
+    cached = page_cache.get(request)
+    if cached is not None:
+        return cached
+
+    seasons, season, rows = await run_db(_load_page, db, season)
+    if seasons and season not in seasons:
+        raise HTTPException(status_code=404, detail="Season not found")
+
+    return page_cache.put(
+        request,
+        templates.TemplateResponse(
+            "standings.html",
+            {
+                "request": request,
+                "seasons": seasons,
+                "season": season,
+                "standings": rows,
+            },
+        ),
+    )
+
+
+@router.get("", include_in_schema=False, name="standings")
+async def standings_current(
+    request: Request,
+    db: Session = Depends(get_read_db),
+):
+    return await _render(request, db, None)
+
+
+@router.get("/{season}", include_in_schema=False, name="standings_season")
+async def standings_season(
+    season: int,
+    request: Request,
+    db: Session = Depends(get_read_db),
+):
+    return await _render(request, db, season)
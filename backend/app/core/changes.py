@@ -0,0 +1,88 @@
+# backend/app/core/changes.py
+
+"""
+Уведомление «данные изменились» после commit.
+
+Админка и импорт RH после записи вызывают await notify(event_id);
+всё, что зависит от данных (кэш страниц, live-трансляция), подписывается
+через on_change. event_id — None, если изменение не привязано к событию.
+
+notify() ещё и увеличивает общие счётчики поколений (db.generations),
+так что о записи узнают и другие процессы uvicorn: watch() в каждом из
+них раз в CACHE_SYNC_INTERVAL_MS сверяет счётчики и вызывает тех же
+слушателей для чужих изменений. Слушатели on_local_change (пересборка
+статического экспорта) срабатывают только в процессе, который писал.
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Awaitable, Callable
+
+from ..db import GLOBAL_SCOPE, generations, run_db, run_db_write
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[int | None], Awaitable[None] | None]
+
+_listeners: list[Listener] = []
+_local_listeners: list[Listener] = []
+
+# поколения, о которых этот процесс уже знает (свои записи и разосланные чужие)
+_known: dict[str, int] = {}
+
+
+def on_change(listener: Listener) -> Listener:
+    """Регистрирует слушателя (можно как декоратор)."""
+    _listeners.append(listener)
+    return listener
+
+
+def on_local_change(listener: Listener) -> Listener:
+    """Слушатель только для записей этого процесса."""
+    _local_listeners.append(listener)
+    return listener
+
+
+async def _dispatch(listeners: list[Listener], event_id: int | None) -> None:
+    for listener in listeners:
+        result = listener(event_id)
+        if inspect.isawaitable(result):
+            await result
+
+
+async def notify(event_id: int | None = None) -> None:
+    try:
+        _known.update(await run_db_write(generations.bump, event_id))
+    except Exception:
+        # без счётчиков другие процессы узнают позже, но этот — сразу
+        logger.exception("cache generations were not bumped")
+    await _dispatch(_listeners, event_id)
+    await _dispatch(_local_listeners, event_id)
+
+
+def _remote_changes(current: dict[str, int]) -> list[int | None]:
+    """Что изменилось в других процессах с прошлой сверки."""
+    changed = [scope for scope, n in current.items() if _known.get(scope, 0) < n]
+    _known.update(current)
+    if not changed:
+        return []
+    event_ids: list[int | None] = sorted(
+        int(scope.split(":", 1)[1]) for scope in changed if scope.startswith("event:")
+    )
+    # "all" вырос без счётчика события — запись без события
+    return event_ids or ([None] if GLOBAL_SCOPE in changed else [])
+
+
+async def watch() -> None:
+    """Фоновая сверка поколений; запускается в lifespan."""
+    interval = get_settings().CACHE_SYNC_INTERVAL_MS / 1000
+    _known.update(await run_db(generations.current))
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            for event_id in _remote_changes(await run_db(generations.current)):
+                await _dispatch(_listeners, event_id)
+        except Exception:
+            logger.exception("cache generation check failed")
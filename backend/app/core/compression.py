@@ -0,0 +1,207 @@
+# backend/app/core/compression.py
+
+"""
+Сжатие ответов: gzip, а при установленном пакете brotli — br.
+
+Своя ASGI-прослойка вместо GZipMiddleware из Starlette:
+  * text/event-stream не трогаем — SSE должен уходить без буферизации;
+  * готовые тела с сильным ETag (страницы из page_cache, статика)
+    сжимаются один раз: результат запоминается по (ETag, кодировка);
+  * ETag сжатого ответа делаем слабым (W/"..."), как nginx, — байты
+    другие, а If-None-Match всё равно сравнивается слабо.
+Уже сжатые ответы (Content-Encoding задан, например .br/.gz из
+core.static) и картинки проходят как есть.
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from .config import get_settings
+
+try:  # необязательная зависимость
+    import brotli
+except ImportError:  # pragma: no cover - зависит от окружения
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/csv",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+}
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Кодировки в порядке предпочтения сервера."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str, available: tuple[str, ...]) -> str | None:
+    """Первая из available, которую клиент принимает (q=0 — отказ)."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    for encoding in available:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 — формат gzip (заголовок и CRC)
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._br.process(data) if data else b""
+        return self._gz.compress(data)
+
+    def flush(self) -> bytes:
+        # для стрима: отдать накопленное, не закрывая поток
+        if self.encoding == "br":
+            return self._br.flush()
+        return self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._br.finish()
+        return self._gz.flush()
+
+
+def compress(data: bytes, encoding: str, gzip_level: int = 9, brotli_quality: int = 11) -> bytes:
+    c = _Compressor(encoding, gzip_level, brotli_quality)
+    return c.compress(data) + c.finish()
+
+
+def _weak(etag: str) -> str:
+    return etag if etag.startswith("W/") else "W/" + etag
+
+
+class _CompressedBodies:
+    """Небольшой LRU сжатых тел по (ETag, кодировка)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: tuple[str, str], body: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int | None = None):
+        settings = get_settings()
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.gzip_level = settings.COMPRESSION_GZIP_LEVEL
+        self.brotli_quality = settings.COMPRESSION_BROTLI_QUALITY
+        self.bodies = _CompressedBodies(settings.COMPRESSION_CACHE_ENTRIES)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), supported_encodings())
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor: _Compressor | None = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] != "http.response.start" and message["type"] != "http.response.body":
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # заголовки отправим, когда увидим первый кусок тела
+                start = message
+                return
+            if passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is not None:
+                chunk = compressor.compress(body)
+                chunk += compressor.flush() if more_body else compressor.finish()
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(scope=start)
+            if not self._compressible(start["status"], headers) or (
+                not more_body and len(body) < self.minimum_size
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag:
+                headers["ETag"] = _weak(etag)
+
+            if not more_body:
+                key = (etag, encoding) if etag and not etag.startswith("W/") else None
+                compressed = self.bodies.get(key) if key else None
+                if compressed is None:
+                    compressed = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                    if key:
+                        self.bodies.put(key, compressed)
+                headers["Content-Length"] = str(len(compressed))
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            # потоковый ответ: жмём по кускам, длина заранее неизвестна
+            del headers["Content-Length"]
+            compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+            await send(start)
+            chunk = compressor.compress(body) + compressor.flush()
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _compressible(status: int, headers: MutableHeaders) -> bool:
+        if status < 200 or status in (204, 206, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return media_type in COMPRESSIBLE_TYPES
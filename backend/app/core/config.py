@@ -1,10 +1,95 @@
 # backend/app/core/config.py
 
+import os
+
+
 class Settings:
     def __init__(self):
         self.PROJECT_NAME = "WhoopMania"
         # Путь к папке с шаблонами Jinja
         self.TEMPLATE_DIR = "backend/app/templates"
+        # Перечитывать шаблоны при изменении файла (для разработки)
+        self.TEMPLATES_AUTO_RELOAD = os.getenv("WHOOPMANIA_TEMPLATES_AUTO_RELOAD", "0") not in ("0", "false", "no")
+        # Скомпилировать все шаблоны при старте, а не на первом запросе
+        self.TEMPLATES_PRECOMPILE = os.getenv("WHOOPMANIA_TEMPLATES_PRECOMPILE", "1") not in ("0", "false", "no")
+        # Байткод шаблонов на диске; пустой каталог — временная папка jinja
+        self.TEMPLATE_BYTECODE_CACHE = os.getenv("WHOOPMANIA_TEMPLATE_BYTECODE_CACHE", "1") not in ("0", "false", "no")
+        self.TEMPLATE_BYTECODE_CACHE_DIR = os.getenv("WHOOPMANIA_TEMPLATE_BYTECODE_CACHE_DIR", "")
+
+        # --- БД ---
+        self.DATABASE_URL = os.getenv("WHOOPMANIA_DATABASE_URL", "sqlite:///./whoopmania.db")
+        # Профиль SQLite: WAL, чтобы читатели не ждали импорт RH
+        self.SQLITE_JOURNAL_MODE = os.getenv("WHOOPMANIA_SQLITE_JOURNAL_MODE", "WAL")
+        self.SQLITE_SYNCHRONOUS = os.getenv("WHOOPMANIA_SQLITE_SYNCHRONOUS", "NORMAL")
+        # отрицательное значение — в KiB (64 MiB)
+        self.SQLITE_CACHE_SIZE = int(os.getenv("WHOOPMANIA_SQLITE_CACHE_SIZE", "-65536"))
+        self.SQLITE_MMAP_SIZE = int(os.getenv("WHOOPMANIA_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+        self.SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("WHOOPMANIA_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+        # Размер пула read-only соединений для публичных страниц
+        self.DB_READ_POOL_SIZE = int(os.getenv("WHOOPMANIA_DB_READ_POOL_SIZE", "8"))
+        # Сколько потоков одновременно читают из БД (db.run_db)
+        self.DB_THREADS = int(os.getenv("WHOOPMANIA_DB_THREADS", "8"))
+
+        # Пилотов на странице списка (keyset-пагинация)
+        self.PILOTS_PAGE_SIZE = int(os.getenv("WHOOPMANIA_PILOTS_PAGE_SIZE", "50"))
+
+        # Схема начисления очков сезонного зачёта (services.standings.POINTS_SCHEMES)
+        self.STANDINGS_SCHEME = os.getenv("WHOOPMANIA_STANDINGS_SCHEME", "default")
+
+        # Правило мест в квалификации (services.qual_ranking.RANKING_RULES)
+        self.QUAL_RANKING_RULE = os.getenv("WHOOPMANIA_QUAL_RANKING_RULE", "default")
+
+        # Сколько отрендеренных публичных страниц держать в памяти
+        self.PAGE_CACHE_MAX_ENTRIES = int(os.getenv("WHOOPMANIA_PAGE_CACHE_MAX_ENTRIES", "512"))
+
+        # Сколько событий держать в кэше аналитики кругов (services.lap_analytics)
+        self.ANALYTICS_CACHE_EVENTS = int(os.getenv("WHOOPMANIA_ANALYTICS_CACHE_EVENTS", "1024"))
+
+        # Как часто процесс проверяет записи других процессов uvicorn
+        # (core.changes.watch): live-трансляция и кэши; 0 — не проверять
+        self.CACHE_SYNC_INTERVAL_MS = int(os.getenv("WHOOPMANIA_CACHE_SYNC_INTERVAL_MS", "1000"))
+
+        # Live-обновления страницы события (SSE)
+        self.LIVE_QUEUE_SIZE = int(os.getenv("WHOOPMANIA_LIVE_QUEUE_SIZE", "32"))
+        self.LIVE_HEARTBEAT_SECONDS = float(os.getenv("WHOOPMANIA_LIVE_HEARTBEAT_SECONDS", "15"))
+
+        # Сжатие ответов (core.compression); br — если установлен пакет brotli
+        self.COMPRESSION_MIN_SIZE = int(os.getenv("WHOOPMANIA_COMPRESSION_MIN_SIZE", "500"))
+        self.COMPRESSION_GZIP_LEVEL = int(os.getenv("WHOOPMANIA_COMPRESSION_GZIP_LEVEL", "6"))
+        self.COMPRESSION_BROTLI_QUALITY = int(os.getenv("WHOOPMANIA_COMPRESSION_BROTLI_QUALITY", "5"))
+        # Сколько сжатых тел (по ETag) держать в памяти
+        self.COMPRESSION_CACHE_ENTRIES = int(os.getenv("WHOOPMANIA_COMPRESSION_CACHE_ENTRIES", "256"))
+        # Сжать статику (.gz/.br рядом с файлами) при старте
+        self.STATIC_PRECOMPRESS = os.getenv("WHOOPMANIA_STATIC_PRECOMPRESS", "1") not in ("0", "false", "no")
+
+        # Афиши: предел размера загрузки и ширины уменьшенных копий (нужен Pillow)
+        self.POSTER_MAX_BYTES = int(os.getenv("WHOOPMANIA_POSTER_MAX_BYTES", str(25 * 1024 * 1024)))
+        self.POSTER_WIDTHS = tuple(
+            int(w) for w in os.getenv("WHOOPMANIA_POSTER_WIDTHS", "480,960").split(",") if w.strip()
+        )
+
+        # Фоновый импорт RH (services.import_jobs): каталог для загруженных
+        # файлов, предел размера и число воркеров (запись всё равно по одной)
+        self.IMPORT_SPOOL_DIR = os.getenv("WHOOPMANIA_IMPORT_SPOOL_DIR", "./import_spool")
+        self.IMPORT_MAX_BYTES = int(os.getenv("WHOOPMANIA_IMPORT_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.IMPORT_WORKERS = int(os.getenv("WHOOPMANIA_IMPORT_WORKERS", "1"))
+        # Восстановление: сколько раз брать задачу, через сколько секунд без
+        # отметки воркера (heartbeat) она считается брошенной, как часто
+        # воркер отмечается и как часто проверять
+        self.IMPORT_MAX_ATTEMPTS = int(os.getenv("WHOOPMANIA_IMPORT_MAX_ATTEMPTS", "3"))
+        self.IMPORT_STALE_SECONDS = int(os.getenv("WHOOPMANIA_IMPORT_STALE_SECONDS", "600"))
+        self.IMPORT_HEARTBEAT_SECONDS = int(os.getenv("WHOOPMANIA_IMPORT_HEARTBEAT_SECONDS", "30"))
+        self.IMPORT_SWEEP_SECONDS = int(os.getenv("WHOOPMANIA_IMPORT_SWEEP_SECONDS", "60"))
+
+        # Статический экспорт публичных страниц (services.site_export); пустой
+        # каталог — выключено. Базовый URL — как сайт виден снаружи (для ссылок)
+        self.SITE_EXPORT_DIR = os.getenv("WHOOPMANIA_SITE_EXPORT_DIR", "")
+        self.SITE_EXPORT_BASE_URL = os.getenv("WHOOPMANIA_SITE_EXPORT_BASE_URL", "http://localhost")
+
+        # Метрики запросов и GET /metrics (core.metrics)
+        self.METRICS_ENABLED = os.getenv("WHOOPMANIA_METRICS_ENABLED", "1") not in ("0", "false", "no")
+        # Порог лога медленных запросов с их SQL, мс; 0 — выключен
+        self.SLOW_REQUEST_MS = float(os.getenv("WHOOPMANIA_SLOW_REQUEST_MS", "0"))
 
 
 # создаём единственный экземпляр настроек
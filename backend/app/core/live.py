@@ -0,0 +1,113 @@
+# backend/app/core/live.py
+
+"""
+Fan-out сообщений для Server-Sent Events внутри процесса.
+
+Подписчики сгруппированы по теме (id события). У каждой темы есть
+порядковый номер seq: он растёт на каждое изменение, даже если никто не
+смотрит, — клиент по нему понимает, что пропустил обновления.
+
+Все методы вызываются из event loop; publish кладёт сообщение в очереди
+подписчиков без ожидания. Медленному подписчику вместо переполнения
+очереди отдаётся одно сообщение resync.
+"""
+
+import asyncio
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from .config import get_settings
+
+RESYNC = "resync"
+
+
+@dataclass(eq=False)
+class Subscription:
+    queue: asyncio.Queue
+    overflowed: bool = False
+
+
+@dataclass
+class _Topic:
+    seq: int = 0
+    subscribers: set[Subscription] = field(default_factory=set)
+    # последнее опубликованное состояние — основа для следующего diff
+    state: Any = None
+
+
+def format_sse(data: Any, event: str | None = None, event_id: int | None = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    lines.append(f"data: {payload}")
+    return "\n".join(lines) + "\n\n"
+
+
+class Broadcaster:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._topics: dict[int, _Topic] = {}
+
+    def _topic(self, key: int) -> _Topic:
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = self._topics[key] = _Topic()
+        return topic
+
+    def seq(self, key: int) -> int:
+        topic = self._topics.get(key)
+        return topic.seq if topic else 0
+
+    def watchers(self, key: int) -> int:
+        topic = self._topics.get(key)
+        return len(topic.subscribers) if topic else 0
+
+    def state(self, key: int) -> Any:
+        topic = self._topics.get(key)
+        return topic.state if topic else None
+
+    def set_state(self, key: int, state: Any) -> None:
+        self._topic(key).state = state
+
+    @contextmanager
+    def subscribe(self, key: int) -> Iterator[Subscription]:
+        sub = Subscription(queue=asyncio.Queue(maxsize=self.queue_size))
+        topic = self._topic(key)
+        topic.subscribers.add(sub)
+        try:
+            yield sub
+        finally:
+            topic.subscribers.discard(sub)
+            if not topic.subscribers:
+                # без зрителей состояние не держим: следующий зритель начнёт с resync
+                topic.state = None
+
+    def bump(self, key: int) -> int:
+        """Отмечает изменение темы; возвращает новый seq."""
+        topic = self._topic(key)
+        topic.seq += 1
+        return topic.seq
+
+    def publish(self, key: int, message: Any) -> None:
+        topic = self._topics.get(key)
+        if topic is None:
+            return
+        for sub in topic.subscribers:
+            if sub.overflowed:
+                continue
+            try:
+                sub.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # не успевает читать — очищаем очередь и просим перечитать состояние
+                sub.overflowed = True
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+                sub.queue.put_nowait(RESYNC)
+
+
+broadcaster = Broadcaster(queue_size=get_settings().LIVE_QUEUE_SIZE)
@@ -0,0 +1,272 @@
+# backend/app/core/metrics.py
+
+"""
+Метрики запросов: задержка по роутам, число SQL, время в БД и в шаблонах.
+
+MetricsMiddleware на каждый HTTP-запрос заводит RequestStats в контекстной
+переменной; хуки движков SQLAlchemy (db.py) и шаблонов дописывают в него
+время, anyio переносит контекст в потоки run_db. В конце запроса всё
+сводится в счётчики и гистограммы под одной блокировкой — порядка
+микросекунд на запрос.
+
+GET /metrics отдаёт всё в текстовом формате Prometheus. При
+SLOW_REQUEST_MS > 0 запросы медленнее порога пишутся в лог вместе с
+самыми долгими SQL.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+import jinja2
+
+from .config import get_settings
+
+logger = logging.getLogger("whoopmania.slow")
+
+# границы корзин гистограммы задержек, секунды
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# сколько SQL запоминать на запрос для лога медленных
+MAX_LOGGED_STATEMENTS = 50
+# метка для SQL вне HTTP-запросов (CLI, фоновые задачи)
+NO_ROUTE = "-"
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    render_seconds: float = 0.0
+    statements: list[tuple[float, str]] | None = None
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+@dataclass
+class _RouteTotals:
+    latency: _Histogram = field(default_factory=_Histogram)
+    queries: int = 0
+    db_seconds: float = 0.0
+    render_seconds: float = 0.0
+
+
+class Metrics:
+    def __init__(self, slow_request_ms: float):
+        self.slow_request_ms = slow_request_ms
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str], _RouteTotals] = {}
+        self._responses: dict[tuple[str, str, int], int] = {}
+        self._streams: dict[tuple[str, str], int] = {}
+        self._background_queries = 0
+        self._background_db_seconds = 0.0
+
+    # --- сбор ------------------------------------------------------
+
+    def start_request(self) -> tuple[RequestStats, object]:
+        stats = RequestStats(statements=[] if self.slow_request_ms > 0 else None)
+        return stats, _current.set(stats)
+
+    @staticmethod
+    def end_request(token: object) -> None:
+        _current.reset(token)
+
+    def record_query(self, statement: str, seconds: float) -> None:
+        stats = _current.get()
+        if stats is None:
+            with self._lock:
+                self._background_queries += 1
+                self._background_db_seconds += seconds
+            return
+        stats.queries += 1
+        stats.db_seconds += seconds
+        if stats.statements is not None and len(stats.statements) < MAX_LOGGED_STATEMENTS:
+            stats.statements.append((seconds, statement))
+
+    @staticmethod
+    def record_render(seconds: float) -> None:
+        stats = _current.get()
+        if stats is not None:
+            stats.render_seconds += seconds
+
+    def record_request(
+        self,
+        route: str,
+        method: str,
+        status: int,
+        seconds: float,
+        stats: RequestStats,
+        streaming: bool = False,
+    ) -> None:
+        key = (route, method)
+        with self._lock:
+            self._responses[(route, method, status)] = self._responses.get((route, method, status), 0) + 1
+            if streaming:
+                # длительность SSE — это время просмотра, а не задержка
+                self._streams[key] = self._streams.get(key, 0) + 1
+                return
+            totals = self._routes.get(key)
+            if totals is None:
+                totals = self._routes[key] = _RouteTotals()
+            totals.latency.observe(seconds)
+            totals.queries += stats.queries
+            totals.db_seconds += stats.db_seconds
+            totals.render_seconds += stats.render_seconds
+
+        if self.slow_request_ms > 0 and seconds * 1000 >= self.slow_request_ms:
+            self._log_slow(route, method, status, seconds, stats)
+
+    @staticmethod
+    def _log_slow(route: str, method: str, status: int, seconds: float, stats: RequestStats) -> None:
+        top = sorted(stats.statements or [], reverse=True)[:5]
+        lines = [
+            f"{method} {route} → {status}: {seconds * 1000:.1f} ms, "
+            f"{stats.queries} SQL / {stats.db_seconds * 1000:.1f} ms, "
+            f"render {stats.render_seconds * 1000:.1f} ms"
+        ]
+        for duration, statement in top:
+            lines.append(f"  {duration * 1000:8.2f} ms  {' '.join(statement.split())[:300]}")
+        logger.warning("slow request %s", "\n".join(lines))
+
+    # --- вывод -----------------------------------------------------
+
+    def render(self) -> str:
+        with self._lock:
+            routes = {
+                key: (list(t.latency.counts), t.latency.sum, t.latency.count, t.queries, t.db_seconds, t.render_seconds)
+                for key, t in self._routes.items()
+            }
+            responses = dict(self._responses)
+            streams = dict(self._streams)
+            background = (self._background_queries, self._background_db_seconds)
+
+        out: list[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+
+        header("whoopmania_http_request_duration_seconds", "histogram", "Request latency by route.")
+        for (route, method), (counts, total, count, *_rest) in sorted(routes.items()):
+            labels = f'route="{_escape(route)}",method="{method}"'
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                out.append(f'whoopmania_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            out.append(f'whoopmania_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            out.append(f"whoopmania_http_request_duration_seconds_sum{{{labels}}} {total:.6f}")
+            out.append(f"whoopmania_http_request_duration_seconds_count{{{labels}}} {count}")
+
+        header("whoopmania_http_responses_total", "counter", "Responses by route and status.")
+        for (route, method, status), n in sorted(responses.items()):
+            out.append(
+                f'whoopmania_http_responses_total{{route="{_escape(route)}",method="{method}",status="{status}"}} {n}'
+            )
+
+        header("whoopmania_http_streams_total", "counter", "Streaming (SSE) responses by route.")
+        for (route, method), n in sorted(streams.items()):
+            out.append(f'whoopmania_http_streams_total{{route="{_escape(route)}",method="{method}"}} {n}')
+
+        header("whoopmania_db_queries_total", "counter", "SQL statements executed, by route.")
+        for (route, method), values in sorted(routes.items()):
+            out.append(f'whoopmania_db_queries_total{{route="{_escape(route)}",method="{method}"}} {values[3]}')
+        out.append(f'whoopmania_db_queries_total{{route="{NO_ROUTE}",method=""}} {background[0]}')
+
+        header("whoopmania_db_seconds_total", "counter", "Time spent executing SQL, by route.")
+        for (route, method), values in sorted(routes.items()):
+            out.append(f'whoopmania_db_seconds_total{{route="{_escape(route)}",method="{method}"}} {values[4]:.6f}')
+        out.append(f'whoopmania_db_seconds_total{{route="{NO_ROUTE}",method=""}} {background[1]:.6f}')
+
+        header("whoopmania_template_render_seconds_total", "counter", "Time spent rendering templates, by route.")
+        for (route, method), values in sorted(routes.items()):
+            out.append(
+                f'whoopmania_template_render_seconds_total{{route="{_escape(route)}",method="{method}"}} {values[5]:.6f}'
+            )
+
+        return "\n".join(out) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+metrics = Metrics(slow_request_ms=get_settings().SLOW_REQUEST_MS)
+
+
+# ----------------------------------------------------------------
+# шаблоны
+# ----------------------------------------------------------------
+
+class TimedTemplate(jinja2.Template):
+    """Шаблон, который отмечает время рендера в метриках запроса."""
+
+    def render(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            metrics.record_render(time.perf_counter() - started)
+
+
+def instrument_templates(env: jinja2.Environment) -> None:
+    env.template_class = TimedTemplate
+
+
+# ----------------------------------------------------------------
+# ASGI
+# ----------------------------------------------------------------
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == b"content-type" and value.startswith(b"text/event-stream"):
+                        streaming = True
+            await send(message)
+
+        stats, token = metrics.start_request()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            seconds = time.perf_counter() - started
+            metrics.end_request(token)
+            route = scope.get("route")
+            # шаблон пути, а не сам путь: /events/{event_id}, иначе метки разрастутся
+            if route is not None:
+                label = route.path
+            elif "endpoint" in scope:
+                label = "<mount>"   # /static: Mount не кладёт route в scope
+            else:
+                label = "<unmatched>"
+            metrics.record_request(label, scope["method"], status, seconds, stats, streaming)
@@ -0,0 +1,124 @@
+# backend/app/core/page_cache.py
+
+"""
+Кэш отрендеренных публичных страниц.
+
+Ключ — имя роута + параметры пути и запроса + base_url (в HTML зашиты
+абсолютные ссылки из url_for). Каждая запись несёт сильный ETag, так что
+повторный запрос с If-None-Match получает 304 без тела.
+
+Данные меняются только при записи из админки/импорта RH, поэтому кэш
+сбрасывается целиком после commit (подписан на core.changes). О записи
+в другом процессе uvicorn сообщает тот же on_change: core.changes.watch()
+раз в CACHE_SYNC_INTERVAL_MS сверяет поколения (db.generations) в потоке,
+так что get() базу не трогает и event loop не блокирует.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from . import changes
+from .config import get_settings
+
+CACHE_CONTROL = "no-cache"
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    body: bytes
+    media_type: str
+    etag: str
+    version: int
+
+
+def _make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # слабое сравнение: CompressionMiddleware отдаёт ETag как W/"..."
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+class PageCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @staticmethod
+    def key_for(request: Request) -> str:
+        route = request.scope.get("route")
+        name = getattr(route, "name", None) or request.url.path
+        params = "&".join(f"{k}={v}" for k, v in sorted(request.path_params.items()))
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.base_url}|{name}|{params}|{query}"
+
+    def get(self, request: Request) -> Response | None:
+        """Ответ из кэша (200 или 304) или None, если страницу надо рендерить."""
+        key = self.key_for(request)
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None or page.version != self._version:
+                # запоминаем версию данных, с которой начали рендер
+                request.state.page_cache_version = self._version
+                return None
+            self._entries.move_to_end(key)
+        return self._respond(request, page)
+
+    def put(self, request: Request, response: Response) -> Response:
+        """Кладёт отрендеренный ответ в кэш и отдаёт его с ETag."""
+        if response.status_code != 200:
+            return response
+
+        body = bytes(response.body)
+        page = CachedPage(
+            body=body,
+            media_type=response.media_type or "text/html",
+            etag=_make_etag(body),
+            version=getattr(request.state, "page_cache_version", self._version),
+        )
+        key = self.key_for(request)
+        with self._lock:
+            # пока рендерили, данные могли поменяться — такую страницу не храним
+            if page.version == self._version:
+                self._entries[key] = page
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return self._respond(request, page)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    @staticmethod
+    def _respond(request: Request, page: CachedPage) -> Response:
+        headers = {"ETag": page.etag, "Cache-Control": CACHE_CONTROL}
+        if _etag_matches(request, page.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=page.body, media_type=page.media_type, headers=headers)
+
+
+page_cache = PageCache(max_entries=get_settings().PAGE_CACHE_MAX_ENTRIES)
+
+
+@changes.on_change
+def _invalidate_on_change(event_id: int | None) -> None:
+    page_cache.invalidate()
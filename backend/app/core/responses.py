@@ -0,0 +1,42 @@
+# backend/app/core/responses.py
+
+"""
+Быстрый JSON для /api/v1.
+
+Сериализует orjson (в requirements.txt): в разы быстрее стандартного json
+и сразу даёт bytes. Запасной путь, если его нет, — json.dumps без пробелов
+и без \\u-экранирования кириллицы, с тем же выводом байт в байт. Даты и
+datetime в обоих случаях уходят строками ISO 8601.
+"""
+
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:  # в requirements.txt; без него — json.dumps
+    import orjson
+except ImportError:  # pragma: no cover - зависит от окружения
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        # str-enum (EventType) orjson сериализует сам; default — на всякий случай
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,135 @@
+# backend/app/core/static.py
+
+"""
+Статика: версии по содержимому, вечный кэш и заранее сжатые копии.
+
+url_for('static', path=...) в шаблонах (core.templates) дописывает
+?v=<хэш содержимого>. Запрос с актуальной версией отдаётся с
+Cache-Control: immutable на год — браузер больше не ходит за файлом,
+пока тот не изменится (тогда сменится и ссылка). Файлы, у которых хэш
+уже в имени (афиши, services.posters), кэшируются так же без ?v=. Без
+версии или со старой — no-cache, то есть проверка по ETag.
+
+precompress() один раз кладёт рядом с текстовыми файлами .gz (и .br,
+если установлен brotli); StaticAssets отдаёт их клиентам, которые
+принимают сжатие, не тратя CPU на каждый запрос.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from .compression import compress, negotiate, supported_encodings
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# что имеет смысл сжимать заранее (картинки уже сжаты)
+PRECOMPRESS_SUFFIXES = {".css", ".js", ".svg", ".json", ".txt", ".html"}
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+# имя файла — хэш содержимого (афиши): ссылка неизменна и без ?v=
+FINGERPRINTED = re.compile(r"(^|/)[0-9a-f]{16}(_\d+)?\.\w+$")
+
+_versions: dict[str, tuple[tuple[int, int], str]] = {}
+_versions_lock = threading.Lock()
+
+
+def is_fingerprinted(path: str) -> bool:
+    return FINGERPRINTED.search(path) is not None
+
+
+def asset_version(path: str) -> str | None:
+    """Короткий хэш содержимого файла статики; None — файла нет."""
+    full_path = STATIC_DIR / path
+    try:
+        stat = full_path.stat()
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _versions.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    digest = hashlib.blake2b(digest_size=8)
+    with open(full_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    version = digest.hexdigest()
+    with _versions_lock:
+        _versions[path] = (stamp, version)
+    return version
+
+
+def precompress(directory: Path = STATIC_DIR) -> int:
+    """Пишет .gz/.br рядом с текстовыми файлами, если копия устарела; возвращает число записанных."""
+    written = 0
+    for source in directory.rglob("*"):
+        if not source.is_file() or source.suffix not in PRECOMPRESS_SUFFIXES:
+            continue
+        data = None
+        for encoding in supported_encodings():
+            target = source.with_name(source.name + ENCODING_SUFFIXES[encoding])
+            if target.exists() and target.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+                continue
+            if data is None:
+                data = source.read_bytes()
+            packed = compress(data, encoding)
+            if len(packed) >= len(data):
+                continue
+            # через временный файл: воркеры стартуют одновременно
+            tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(packed)
+            os.replace(tmp, target)
+            written += 1
+    return written
+
+
+class StaticAssets(StaticFiles):
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            version = QueryParams(scope["query_string"]).get("v")
+            fresh = is_fingerprinted(path) or (version is not None and version == asset_version(path))
+            response.headers["Cache-Control"] = IMMUTABLE if fresh else REVALIDATE
+        if response.status_code != 200 or not isinstance(response, FileResponse):
+            return response
+        if Path(path).suffix not in PRECOMPRESS_SUFFIXES:
+            return response
+
+        request_headers = Headers(scope=scope)
+        available = tuple(
+            encoding
+            for encoding in supported_encodings()
+            if os.path.isfile(f"{response.path}{ENCODING_SUFFIXES[encoding]}")
+        )
+        response.headers["Vary"] = "Accept-Encoding"
+        encoding = negotiate(request_headers.get("accept-encoding", ""), available)
+        if encoding is None:
+            return response
+
+        variant_path = f"{response.path}{ENCODING_SUFFIXES[encoding]}"
+        variant = FileResponse(
+            variant_path,
+            stat_result=os.stat(variant_path),
+            media_type=response.media_type,
+            headers={
+                "Content-Encoding": encoding,
+                "Vary": "Accept-Encoding",
+                "Cache-Control": response.headers["Cache-Control"],
+            },
+        )
+        if self.is_not_modified(variant.headers, request_headers):
+            return NotModifiedResponse(variant.headers)
+        return variant
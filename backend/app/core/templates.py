@@ -0,0 +1,90 @@
+# backend/app/core/templates.py
+
+"""
+Общее окружение Jinja для всех роутов.
+
+Раньше каждый модуль роутов собирал свой Jinja2Templates со своим набором
+фильтров, и один и тот же шаблон компилировался в каждом воркере до пяти
+раз. Теперь окружение одно: фильтры регистрируются здесь, скомпилированный
+байткод лежит в TEMPLATE_BYTECODE_CACHE_DIR (его переиспользуют воркеры и
+перезапуски), а precompile() при старте загружает все шаблоны заранее,
+чтобы первый запрос после деплоя не платил за компиляцию. url_for для
+статики дописывает версию файла (core.static).
+
+auto_reload выключен по умолчанию: шаблоны не проверяют mtime на каждый
+рендер. Для разработки — WHOOPMANIA_TEMPLATES_AUTO_RELOAD=1.
+"""
+
+import logging
+
+import jinja2
+from fastapi.templating import Jinja2Templates
+
+from ..utils.formatting import format_ms
+from ..utils.jinja_filters import format_float_clean
+from .config import get_settings
+from ..services import posters
+from .static import asset_version, is_fingerprinted
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+def _bytecode_cache() -> jinja2.BytecodeCache | None:
+    if not settings.TEMPLATE_BYTECODE_CACHE:
+        return None
+    # пустой каталог — временная папка jinja (_jinja2-cache-<uid>)
+    return jinja2.FileSystemBytecodeCache(settings.TEMPLATE_BYTECODE_CACHE_DIR or None)
+
+
+env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(settings.TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=settings.TEMPLATES_AUTO_RELOAD,
+    bytecode_cache=_bytecode_cache(),
+)
+env.filters["format_ms"] = format_ms
+env.filters["float_clean"] = format_float_clean
+
+
+@jinja2.pass_context
+def url_for(context: dict, name: str, /, **path_params):
+    """url_for Starlette; к ссылкам на статику добавляет ?v=<хэш содержимого>."""
+    url = context["request"].url_for(name, **path_params)
+    if name == "static" and not is_fingerprinted(path_params["path"]):
+        version = asset_version(path_params["path"])
+        if version is not None:
+            url = url.include_query_params(v=version)
+    return url
+
+
+@jinja2.pass_context
+def poster_url(context: dict, key: str, width: int | None = None) -> str:
+    """Ссылка на афишу: ближайшая уменьшенная копия не уже width или оригинал."""
+    return str(context["request"].url_for("static", path=posters.poster_path(key, width)))
+
+
+@jinja2.pass_context
+def poster_srcset(context: dict, key: str) -> str:
+    request = context["request"]
+    return ", ".join(
+        f"{request.url_for('static', path=path)} {width}w" for path, width in posters.srcset_paths(key)
+    )
+
+
+# Jinja2Templates ставит свой url_for через setdefault — наш остаётся
+env.globals["url_for"] = url_for
+env.globals["poster_url"] = poster_url
+env.globals["poster_srcset"] = poster_srcset
+
+templates = Jinja2Templates(env=env)
+
+
+def precompile() -> int:
+    """Загружает все шаблоны в кэш окружения; возвращает их число."""
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    logger.info("precompiled %d templates", len(names))
+    return len(names)
@@ -1,17 +1,101 @@
 # backend/app/db.py
 
-from sqlalchemy import create_engine
+import functools
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+import anyio
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./whoopmania.db"
+from .core.config import Settings, get_settings
+from .core.metrics import metrics
 
-# Для SQLite в однопоточной FastAPI нужно отключить check_same_thread
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+
+def _sqlite_on_connect(settings: Settings, read_only: bool):
+    """PRAGMA, которые выставляются на каждое новое соединение SQLite."""
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # journal_mode хранится в самом файле БД, но выставляем и на читателях:
+        # кто бы ни подключился первым, база окажется в WAL
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    return on_connect
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    metrics.record_query(statement, time.perf_counter() - started)
+
+
+def _handle_error(context):
+    # упавший запрос не дойдёт до after_cursor_execute — снимаем его отметку
+    if context.connection is not None and context.connection.info.get("query_started"):
+        context.connection.info["query_started"].pop()
+
+
+def _instrument(new_engine: Engine) -> Engine:
+    """Время и число SQL — в метрики текущего запроса (core.metrics)."""
+    if settings.METRICS_ENABLED:
+        event.listen(new_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(new_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(new_engine, "handle_error", _handle_error)
+    return new_engine
+
+
+def _make_engine(pool_size: int, read_only: bool) -> Engine:
+    if not SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+        return _instrument(create_engine(SQLALCHEMY_DATABASE_URL, pool_size=pool_size))
+
+    # Для SQLite в однопоточной FastAPI нужно отключить check_same_thread
+    new_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    event.listen(new_engine, "connect", _sqlite_on_connect(settings, read_only))
+    return _instrument(new_engine)
+
+
+# Писатель: ровно одно соединение — в SQLite писать может только один.
+# Админка и импорт RH идут через него.
+engine = _make_engine(pool_size=1, read_only=False)
+
+# Читатели: пул read-only соединений для публичных страниц. В WAL они
+# читают свой снимок и не ждут писателя.
+read_engine = _make_engine(pool_size=settings.DB_READ_POOL_SIZE, read_only=True)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 
 class Base(DeclarativeBase):
@@ -20,9 +104,176 @@ class Base(DeclarativeBase):
 
 
 def get_db():
-    """Зависимость FastAPI для получения сессии БД."""
+    """Зависимость FastAPI для получения сессии БД (соединение-писатель)."""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Зависимость FastAPI для публичных страниц: read-only сессия."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Ограниченные пулы потоков для синхронной работы с БД из async-роутов:
+# отдельные для чтения и записи, чтобы очередь к писателю не занимала
+# потоки читателей. Лимитеры создаются лениво: anyio требует запущенный
+# event loop.
+_read_limiter: anyio.CapacityLimiter | None = None
+_write_limiter: anyio.CapacityLimiter | None = None
+
+
+def _get_read_limiter() -> anyio.CapacityLimiter:
+    global _read_limiter
+    if _read_limiter is None:
+        _read_limiter = anyio.CapacityLimiter(settings.DB_THREADS)
+    return _read_limiter
+
+
+def _get_write_limiter() -> anyio.CapacityLimiter:
+    global _write_limiter
+    if _write_limiter is None:
+        _write_limiter = anyio.CapacityLimiter(1)
+    return _write_limiter
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Выполняет синхронную функцию чтения из БД в пуле потоков,
+    чтобы запросы не блокировали event loop uvicorn.
+    """
+    return await anyio.to_thread.run_sync(
+        functools.partial(func, *args, **kwargs),
+        limiter=_get_read_limiter(),
+    )
+
+
+async def run_db_write(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """То же, что run_db, но для сессий get_db (писатель, один поток)."""
+    return await anyio.to_thread.run_sync(
+        functools.partial(func, *args, **kwargs),
+        limiter=_get_write_limiter(),
+    )
+
+
+# ----------------------------------------------------------------
+# поколения данных: согласованность кэшей между процессами
+# ----------------------------------------------------------------
+
+GLOBAL_SCOPE = "all"
+
+
+def event_scope(event_id: int) -> str:
+    return f"event:{event_id}"
+
+
+_BUMP_SQL = (
+    "INSERT INTO cache_generations (scope, generation) VALUES (:scope, 1) "
+    "ON CONFLICT (scope) DO UPDATE SET generation = generation + 1"
+)
+_SELECT_SQL = "SELECT scope, generation FROM cache_generations"
+
+
+class Generations:
+    """
+    Счётчики поколений в таблице cache_generations, общие для всех
+    процессов uvicorn. После каждой записи core.changes увеличивает
+    счётчик "all" и счётчик события; кэш в памяти помнит поколение, с
+    которым собран, и сверяется с current().
+
+    Для SQLite проверка почти бесплатна: у класса свои соединения (не из
+    пулов), и пока PRAGMA data_version не изменилась — никто в базу не
+    писал, — таблицу не перечитываем. Счётчики увеличиваются тоже своим
+    соединением, а не единственным соединением писателя: оно может быть
+    ещё занято сессией вызывающего кода.
+    """
+
+    def __init__(self, url: str) -> None:
+        self._url = url
+        # чтение и запись — разные соединения и замки: bump может ждать
+        # блокировку записи, а current() не должен ждать вместе с ним
+        self._read_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._read_conn: sqlite3.Connection | None = None
+        self._write_conn: sqlite3.Connection | None = None
+        self._data_version: int | None = None
+        self._snapshot: dict[str, int] = {}
+        self._missing_logged = False
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            make_url(self._url).database or ":memory:",
+            timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+
+    @property
+    def _sqlite(self) -> bool:
+        return self._url.startswith("sqlite")
+
+    def _table_missing(self, exc: Exception) -> dict[str, int]:
+        if not self._missing_logged:
+            logger.warning("cache_generations is unavailable (%s); run migrations", exc)
+            self._missing_logged = True
+        return {}
+
+    def current(self) -> dict[str, int]:
+        """Текущие поколения {scope: n}; пустой словарь — таблицы ещё нет."""
+        with self._read_lock:
+            try:
+                if not self._sqlite:
+                    with read_engine.connect() as sa_conn:
+                        return dict(sa_conn.execute(text(_SELECT_SQL)).all())
+                if self._read_conn is None:
+                    self._read_conn = self._connect()
+                conn = self._read_conn
+                data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+                if data_version != self._data_version:
+                    self._snapshot = dict(conn.execute(_SELECT_SQL).fetchall())
+                    self._data_version = data_version
+                return self._snapshot
+            except (sqlite3.OperationalError, OperationalError) as exc:
+                return self._table_missing(exc)
+
+    def generation(self, scope: str = GLOBAL_SCOPE) -> int:
+        return self.current().get(scope, 0)
+
+    def bump(self, event_id: int | None = None) -> dict[str, int]:
+        """Увеличивает "all" (и счётчик события); возвращает новые значения."""
+        scopes = [GLOBAL_SCOPE] + ([event_scope(event_id)] if event_id is not None else [])
+        with self._write_lock:
+            try:
+                if not self._sqlite:
+                    with engine.begin() as sa_conn:
+                        for scope in scopes:
+                            sa_conn.execute(text(_BUMP_SQL), {"scope": scope})
+                        rows = sa_conn.execute(text(_SELECT_SQL)).all()
+                    return {scope: n for scope, n in rows if scope in scopes}
+                if self._write_conn is None:
+                    self._write_conn = self._connect()
+                conn = self._write_conn
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for scope in scopes:
+                        conn.execute(_BUMP_SQL, {"scope": scope})
+                    placeholders = ",".join("?" * len(scopes))
+                    rows = conn.execute(
+                        f"{_SELECT_SQL} WHERE scope IN ({placeholders})", scopes
+                    ).fetchall()
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                return dict(rows)
+            except (sqlite3.OperationalError, OperationalError) as exc:
+                return self._table_missing(exc)
+
+
+generations = Generations(SQLALCHEMY_DATABASE_URL)
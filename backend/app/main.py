@@ -1,26 +1,70 @@
 # backend/app/main.py
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 
 from .api.routes import pages, events, pilots   # добавим pilots
 from .api.routes import qual_import   # ← добавить импорт
 from .api.routes import admin   # ← ДОБАВЬ
-from .db import Base, engine
+from .api.routes import standings
+from .api.routes import monitoring
+from .api.routes import api_v1
+from .core import changes
+from .core.compression import CompressionMiddleware
+from .core.config import get_settings
+from .core.metrics import MetricsMiddleware, instrument_templates
+from .core.static import STATIC_DIR, StaticAssets, precompress
+from .core.templates import precompile, templates
+from .services import site_export
+from .services.import_jobs import jobs
+from .db import engine
+from . import migrations
 
 from . import models  # noqa: F401  # важно, чтобы модели подхватились
 
-app = FastAPI(root_path="/whoopmania")
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
 
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Схему создают миграции отдельным шагом (python -m backend.app.migrations),
+    # здесь только предупреждаем, если база отстала от кода.
+    missing = migrations.pending(engine)
+    if missing:
+        logger.warning(
+            "database schema is %d migration(s) behind; run `python -m backend.app.migrations upgrade`",
+            len(missing),
+        )
+    if settings.TEMPLATES_PRECOMPILE:
+        precompile()
+    if settings.STATIC_PRECOMPRESS:
+        try:
+            precompress()
+        except OSError:
+            logger.warning("static files were not precompressed", exc_info=True)
+    await jobs.start()
+    watcher = None
+    if settings.CACHE_SYNC_INTERVAL_MS > 0:
+        # записи других процессов uvicorn → те же слушатели core.changes
+        watcher = asyncio.create_task(changes.watch())
+    try:
+        yield
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        await jobs.stop()
 
-from pathlib import Path
 
-BASE_DIR = Path(__file__).resolve().parent
+app = FastAPI(root_path="/whoopmania", lifespan=lifespan)
 
 app.mount(
     "/static",
-    StaticFiles(directory=BASE_DIR / "static"),
+    StaticAssets(directory=STATIC_DIR),
     name="static",
 )
 
@@ -28,5 +72,18 @@ app.mount(
 app.include_router(pages.router)
 app.include_router(events.router)
 app.include_router(pilots.router)   # новый роутер
+app.include_router(standings.router)
 app.include_router(qual_import.router)   # ← подключить
 app.include_router(admin.router)   # ← ДОБАВЬ
+app.include_router(api_v1.router)
+
+# пересборка статического экспорта после записи (если он включён)
+site_export.attach(app)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_templates(templates.env)
+    app.include_router(monitoring.router)
+
+# снаружи всех: сжимает и страницы, и ответы /metrics
+app.add_middleware(CompressionMiddleware)
@@ -0,0 +1,140 @@
+# backend/app/manage.py
+
+"""
+Служебные команды:
+
+    python -m backend.app.manage rebuild-standings
+    python -m backend.app.manage compress-static
+    python -m backend.app.manage adopt-posters
+    python -m backend.app.manage export-site   # в WHOOPMANIA_SITE_EXPORT_DIR
+    python -m backend.app.manage rerank-qualification   # по WHOOPMANIA_QUAL_RANKING_RULE
+"""
+
+import argparse
+import sys
+
+from .db import SessionLocal
+from . import models  # noqa: F401  # важно, чтобы модели подхватились
+
+
+def rebuild_standings() -> int:
+    from .services.standings import rebuild_standings as rebuild
+
+    with SessionLocal() as db:
+        count = rebuild(db)
+        db.commit()
+    print(f"standings rebuilt from {count} event(s)")
+    return 0
+
+
+def compress_static() -> int:
+    from .core.static import precompress
+
+    print(f"{precompress()} compressed static file(s) written")
+    return 0
+
+
+def adopt_posters() -> int:
+    from .db import engine
+    from .services.posters import adopt_legacy
+
+    with engine.begin() as conn:
+        count = adopt_legacy(conn)
+    print(f"{count} legacy poster(s) adopted")
+    return 0
+
+
+def export_site() -> int:
+    import asyncio
+
+    from .core.config import get_settings
+    from .main import app
+    from .services.site_export import SiteExporter
+
+    settings = get_settings()
+    if not settings.SITE_EXPORT_DIR:
+        print("set WHOOPMANIA_SITE_EXPORT_DIR to the output directory", file=sys.stderr)
+        return 2
+    exporter = SiteExporter(app, settings.SITE_EXPORT_DIR, settings.SITE_EXPORT_BASE_URL)
+    result = asyncio.run(exporter.build_all())
+    print(f"static site exported to {settings.SITE_EXPORT_DIR}: {result}")
+    return 0
+
+
+def _export_events(event_ids: list[int]) -> None:
+    """
+    Пересобирает экспорт изменённых событий. Процессы приложения сами
+    пересобирают только после своих записей (on_local_change), так что
+    команда, пишущая в базу, делает это за них.
+    """
+    import asyncio
+
+    from .core.config import get_settings
+    from .main import app
+    from .services.site_export import ExportResult, SiteExporter
+
+    settings = get_settings()
+    if not settings.SITE_EXPORT_DIR or not event_ids:
+        return
+    exporter = SiteExporter(app, settings.SITE_EXPORT_DIR, settings.SITE_EXPORT_BASE_URL)
+
+    async def build() -> ExportResult:
+        result = ExportResult()
+        for event_id in event_ids:
+            part = await exporter.build_event(event_id)
+            result.written += part.written
+            result.unchanged += part.unchanged
+            result.removed += part.removed
+        return result
+
+    result = asyncio.run(build())
+    print(f"static site updated in {settings.SITE_EXPORT_DIR}: {result}")
+
+
+def rerank_qualification() -> int:
+    from sqlalchemy import select
+
+    from .core.config import get_settings
+    from .db import generations
+    from .models.event import Event
+    from .services.qual_ranking import get_rule, rerank_event
+
+    rule = get_rule()
+    changed = 0
+    changed_events: list[int] = []
+    with SessionLocal() as db:
+        for event_id in db.scalars(select(Event.id).order_by(Event.id)).all():
+            # по транзакции на событие: писатель не занят надолго
+            rows = rerank_event(db, event_id, rule)
+            db.commit()
+            if rows:
+                # запущенные процессы приложения сбросят кэши этого события
+                generations.bump(event_id)
+                changed_events.append(event_id)
+                changed += rows
+    print(
+        f"qualification re-ranked by '{get_settings().QUAL_RANKING_RULE}': "
+        f"{changed} row(s) in {len(changed_events)} event(s) changed"
+    )
+    _export_events(changed_events)
+    return 0
+
+
+COMMANDS = {
+    "rebuild-standings": rebuild_standings,
+    "compress-static": compress_static,
+    "adopt-posters": adopt_posters,
+    "export-site": export_site,
+    "rerank-qualification": rerank_qualification,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.manage")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+    return COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
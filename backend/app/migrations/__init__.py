@@ -0,0 +1,144 @@
+# backend/app/migrations/__init__.py
+
+"""
+Версионированные миграции схемы.
+
+Каждая миграция — модуль с DESCRIPTION и upgrade(conn). Номер версии —
+позиция в MIGRATIONS (с 1); текущая версия базы хранится в
+PRAGMA user_version. Миграции запускаются отдельным шагом при деплое:
+
+    python -m backend.app.migrations upgrade
+    python -m backend.app.migrations status
+    python -m backend.app.migrations check   # EXPLAIN QUERY PLAN горячих запросов
+"""
+
+from dataclasses import dataclass
+from types import ModuleType
+
+from sqlalchemy.engine import Connection, Dialect, Engine
+from sqlalchemy.sql import Executable
+
+from . import (
+    m0001_initial,
+    m0002_hot_query_indexes,
+    m0003_pilot_stats,
+    m0004_pilots_fts,
+    m0005_season_standings,
+    m0006_event_posters,
+    m0007_import_jobs,
+    m0008_cache_generations,
+    m0009_lap_times,
+    m0010_qual_ranking,
+    m0011_import_job_attempts,
+    m0012_import_job_heartbeat,
+)
+
+MIGRATIONS: list[ModuleType] = [
+    m0001_initial,
+    m0002_hot_query_indexes,
+    m0003_pilot_stats,
+    m0004_pilots_fts,
+    m0005_season_standings,
+    m0006_event_posters,
+    m0007_import_jobs,
+    m0008_cache_generations,
+    m0009_lap_times,
+    m0010_qual_ranking,
+    m0011_import_job_attempts,
+    m0012_import_job_heartbeat,
+]
+
+
+def latest_version() -> int:
+    return len(MIGRATIONS)
+
+
+def current_version(conn: Connection) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def pending(engine: Engine) -> list[tuple[int, str]]:
+    """Список (версия, описание) ещё не применённых миграций."""
+    with engine.connect() as conn:
+        version = current_version(conn)
+    return [
+        (number, module.DESCRIPTION)
+        for number, module in enumerate(MIGRATIONS, start=1)
+        if number > version
+    ]
+
+
+def upgrade(engine: Engine) -> list[tuple[int, str]]:
+    """Применяет недостающие миграции, каждую в своей транзакции."""
+    applied = []
+    for number, description in pending(engine):
+        with engine.begin() as conn:
+            MIGRATIONS[number - 1].upgrade(conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {number}")
+        applied.append((number, description))
+    return applied
+
+
+# ----------------------------------------------------------------
+# проверка планов горячих запросов
+# ----------------------------------------------------------------
+
+@dataclass(frozen=True)
+class HotQuery:
+    name: str
+    statement: Executable
+    # допускается ли сортировка во временном B-tree (ORDER BY по join'у)
+    allow_temp_sort: bool = False
+
+    def sql(self, dialect: Dialect) -> str:
+        """SQL с подставленными значениями: EXPLAIN нужен законченный запрос."""
+        compiled = self.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        return str(compiled)
+
+
+def hot_queries() -> list[HotQuery]:
+    """
+    Горячие запросы страниц — те же select(), которыми читают сервисы,
+    так что проверка не расходится с кодом. Импорт ленивый: самим
+    миграциям сервисы не нужны.
+    """
+    from ..services import event_page, pilot_page, pilot_search
+
+    return [
+        HotQuery("event_detail: qualification", event_page.qualification_stmt(1)),
+        HotQuery("event_detail: bracket races", event_page.races_stmt(1)),
+        HotQuery("event_detail: bracket results", event_page.race_results_stmt([1, 2, 3])),
+        HotQuery("index", event_page.events_stmt(5)),
+        HotQuery("events_list", event_page.events_stmt()),
+        HotQuery("pilots_list", pilot_search.pilots_stmt()),
+        HotQuery(
+            "pilot_detail: history",
+            pilot_page.history_stmt(1),
+            # сортировка по дате события после join; строк на пилота немного
+            allow_temp_sort=True,
+        ),
+    ]
+
+
+def explain(conn: Connection, sql: str) -> list[str]:
+    return [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+
+
+def check_query_plans(engine: Engine) -> list[tuple[HotQuery, list[str], list[str]]]:
+    """
+    Возвращает (запрос, план, проблемы) для каждого горячего запроса.
+    Проблема — полный просмотр таблицы без индекса или сортировка
+    во временном B-tree там, где её должен давать индекс.
+    """
+    report = []
+    with engine.connect() as conn:
+        for query in hot_queries():
+            plan = explain(conn, query.sql(engine.dialect))
+            problems = []
+            for line in plan:
+                if line.startswith("SCAN ") and " USING " not in line:
+                    problems.append(f"full table scan: {line}")
+                if "USE TEMP B-TREE" in line and not query.allow_temp_sort:
+                    problems.append(f"sort without index: {line}")
+            report.append((query, plan, problems))
+    return report
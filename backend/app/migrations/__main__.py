@@ -0,0 +1,49 @@
+# backend/app/migrations/__main__.py
+
+import argparse
+import sys
+
+from ..db import engine
+from . import check_query_plans, current_version, latest_version, pending, upgrade
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.migrations")
+    parser.add_argument(
+        "command",
+        choices=["upgrade", "status", "check"],
+        nargs="?",
+        default="upgrade",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "upgrade":
+        applied = upgrade(engine)
+        for number, description in applied:
+            print(f"applied {number:04d}: {description}")
+        if not applied:
+            print(f"schema is up to date (version {latest_version()})")
+        return 0
+
+    if args.command == "status":
+        with engine.connect() as conn:
+            version = current_version(conn)
+        print(f"schema version {version} of {latest_version()}")
+        for number, description in pending(engine):
+            print(f"  pending {number:04d}: {description}")
+        return 0
+
+    failed = False
+    for query, plan, problems in check_query_plans(engine):
+        status = "FAIL" if problems else "ok"
+        print(f"[{status}] {query.name}")
+        for line in plan:
+            print(f"    {line}")
+        for problem in problems:
+            print(f"    !! {problem}")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# backend/app/migrations/m0001_initial.py
+
+"""Исходная схема (то, что раньше создавал create_all в main.py)."""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "initial schema"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER NOT NULL,
+        name VARCHAR NOT NULL,
+        event_type VARCHAR(8) NOT NULL,
+        date DATE NOT NULL,
+        location VARCHAR,
+        description VARCHAR,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_events_id ON events (id)",
+    """
+    CREATE TABLE IF NOT EXISTS pilots (
+        id INTEGER NOT NULL,
+        nickname VARCHAR NOT NULL,
+        first_name VARCHAR,
+        last_name VARCHAR,
+        callsign VARCHAR,
+        city VARCHAR,
+        club VARCHAR,
+        telegram_id BIGINT,
+        created_at DATETIME NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_pilots_nickname ON pilots (nickname)",
+    "CREATE INDEX IF NOT EXISTS ix_pilots_id ON pilots (id)",
+    """
+    CREATE TABLE IF NOT EXISTS bracket_races (
+        id INTEGER NOT NULL,
+        event_id INTEGER NOT NULL,
+        number INTEGER NOT NULL,
+        name VARCHAR(50) NOT NULL,
+        short_label VARCHAR(20) NOT NULL,
+        stage VARCHAR(50) NOT NULL,
+        bracket_side VARCHAR(10) NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(event_id) REFERENCES events (id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS qualification_results (
+        id INTEGER NOT NULL,
+        event_id INTEGER NOT NULL,
+        pilot_id INTEGER NOT NULL,
+        rank INTEGER,
+        best_lap_ms INTEGER,
+        best3_avg_ms INTEGER,
+        laps_total INTEGER,
+        attempts_count INTEGER,
+        consecutives_count INTEGER,
+        PRIMARY KEY (id),
+        FOREIGN KEY(event_id) REFERENCES events (id) ON DELETE CASCADE,
+        FOREIGN KEY(pilot_id) REFERENCES pilots (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_qualification_results_id ON qualification_results (id)",
+    """
+    CREATE TABLE IF NOT EXISTS bracket_race_results (
+        id INTEGER NOT NULL,
+        bracket_race_id INTEGER NOT NULL,
+        pilot_id INTEGER,
+        slot_index INTEGER,
+        points_r1 INTEGER,
+        points_r2 INTEGER,
+        points_r3 INTEGER,
+        points_r4 INTEGER,
+        points_r5 INTEGER,
+        total_points FLOAT,
+        final_position INTEGER,
+        PRIMARY KEY (id),
+        FOREIGN KEY(bracket_race_id) REFERENCES bracket_races (id) ON DELETE CASCADE,
+        FOREIGN KEY(pilot_id) REFERENCES pilots (id) ON DELETE SET NULL
+    )
+    """,
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in STATEMENTS:
+        conn.exec_driver_sql(sql)
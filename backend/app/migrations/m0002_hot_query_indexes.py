@@ -0,0 +1,36 @@
+# backend/app/migrations/m0002_hot_query_indexes.py
+
+"""
+Индексы под горячие запросы страниц событий и пилотов.
+
+- квалификация события: WHERE event_id ORDER BY rank → (event_id, rank)
+- гонки сетки: WHERE event_id ORDER BY number → (event_id, number)
+- результаты гонок: WHERE bracket_race_id IN (...) и выборки по пилоту
+- история пилота: WHERE pilot_id
+- списки событий: ORDER BY date
+"""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "indexes for event/pilot page queries"
+
+STATEMENTS = [
+    # одиночный индекс по event_id покрывается составным (event_id, rank)
+    "DROP INDEX IF EXISTS ix_qualification_results_event_id",
+    "CREATE INDEX IF NOT EXISTS ix_qualification_results_event_id_rank "
+    "ON qualification_results (event_id, rank)",
+    "CREATE INDEX IF NOT EXISTS ix_qualification_results_pilot_id "
+    "ON qualification_results (pilot_id)",
+    "CREATE INDEX IF NOT EXISTS ix_bracket_races_event_id_number "
+    "ON bracket_races (event_id, number)",
+    "CREATE INDEX IF NOT EXISTS ix_bracket_race_results_bracket_race_id "
+    "ON bracket_race_results (bracket_race_id)",
+    "CREATE INDEX IF NOT EXISTS ix_bracket_race_results_pilot_id "
+    "ON bracket_race_results (pilot_id)",
+    "CREATE INDEX IF NOT EXISTS ix_events_date ON events (date)",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in STATEMENTS:
+        conn.exec_driver_sql(sql)
@@ -0,0 +1,87 @@
+# backend/app/migrations/m0003_pilot_stats.py
+
+"""Таблица pilot_stats и её первичное заполнение по уже загруженным событиям."""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "materialized pilot career stats"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS pilot_stats (
+        pilot_id INTEGER NOT NULL,
+        events_entered INTEGER NOT NULL,
+        best_qual_rank INTEGER,
+        avg_qual_rank FLOAT,
+        best_lap_ms INTEGER,
+        best3_avg_ms INTEGER,
+        bracket_events INTEGER NOT NULL,
+        bracket_races INTEGER NOT NULL,
+        finals INTEGER NOT NULL,
+        podiums INTEGER NOT NULL,
+        wins INTEGER NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (pilot_id),
+        FOREIGN KEY(pilot_id) REFERENCES pilots (id) ON DELETE CASCADE
+    )
+    """,
+    "DELETE FROM pilot_stats",
+    """
+    WITH
+    part AS (
+        SELECT pilot_id, event_id FROM qualification_results
+        UNION
+        SELECT brr.pilot_id, br.event_id
+        FROM bracket_race_results AS brr
+        JOIN bracket_races AS br ON br.id = brr.bracket_race_id
+        WHERE brr.pilot_id IS NOT NULL
+    ),
+    ev AS (
+        SELECT pilot_id, count(*) AS events_entered FROM part GROUP BY pilot_id
+    ),
+    q AS (
+        SELECT
+            pilot_id,
+            min(rank) AS best_qual_rank,
+            round(avg(rank), 2) AS avg_qual_rank,
+            min(best_lap_ms) AS best_lap_ms,
+            min(CASE WHEN coalesce(consecutives_count, 3) >= 3 THEN best3_avg_ms END) AS best3_avg_ms
+        FROM qualification_results
+        GROUP BY pilot_id
+    ),
+    b AS (
+        SELECT
+            brr.pilot_id,
+            count(DISTINCT br.event_id) AS bracket_events,
+            count(brr.id) AS bracket_races,
+            sum(CASE WHEN br.stage = 'final' THEN 1 ELSE 0 END) AS finals,
+            sum(CASE WHEN br.stage = 'final' AND brr.final_position <= 3 THEN 1 ELSE 0 END) AS podiums,
+            sum(CASE WHEN br.stage = 'final' AND brr.final_position = 1 THEN 1 ELSE 0 END) AS wins
+        FROM bracket_race_results AS brr
+        JOIN bracket_races AS br ON br.id = brr.bracket_race_id
+        WHERE brr.pilot_id IS NOT NULL
+        GROUP BY brr.pilot_id
+    )
+    INSERT INTO pilot_stats (
+        pilot_id, events_entered,
+        best_qual_rank, avg_qual_rank, best_lap_ms, best3_avg_ms,
+        bracket_events, bracket_races, finals, podiums, wins,
+        updated_at
+    )
+    SELECT
+        ev.pilot_id, ev.events_entered,
+        q.best_qual_rank, q.avg_qual_rank, q.best_lap_ms, q.best3_avg_ms,
+        coalesce(b.bracket_events, 0), coalesce(b.bracket_races, 0),
+        coalesce(b.finals, 0), coalesce(b.podiums, 0), coalesce(b.wins, 0),
+        datetime('now')
+    FROM ev
+    JOIN pilots ON pilots.id = ev.pilot_id
+    LEFT JOIN q ON q.pilot_id = ev.pilot_id
+    LEFT JOIN b ON b.pilot_id = ev.pilot_id
+    """,
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in STATEMENTS:
+        conn.exec_driver_sql(sql)
@@ -0,0 +1,50 @@
+# backend/app/migrations/m0004_pilots_fts.py
+
+"""
+Полнотекстовый индекс пилотов (FTS5, external content = pilots).
+Триггеры держат его в синхронизации с таблицей pilots.
+"""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "FTS5 search index for pilots"
+
+STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS pilots_fts USING fts5(
+        nickname, first_name, last_name, callsign, city, club,
+        content='pilots',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pilots_fts_ai AFTER INSERT ON pilots BEGIN
+        INSERT INTO pilots_fts (rowid, nickname, first_name, last_name, callsign, city, club)
+        VALUES (new.id, new.nickname, new.first_name, new.last_name, new.callsign, new.city, new.club);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pilots_fts_ad AFTER DELETE ON pilots BEGIN
+        INSERT INTO pilots_fts (pilots_fts, rowid, nickname, first_name, last_name, callsign, city, club)
+        VALUES ('delete', old.id, old.nickname, old.first_name, old.last_name, old.callsign, old.city, old.club);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pilots_fts_au AFTER UPDATE OF
+        nickname, first_name, last_name, callsign, city, club ON pilots
+    BEGIN
+        INSERT INTO pilots_fts (pilots_fts, rowid, nickname, first_name, last_name, callsign, city, club)
+        VALUES ('delete', old.id, old.nickname, old.first_name, old.last_name, old.callsign, old.city, old.club);
+        INSERT INTO pilots_fts (rowid, nickname, first_name, last_name, callsign, city, club)
+        VALUES (new.id, new.nickname, new.first_name, new.last_name, new.callsign, new.city, new.club);
+    END
+    """,
+    "INSERT INTO pilots_fts (pilots_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in STATEMENTS:
+        conn.exec_driver_sql(sql)
@@ -0,0 +1,45 @@
+# backend/app/migrations/m0005_season_standings.py
+
+"""
+Таблицы сезонного зачёта. Заполняются сервисом standings:
+после миграции один раз выполнить `python -m backend.app.manage rebuild-standings`.
+"""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "season standings tables"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS standings_contributions (
+        event_id INTEGER NOT NULL,
+        pilot_id INTEGER NOT NULL,
+        season INTEGER NOT NULL,
+        qual_points FLOAT NOT NULL,
+        bracket_points FLOAT NOT NULL,
+        points FLOAT NOT NULL,
+        PRIMARY KEY (event_id, pilot_id),
+        FOREIGN KEY(event_id) REFERENCES events (id) ON DELETE CASCADE,
+        FOREIGN KEY(pilot_id) REFERENCES pilots (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_standings_contributions_season_pilot "
+    "ON standings_contributions (season, pilot_id)",
+    """
+    CREATE TABLE IF NOT EXISTS season_standings (
+        season INTEGER NOT NULL,
+        pilot_id INTEGER NOT NULL,
+        points FLOAT NOT NULL,
+        events INTEGER NOT NULL,
+        PRIMARY KEY (season, pilot_id),
+        FOREIGN KEY(pilot_id) REFERENCES pilots (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_season_standings_season_points "
+    "ON season_standings (season, points)",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in STATEMENTS:
+        conn.exec_driver_sql(sql)
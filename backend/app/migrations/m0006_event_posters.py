@@ -0,0 +1,17 @@
+# backend/app/migrations/m0006_event_posters.py
+
+"""
+Колонка events.poster. Старые афиши static/posters/event_<id>.* в
+хранилище по хэшу переносит отдельная команда
+`python -m backend.app.manage adopt-posters`: миграция меняет только схему.
+"""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "event posters in content-addressed storage"
+
+
+def upgrade(conn: Connection) -> None:
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(events)")}
+    if "poster" not in columns:
+        conn.exec_driver_sql("ALTER TABLE events ADD COLUMN poster VARCHAR")
@@ -0,0 +1,34 @@
+# backend/app/migrations/m0007_import_jobs.py
+
+"""Таблица фоновых задач импорта RH (services.import_jobs)."""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "background import jobs"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS import_jobs (
+        id INTEGER NOT NULL,
+        kind VARCHAR NOT NULL,
+        event_id INTEGER NOT NULL,
+        status VARCHAR NOT NULL,
+        payload VARCHAR NOT NULL,
+        payload_bytes INTEGER NOT NULL,
+        rows_total INTEGER,
+        result TEXT,
+        error TEXT,
+        created_at DATETIME NOT NULL,
+        started_at DATETIME,
+        finished_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(event_id) REFERENCES events (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_import_jobs_status ON import_jobs (status)",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in STATEMENTS:
+        conn.exec_driver_sql(sql)
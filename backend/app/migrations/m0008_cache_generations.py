@@ -0,0 +1,19 @@
+# backend/app/migrations/m0008_cache_generations.py
+
+"""Счётчики поколений данных для кэшей нескольких процессов (db.Generations)."""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "cache generation counters"
+
+
+def upgrade(conn: Connection) -> None:
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS cache_generations (
+            scope VARCHAR NOT NULL,
+            generation INTEGER NOT NULL,
+            PRIMARY KEY (scope)
+        )
+        """
+    )
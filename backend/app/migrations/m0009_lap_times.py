@@ -0,0 +1,30 @@
+# backend/app/migrations/m0009_lap_times.py
+
+"""Круги из экспорта RH упакованными массивами (services.laps)."""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "packed lap times"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS lap_times (
+        event_id INTEGER NOT NULL,
+        pilot_id INTEGER NOT NULL,
+        heat_id INTEGER NOT NULL,
+        round_id INTEGER NOT NULL,
+        heat_name VARCHAR,
+        holeshot_ms INTEGER,
+        laps BLOB NOT NULL,
+        PRIMARY KEY (event_id, pilot_id, heat_id, round_id),
+        FOREIGN KEY(event_id) REFERENCES events (id) ON DELETE CASCADE,
+        FOREIGN KEY(pilot_id) REFERENCES pilots (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_lap_times_pilot_id ON lap_times (pilot_id)",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in STATEMENTS:
+        conn.exec_driver_sql(sql)
@@ -0,0 +1,21 @@
+# backend/app/migrations/m0010_qual_ranking.py
+
+"""
+Позиция RH отдельно от места (services.qual_ranking). Существующие места
+и были позициями RH — копируются как есть; пересчитать их по правилу:
+`python -m backend.app.manage rerank-qualification`.
+"""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "qualification RH position"
+
+STATEMENTS = [
+    "ALTER TABLE qualification_results ADD COLUMN rh_position INTEGER",
+    "UPDATE qualification_results SET rh_position = rank",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in STATEMENTS:
+        conn.exec_driver_sql(sql)
@@ -0,0 +1,20 @@
+# backend/app/migrations/m0011_import_job_attempts.py
+
+"""
+Счётчик попыток задачи импорта: задачи, брошенные посреди разбора
+(процесс упал или был перезапущен), возвращаются в очередь, пока
+попыток меньше WHOOPMANIA_IMPORT_MAX_ATTEMPTS.
+"""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "import job attempts"
+
+STATEMENTS = [
+    "ALTER TABLE import_jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in STATEMENTS:
+        conn.exec_driver_sql(sql)
@@ -0,0 +1,23 @@
+# backend/app/migrations/m0012_import_job_heartbeat.py
+
+"""
+Отметка живого воркера у задачи импорта: брошенной считается задача,
+давно не обновлявшая heartbeat_at, а не начатая давно — долгий разбор
+большого экспорта больше не возвращается в очередь посреди работы.
+"""
+
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "import job heartbeat"
+
+STATEMENTS = [
+    "ALTER TABLE import_jobs ADD COLUMN heartbeat_at DATETIME",
+    # задачам, взятым до миграции, — отметка по времени начала
+    "UPDATE import_jobs SET heartbeat_at = started_at "
+    "WHERE status IN ('parsing', 'importing')",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in STATEMENTS:
+        conn.exec_driver_sql(sql)
@@ -4,3 +4,7 @@ from .event import Event, EventType  # noqa: F401
 from .pilot import Pilot  # noqa: F401
 from .qualification import QualificationResult  # noqa: F401
 from .bracket import BracketRace, BracketRaceResult
+from .pilot_stats import PilotStats  # noqa: F401
+from .standings import SeasonStanding, StandingsContribution  # noqa: F401
+from .import_job import ImportJob  # noqa: F401
+from .lap_times import LapTimes  # noqa: F401
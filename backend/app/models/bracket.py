@@ -1,5 +1,5 @@
 # backend/app/models/bracket.py
-from sqlalchemy import Column, Integer, String, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 
 from ..db import Base
@@ -7,6 +7,9 @@ from ..db import Base
 
 class BracketRace(Base):
     __tablename__ = "bracket_races"
+    __table_args__ = (
+        Index("ix_bracket_races_event_id_number", "event_id", "number"),
+    )
 
     id = Column(Integer, primary_key=True)
     event_id = Column(
@@ -26,6 +29,7 @@ class BracketRace(Base):
         "BracketRaceResult",
         back_populates="race",
         cascade="all, delete-orphan",
+        order_by="(BracketRaceResult.slot_index, BracketRaceResult.id)",
     )
 
 
@@ -41,11 +45,13 @@ class BracketRaceResult(Base):
         Integer,
         ForeignKey("bracket_races.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     pilot_id = Column(
         Integer,
         ForeignKey("pilots.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
     )
 
     # просто порядковый номер строки (1..4), чтобы фиксировать исходное положение
@@ -25,9 +25,11 @@ class Event(Base):
         nullable=False,
         default=EventType.RACE,
     )
-    date: Mapped[date] = mapped_column(Date, nullable=False)
+    date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     location: Mapped[str | None] = mapped_column(String, nullable=True)
     description: Mapped[str | None] = mapped_column(String, nullable=True)
+    # имя файла афиши в static/posters (services.posters), None — афиши нет
+    poster: Mapped[str | None] = mapped_column(String, nullable=True)
     bracket_races = relationship(
         "BracketRace",
         back_populates="event",
@@ -0,0 +1,41 @@
+# backend/app/models/import_job.py
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+
+
+class ImportJob(Base):
+    """
+    Фоновая задача импорта (services.import_jobs).
+    Тело загрузки лежит файлом в IMPORT_SPOOL_DIR, здесь — только статус.
+    """
+    __tablename__ = "import_jobs"
+    __table_args__ = (
+        Index("ix_import_jobs_status", "status"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    event_id: Mapped[int] = mapped_column(
+        ForeignKey("events.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # queued → parsing → importing → done | failed
+    status: Mapped[str] = mapped_column(String, nullable=False, default="queued")
+    payload: Mapped[str] = mapped_column(String, nullable=False)  # имя файла в спуле
+    payload_bytes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rows_total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    result: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON со счётчиками
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # сколько раз брали в работу
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # последняя отметка воркера, пока задача в parsing/importing
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,34 @@
+# backend/app/models/lap_times.py
+
+from sqlalchemy import ForeignKey, Index, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+
+
+class LapTimes(Base):
+    """
+    Круги пилота в одном раунде заезда RH (services.laps).
+    Времена кругов — упакованный массив uint32 (мс, little-endian) в laps:
+    одна строка на раунд пилота вместо строки на круг.
+    """
+    __tablename__ = "lap_times"
+    __table_args__ = (
+        # круги пилота по всем событиям
+        Index("ix_lap_times_pilot_id", "pilot_id"),
+    )
+
+    event_id: Mapped[int] = mapped_column(
+        ForeignKey("events.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    pilot_id: Mapped[int] = mapped_column(
+        ForeignKey("pilots.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    heat_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    round_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    heat_name: Mapped[str | None] = mapped_column(String, nullable=True)
+    holeshot_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    laps: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
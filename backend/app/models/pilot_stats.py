@@ -0,0 +1,43 @@
+# backend/app/models/pilot_stats.py
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+
+
+class PilotStats(Base):
+    """
+    Материализованная статистика карьеры пилота.
+    Пересчитывается services.pilot_stats для пилотов затронутого события,
+    страницы только читают готовую строку по pilot_id.
+    """
+    __tablename__ = "pilot_stats"
+
+    pilot_id: Mapped[int] = mapped_column(
+        ForeignKey("pilots.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    events_entered: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # квалификация
+    best_qual_rank: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    avg_qual_rank: Mapped[float | None] = mapped_column(Float, nullable=True)
+    best_lap_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    best3_avg_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    # сетка
+    bracket_events: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bracket_races: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    finals: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    podiums: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    wins: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
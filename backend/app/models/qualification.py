@@ -1,6 +1,6 @@
 # backend/app/models/qualification.py
 
-from sqlalchemy import Integer, ForeignKey  
+from sqlalchemy import Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db import Base
@@ -10,13 +10,16 @@ from .pilot import Pilot
 
 class QualificationResult(Base):
     __tablename__ = "qualification_results"
+    __table_args__ = (
+        # квалификация события по порядку: WHERE event_id ORDER BY rank
+        Index("ix_qualification_results_event_id_rank", "event_id", "rank"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
     event_id: Mapped[int] = mapped_column(
         ForeignKey("events.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     pilot_id: Mapped[int] = mapped_column(
         ForeignKey("pilots.id", ondelete="CASCADE"),
@@ -24,7 +27,9 @@ class QualificationResult(Base):
         index=True,
     )
 
+    # место по правилу проекта (services.qual_ranking); позиция из RH — rh_position
     rank: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rh_position: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     best_lap_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     best3_avg_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
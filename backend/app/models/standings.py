@@ -0,0 +1,45 @@
+# backend/app/models/standings.py
+
+from sqlalchemy import Float, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+
+
+class StandingsContribution(Base):
+    """Очки пилота за одно событие сезона (вклад в зачёт)."""
+    __tablename__ = "standings_contributions"
+    __table_args__ = (
+        Index("ix_standings_contributions_season_pilot", "season", "pilot_id"),
+    )
+
+    event_id: Mapped[int] = mapped_column(
+        ForeignKey("events.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    pilot_id: Mapped[int] = mapped_column(
+        ForeignKey("pilots.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    season: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    qual_points: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    bracket_points: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    points: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+
+
+class SeasonStanding(Base):
+    """Итог пилота в сезоне: сумма вкладов, обновляется дельтами."""
+    __tablename__ = "season_standings"
+    __table_args__ = (
+        Index("ix_season_standings_season_points", "season", "points"),
+    )
+
+    season: Mapped[int] = mapped_column(Integer, primary_key=True)
+    pilot_id: Mapped[int] = mapped_column(
+        ForeignKey("pilots.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    points: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    events: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
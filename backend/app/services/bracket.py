@@ -0,0 +1,351 @@
+# backend/app/services/bracket.py
+
+"""
+Сетка double elimination, заданная таблицами.
+
+Формат — список гонок; у каждой гонки 4 слота, и для каждого слота указано,
+откуда приходит пилот: место в квалификации (Seed) или место в другой
+гонке (Place). Создание сетки, расстановка мест и продвижение пилотов
+дальше работают одинаково для любого формата (8/16/32 пилота).
+
+Очки за вылет: 1 место — 3, 2 — 2, 3 — 1, 4 — 0. Место в гонке — по сумме
+очков, при равенстве — по очкам в последнем вылете, который проехали
+все, затем по слоту.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from ..models.bracket import BracketRace, BracketRaceResult
+from ..models.qualification import QualificationResult
+
+SLOTS = 4
+HEAT_FIELDS = ("points_r1", "points_r2", "points_r3", "points_r4", "points_r5")
+
+
+@dataclass(frozen=True)
+class Seed:
+    """Пилот с этим местом в квалификации."""
+    rank: int
+
+
+@dataclass(frozen=True)
+class Place:
+    """Пилот, занявший position в гонке race."""
+    race: int
+    position: int
+
+
+@dataclass(frozen=True)
+class RaceSpec:
+    number: int
+    stage: str
+    short_label: str
+    feeds: tuple[Seed | Place, ...]
+    heats: int = 3
+
+    @property
+    def bracket_side(self) -> str:
+        if self.stage == "final":
+            return "final"
+        return "upper" if self.stage.startswith("upper") else "lower"
+
+
+def _seeds(*ranks: int) -> tuple[Seed, ...]:
+    return tuple(Seed(r) for r in ranks)
+
+
+def _top2(race: int) -> tuple[Place, Place]:
+    return Place(race, 1), Place(race, 2)
+
+
+def _bottom2(race: int) -> tuple[Place, Place]:
+    return Place(race, 3), Place(race, 4)
+
+
+BRACKET_FORMATS: dict[int, tuple[RaceSpec, ...]] = {
+    8: (
+        RaceSpec(1, "upper_1_8", "1/8", _seeds(1, 4, 5, 8)),
+        RaceSpec(2, "upper_1_8", "1/8", _seeds(2, 3, 6, 7)),
+        RaceSpec(3, "lower_1_8", "1/8", _bottom2(1) + _bottom2(2)),
+        RaceSpec(4, "upper_1_4", "1/4", _top2(1) + _top2(2)),
+        RaceSpec(5, "semi", "Полуфинал", _top2(3) + _bottom2(4)),
+        RaceSpec(6, "final", "Финал", _top2(4) + _top2(5), heats=5),
+    ),
+    16: (
+        RaceSpec(1, "upper_1_16", "1/16", _seeds(1, 8, 9, 16)),
+        RaceSpec(2, "upper_1_16", "1/16", _seeds(4, 5, 12, 13)),
+        RaceSpec(3, "upper_1_16", "1/16", _seeds(2, 7, 10, 15)),
+        RaceSpec(4, "upper_1_16", "1/16", _seeds(3, 6, 11, 14)),
+        RaceSpec(5, "lower_1_16", "1/16", _bottom2(1) + _bottom2(2)),
+        RaceSpec(6, "upper_1_8", "1/8", _top2(1) + _top2(2)),
+        RaceSpec(7, "lower_1_16", "1/16", _bottom2(3) + _bottom2(4)),
+        RaceSpec(8, "upper_1_8", "1/8", _top2(3) + _top2(4)),
+        RaceSpec(9, "lower_1_8", "1/8", _top2(5) + _bottom2(6)),
+        RaceSpec(10, "lower_1_8", "1/8", _top2(7) + _bottom2(8)),
+        RaceSpec(11, "upper_1_4", "1/4", _top2(6) + _top2(8)),
+        RaceSpec(12, "lower_1_4", "1/4", _top2(9) + _top2(10)),
+        RaceSpec(13, "semi", "Полуфинал", _bottom2(11) + _top2(12)),
+        RaceSpec(14, "final", "Финал", _top2(11) + _top2(13), heats=5),
+    ),
+    32: (
+        RaceSpec(1, "upper_1_32", "1/32", _seeds(1, 16, 17, 32)),
+        RaceSpec(2, "upper_1_32", "1/32", _seeds(8, 9, 24, 25)),
+        RaceSpec(3, "upper_1_32", "1/32", _seeds(4, 13, 20, 29)),
+        RaceSpec(4, "upper_1_32", "1/32", _seeds(5, 12, 21, 28)),
+        RaceSpec(5, "upper_1_32", "1/32", _seeds(2, 15, 18, 31)),
+        RaceSpec(6, "upper_1_32", "1/32", _seeds(7, 10, 23, 26)),
+        RaceSpec(7, "upper_1_32", "1/32", _seeds(3, 14, 19, 30)),
+        RaceSpec(8, "upper_1_32", "1/32", _seeds(6, 11, 22, 27)),
+        RaceSpec(9, "lower_1_32", "1/32", _bottom2(1) + _bottom2(2)),
+        RaceSpec(10, "lower_1_32", "1/32", _bottom2(3) + _bottom2(4)),
+        RaceSpec(11, "lower_1_32", "1/32", _bottom2(5) + _bottom2(6)),
+        RaceSpec(12, "lower_1_32", "1/32", _bottom2(7) + _bottom2(8)),
+        RaceSpec(13, "upper_1_16", "1/16", _top2(1) + _top2(2)),
+        RaceSpec(14, "upper_1_16", "1/16", _top2(3) + _top2(4)),
+        RaceSpec(15, "upper_1_16", "1/16", _top2(5) + _top2(6)),
+        RaceSpec(16, "upper_1_16", "1/16", _top2(7) + _top2(8)),
+        RaceSpec(17, "lower_1_16", "1/16", _top2(9) + _bottom2(13)),
+        RaceSpec(18, "lower_1_16", "1/16", _top2(10) + _bottom2(14)),
+        RaceSpec(19, "lower_1_16", "1/16", _top2(11) + _bottom2(15)),
+        RaceSpec(20, "lower_1_16", "1/16", _top2(12) + _bottom2(16)),
+        RaceSpec(21, "upper_1_8", "1/8", _top2(13) + _top2(14)),
+        RaceSpec(22, "upper_1_8", "1/8", _top2(15) + _top2(16)),
+        RaceSpec(23, "lower_1_8", "1/8", _top2(17) + _top2(18)),
+        RaceSpec(24, "lower_1_8", "1/8", _top2(19) + _top2(20)),
+        RaceSpec(25, "lower_1_8", "1/8", _top2(23) + _bottom2(21)),
+        RaceSpec(26, "lower_1_8", "1/8", _top2(24) + _bottom2(22)),
+        RaceSpec(27, "upper_1_4", "1/4", _top2(21) + _top2(22)),
+        RaceSpec(28, "lower_1_4", "1/4", _top2(25) + _top2(26)),
+        RaceSpec(29, "semi", "Полуфинал", _bottom2(27) + _top2(28)),
+        RaceSpec(30, "final", "Финал", _top2(27) + _top2(29), heats=5),
+    ),
+}
+DEFAULT_FORMAT = 16
+
+
+def size_for(race_count: int) -> int | None:
+    """Размер существующей сетки (8/16/32) по числу гонок (None — сетка не из таблиц)."""
+    for size, specs in BRACKET_FORMATS.items():
+        if len(specs) == race_count:
+            return size
+    return None
+
+
+def format_for(race_count: int) -> tuple[RaceSpec, ...] | None:
+    """Формат существующей сетки по числу гонок (None — сетка не из таблиц)."""
+    size = size_for(race_count)
+    return BRACKET_FORMATS[size] if size is not None else None
+
+
+def _consumers(specs: tuple[RaceSpec, ...]) -> dict[tuple[int, int], list[tuple[int, int]]]:
+    """(гонка, место) → [(гонка, слот), ...], куда это место продвигается."""
+    result: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    for spec in specs:
+        for slot, feed in enumerate(spec.feeds, start=1):
+            if isinstance(feed, Place):
+                result.setdefault((feed.race, feed.position), []).append((spec.number, slot))
+    return result
+
+
+# ----------------------------------------------------------------
+# создание
+# ----------------------------------------------------------------
+
+def create_bracket(db: Session, event_id: int, size: int = DEFAULT_FORMAT) -> list[BracketRace]:
+    """
+    Создаёт гонки и слоты сетки; стартовые гонки заполняются
+    пилотами из квалификации по rank. Коммит — на вызывающем.
+    """
+    specs = BRACKET_FORMATS[size]
+
+    seeds = db.scalars(
+        select(QualificationResult.pilot_id)
+        .where(
+            QualificationResult.event_id == event_id,
+            QualificationResult.rank.is_not(None),
+        )
+        .order_by(QualificationResult.rank.asc())
+        .limit(size)
+    ).all()
+
+    races = []
+    for spec in specs:
+        race = BracketRace(
+            event_id=event_id,
+            number=spec.number,
+            name=f"Гонка {spec.number}",
+            stage=spec.stage,
+            short_label=spec.short_label,
+            bracket_side=spec.bracket_side,
+        )
+        for slot, feed in enumerate(spec.feeds, start=1):
+            pilot_id = None
+            if isinstance(feed, Seed) and feed.rank <= len(seeds):
+                pilot_id = seeds[feed.rank - 1]
+            race.results.append(BracketRaceResult(slot_index=slot, pilot_id=pilot_id))
+        races.append(race)
+
+    db.add_all(races)
+    return races
+
+
+# ----------------------------------------------------------------
+# места и продвижение
+# ----------------------------------------------------------------
+
+def _heat_points(result: BracketRaceResult) -> list[int]:
+    return [getattr(result, f) for f in HEAT_FIELDS if getattr(result, f) is not None]
+
+
+def _last_common_heat(entries: list[BracketRaceResult]) -> str | None:
+    """Последний вылет, очки за который есть у всех пилотов гонки."""
+    for f in reversed(HEAT_FIELDS):
+        if all(getattr(r, f) is not None for r in entries):
+            return f
+    return None
+
+
+def place_race(race: BracketRace) -> dict[int, int | None]:
+    """
+    Считает total_points и final_position по очкам за вылеты.
+    Если очков нет ни у кого — оставляет введённые вручную значения.
+    Возвращает место → pilot_id; пусто, пока гонка не досчитана.
+    """
+    entries = [r for r in race.results if r.pilot_id is not None]
+    if any(_heat_points(r) for r in entries):
+        for r in entries:
+            points = _heat_points(r)
+            r.total_points = float(sum(points)) if points else None
+
+        if all(r.total_points is not None for r in entries):
+            # тай-брейк — один и тот же вылет у всех, а не свой последний у каждого
+            last = _last_common_heat(entries)
+            ordered = sorted(
+                entries,
+                key=lambda r: (
+                    -r.total_points,
+                    -getattr(r, last) if last else 0,
+                    r.slot_index or 0,
+                ),
+            )
+            for position, r in enumerate(ordered, start=1):
+                r.final_position = position
+        else:
+            for r in entries:
+                r.final_position = None
+
+    placed = [r for r in entries if r.final_position is not None]
+    if len(placed) != len(entries):
+        return {}
+    return {r.final_position: r.pilot_id for r in placed}
+
+
+def _clear(result: BracketRaceResult) -> None:
+    for f in HEAT_FIELDS:
+        setattr(result, f, None)
+    result.total_points = None
+    result.final_position = None
+
+
+def load_bracket(db: Session, event_id: int) -> list[BracketRace]:
+    """Все гонки события со слотами (два запроса)."""
+    return list(
+        db.scalars(
+            select(BracketRace)
+            .where(BracketRace.event_id == event_id)
+            .options(selectinload(BracketRace.results))
+            .order_by(BracketRace.number.asc())
+        )
+    )
+
+
+def placements(races: list[BracketRace]) -> dict[tuple[int, int], int]:
+    """(гонка, место) → pilot_id по текущим final_position."""
+    return {
+        (race.number, r.final_position): r.pilot_id
+        for race in races
+        for r in race.results
+        if r.final_position is not None and r.pilot_id is not None
+    }
+
+
+def _follows_feeds(
+    spec: RaceSpec,
+    race: BracketRace,
+    previous: dict[tuple[int, int], int],
+) -> bool:
+    """Все занятые слоты гонки заполнены по сетке (а не вручную/старой версией)."""
+    for r in race.results:
+        if r.pilot_id is None or r.slot_index is None:
+            continue
+        if not 1 <= r.slot_index <= len(spec.feeds):
+            return False
+        feed = spec.feeds[r.slot_index - 1]
+        if isinstance(feed, Place) and previous.get((feed.race, feed.position)) != r.pilot_id:
+            return False
+    return True
+
+
+def advance(
+    races: list[BracketRace],
+    race_numbers: set[int],
+    previous: dict[tuple[int, int], int],
+) -> set[int]:
+    """
+    Пересчитывает места в гонках race_numbers и продвигает пилотов по сетке.
+
+    previous — placements() до правки. Пилотов расставляем только в гонки,
+    состав которых целиком пришёл по сетке (или пуст); гонки с ручными
+    правками и сетки, созданные до движка, не трогаем. Если в гонке
+    меняется состав, её результаты сбрасываются и пересчёт идёт дальше
+    по цепочке. Возвращает номера изменённых гонок. Коммит — на вызывающем.
+    """
+    specs = format_for(len(races))
+    by_number = {race.number: race for race in races}
+    touched = set(race_numbers)
+    if specs is None:
+        for number in race_numbers:
+            if number in by_number:
+                place_race(by_number[number])
+        return touched
+
+    spec_by_number = {spec.number: spec for spec in specs}
+    consumers = _consumers(specs)
+    managed = {
+        number: _follows_feeds(spec_by_number[number], race, previous)
+        for number, race in by_number.items()
+        if number in spec_by_number
+    }
+
+    pending = sorted(race_numbers)
+    while pending:
+        number = pending.pop(0)
+        race = by_number.get(number)
+        if race is None:
+            continue
+        placement = place_race(race)
+
+        for position in range(1, SLOTS + 1):
+            for target_number, slot in consumers.get((number, position), []):
+                target = by_number.get(target_number)
+                if target is None or not managed.get(target_number):
+                    continue
+                row = next((r for r in target.results if r.slot_index == slot), None)
+                if row is None:
+                    row = BracketRaceResult(slot_index=slot)
+                    target.results.append(row)
+                pilot_id = placement.get(position)
+                if row.pilot_id != pilot_id:
+                    # сменился состав — результаты гонки больше не действительны
+                    row.pilot_id = pilot_id
+                    for r in target.results:
+                        _clear(r)
+                    touched.add(target_number)
+                    if target_number not in pending:
+                        pending.append(target_number)
+                        pending.sort()
+
+    return touched
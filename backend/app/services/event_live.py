@@ -0,0 +1,141 @@
+# backend/app/services/event_live.py
+
+"""
+Live-обновления страницы события по SSE.
+
+После commit (core.changes) состояние страницы события собирается один
+раз на событие — не на каждого зрителя, — сравнивается с предыдущим и
+всем подписчикам уходит только разница: строки квалификации и результатов
+сетки, уже отформатированные в read-model (services.event_page).
+
+Пока у события нет зрителей, изменение стоит одного инкремента seq.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator
+
+from ..core import changes
+from ..core.config import get_settings
+from ..core.live import RESYNC, broadcaster, format_sse
+from ..db import ReadSessionLocal, run_db
+from .event_page import EventPage, QualRow, RaceResultRow, load_event_page
+
+_publish_lock = asyncio.Lock()
+
+
+def _qual_row(q: QualRow) -> dict[str, Any]:
+    return {name: getattr(q, name) for name in QualRow.__slots__ if name != "id"}
+
+
+def _result_row(race_id: int, order: int, r: RaceResultRow) -> dict[str, Any]:
+    return {
+        "race_id": race_id,
+        "order": order,
+        "pilot_id": r.pilot_id,
+        "nickname": r.nickname,
+        "heats": list(r.heats),
+        "total": r.total,
+        "pos": r.pos,
+    }
+
+
+def snapshot(page: EventPage) -> dict[str, Any]:
+    """
+    Состояние страницы: ключ строки → отображаемые значения. Квалификация —
+    по pilot_id: повторный импорт RH пересоздаёт её строки с новыми id.
+    """
+    return {
+        "races": [race.id for race in page.races],
+        "qual": {str(q.pilot_id): _qual_row(q) for q in page.qualification},
+        "results": {
+            str(r.id): _result_row(race.id, order, r)
+            for race in page.races
+            for order, r in enumerate(race.results)
+        },
+    }
+
+
+def diff(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Изменённые и новые строки целиком, удалённые — None."""
+    result: dict[str, Any] = {"reload": old["races"] != new["races"]}
+    for section in ("qual", "results"):
+        before, after = old[section], new[section]
+        changed = {key: row for key, row in after.items() if before.get(key) != row}
+        changed.update({key: None for key in before.keys() - after.keys()})
+        result[section] = changed
+    return result
+
+
+def _load_snapshot(event_id: int) -> dict[str, Any] | None:
+    with ReadSessionLocal() as db:
+        # аналитика кругов в трансляцию не идёт
+        page = load_event_page(db, event_id, with_analytics=False)
+    return snapshot(page) if page is not None else None
+
+
+def _full_message(seq: int, state: dict[str, Any]) -> dict[str, Any]:
+    return {"seq": seq, "reload": False, "qual": state["qual"], "results": state["results"]}
+
+
+@changes.on_change
+async def publish_event(event_id: int | None) -> None:
+    """Рассылает зрителям события разницу с предыдущим состоянием."""
+    if event_id is None:
+        return
+    async with _publish_lock:
+        seq = broadcaster.bump(event_id)
+        if not broadcaster.watchers(event_id):
+            broadcaster.set_state(event_id, None)
+            return
+
+        new = await run_db(_load_snapshot, event_id)
+        old = broadcaster.state(event_id)
+        broadcaster.set_state(event_id, new)
+        if new is None:
+            message = {"seq": seq, "reload": True, "qual": {}, "results": {}}
+        elif old is None:
+            message = _full_message(seq, new)
+        else:
+            message = {"seq": seq, **diff(old, new)}
+        broadcaster.publish(event_id, message)
+
+
+async def ensure_state(event_id: int) -> bool:
+    """Загружает состояние для первого зрителя. False — события нет."""
+    if broadcaster.state(event_id) is not None:
+        return True
+    async with _publish_lock:
+        if broadcaster.state(event_id) is None:
+            broadcaster.set_state(event_id, await run_db(_load_snapshot, event_id))
+    return broadcaster.state(event_id) is not None
+
+
+async def stream(event_id: int, since: int) -> AsyncIterator[str]:
+    """
+    Поток SSE для одного зрителя. since — seq, с которым отрендерена
+    страница (или Last-Event-ID при переподключении); если с тех пор были
+    изменения, первым сообщением уходит всё состояние целиком.
+    """
+    heartbeat = get_settings().LIVE_HEARTBEAT_SECONDS
+    with broadcaster.subscribe(event_id) as sub:
+        yield "retry: 5000\n\n"
+        await ensure_state(event_id)
+        seq = broadcaster.seq(event_id)
+        state = broadcaster.state(event_id)
+        if since < seq and state is not None:
+            yield format_sse(_full_message(seq, state), event_id=seq)
+
+        while True:
+            try:
+                message = await asyncio.wait_for(sub.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                # комментарий держит соединение через прокси
+                yield ": ping\n\n"
+                continue
+            if message == RESYNC:
+                sub.overflowed = False
+                state = broadcaster.state(event_id)
+                if state is None:
+                    continue
+                message = _full_message(broadcaster.seq(event_id), state)
+            yield format_sse(message, event_id=message["seq"])
@@ -0,0 +1,254 @@
+# backend/app/services/event_page.py
+
+"""
+Read-model страницы события.
+
+Загружает событие, квалификацию и всю сетку фиксированным числом запросов
+(событие, квала+пилоты, гонки, результаты гонок+пилоты; аналитика кругов —
+из кэша services.lap_analytics) и отдаёт шаблону
+простые объекты без ленивых связей ORM. Всё, что шаблон раньше вычислял
+сам (места по очкам, сортировки, подписи), здесь уже посчитано — шаблон
+только печатает.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session, joinedload
+
+from ..models.bracket import BracketRace, BracketRaceResult
+from ..models.event import Event, EventType
+from ..models.qualification import QualificationResult
+from ..utils.formatting import format_ms
+from .bracket import size_for
+from .lap_analytics import EventAnalytics, load_event_analytics
+from .qual_ranking import RankingRule, get_rule
+from ..utils.jinja_filters import format_float_clean
+
+# очки за заезд → место в заезде; остальное (0) — четвёртое
+HEAT_PLACES = {3: "1", 2: "2", 1: "3"}
+HEAT_FIELDS = ("points_r1", "points_r2", "points_r3", "points_r4", "points_r5")
+SIDE_LABELS = {"upper": "Верхняя сетка", "lower": "Нижняя сетка"}
+# финал едет пять заездов, остальные вылеты — три
+FINAL_HEATS = 5
+RACE_HEATS = 3
+
+
+@dataclass
+class EventInfo:
+    id: int
+    name: str
+    event_type: EventType
+    date: date
+    location: str | None
+    description: str | None
+    poster: str | None
+
+
+@dataclass(slots=True)
+class QualRow:
+    """Строка квалификации: подписи уже отформатированы, рядом сырые значения из базы (None — нет данных)."""
+    id: int
+    rank: int
+    pilot_id: int
+    nickname: str
+    top16: bool
+    best3: str
+    bestlap: str
+    laps: str
+    attempts: str
+    best3_ms: int | None
+    consec: int | None
+    rh_position: int | None
+    bestlap_ms: int | None
+    laps_total: int | None
+    attempts_count: int | None
+
+
+@dataclass(slots=True)
+class RaceResultRow:
+    """Строка вылета: места в заездах, баллы и итоговое место — готовые подписи и сырые значения (API)."""
+    id: int
+    pilot_id: int | None
+    nickname: str | None
+    heats: tuple[str, ...]
+    total: str
+    pos: str
+    slot_index: int | None
+    points: tuple[int | None, ...]
+    total_points: float | None
+    final_position: int | None
+
+
+@dataclass(slots=True)
+class RaceView:
+    id: int
+    number: int
+    name: str
+    short_label: str
+    stage: str
+    bracket_side: str
+    side_label: str | None
+    heat_count: int
+    results: list[RaceResultRow] = field(default_factory=list)
+
+
+@dataclass
+class EventPage:
+    event: EventInfo
+    qualification: list[QualRow]
+    races: list[RaceView]
+    analytics: EventAnalytics | None = None
+
+    @property
+    def bracket_size(self) -> int | None:
+        """Сколько пилотов в сетке (8/16/32); None — сетки нет или она не из таблиц."""
+        return size_for(len(self.races)) if self.races else None
+
+
+def _heat_place(points: int | None, total_points: float | None) -> str:
+    if points is not None:
+        return HEAT_PLACES.get(points, "4")
+    return "4" if total_points is not None else "—"
+
+
+def _qual_row(q: QualificationResult, rule: RankingRule) -> QualRow:
+    if q.best3_avg_ms:
+        best3 = (rule.series_label(q.consecutives_count) or "") + format_ms(q.best3_avg_ms)
+    else:
+        best3 = "—"
+    return QualRow(
+        id=q.id,
+        rank=q.rank,
+        pilot_id=q.pilot_id,
+        nickname=q.pilot.nickname,
+        top16=q.rank <= 16,
+        best3=best3,
+        bestlap=format_ms(q.best_lap_ms),
+        laps=str(q.laps_total or "—"),
+        attempts=str(q.attempts_count or "—"),
+        best3_ms=q.best3_avg_ms,
+        consec=q.consecutives_count,
+        rh_position=q.rh_position,
+        bestlap_ms=q.best_lap_ms,
+        laps_total=q.laps_total,
+        attempts_count=q.attempts_count,
+    )
+
+
+def _result_row(r: BracketRaceResult, heat_count: int) -> tuple[tuple, RaceResultRow]:
+    """(ключ сортировки, строка)."""
+    key = (r.final_position is None, r.final_position or 0, r.slot_index or 0)
+    points = tuple(getattr(r, name) for name in HEAT_FIELDS[:heat_count])
+    row = RaceResultRow(
+        id=r.id,
+        pilot_id=r.pilot.id if r.pilot else None,
+        nickname=r.pilot.nickname if r.pilot else None,
+        heats=tuple(_heat_place(p, r.total_points) for p in points),
+        total=format_float_clean(r.total_points),
+        pos=str(r.final_position or "—"),
+        slot_index=r.slot_index,
+        points=points,
+        total_points=r.total_points,
+        final_position=r.final_position,
+    )
+    return key, row
+
+
+def load_event_info(db: Session, event_id: int) -> EventInfo | None:
+    event = db.get(Event, event_id)
+    if event is None:
+        return None
+    return EventInfo(
+        id=event.id,
+        name=event.name,
+        event_type=event.event_type,
+        date=event.date,
+        location=event.location,
+        description=event.description,
+        poster=event.poster,
+    )
+
+
+def events_stmt(limit: int | None = None) -> Select:
+    """События от новых к старым: главная (последние N) и список событий."""
+    stmt = select(Event).order_by(Event.date.desc())
+    return stmt if limit is None else stmt.limit(limit)
+
+
+def qualification_stmt(event_id: int) -> Select:
+    # Квалификация в порядке мест (services.qual_ranking) по индексу
+    # (event_id, rank), пилоты одним JOIN; пилоты без места не показываются
+    return (
+        select(QualificationResult)
+        .where(QualificationResult.event_id == event_id, QualificationResult.rank.is_not(None))
+        .options(joinedload(QualificationResult.pilot))
+        .order_by(QualificationResult.rank.asc())
+    )
+
+
+def races_stmt(event_id: int) -> Select:
+    return (
+        select(BracketRace)
+        .where(BracketRace.event_id == event_id)
+        .order_by(BracketRace.number.asc())
+    )
+
+
+def race_results_stmt(race_ids: Iterable[int]) -> Select:
+    return (
+        select(BracketRaceResult)
+        .where(BracketRaceResult.bracket_race_id.in_(list(race_ids)))
+        .options(joinedload(BracketRaceResult.pilot))
+    )
+
+
+def load_qualification(db: Session, event_id: int) -> list[QualRow]:
+    rule = get_rule()
+    return [_qual_row(q, rule) for q in db.scalars(qualification_stmt(event_id))]
+
+
+def load_races(db: Session, event_id: int) -> list[RaceView]:
+    # Гонки сетки + результаты + пилоты: два запроса (IN по id гонок) вместо N+1
+    race_rows = list(db.scalars(races_stmt(event_id)))
+    results_by_race: dict[int, list[BracketRaceResult]] = defaultdict(list)
+    if race_rows:
+        for r in db.scalars(race_results_stmt(race.id for race in race_rows)):
+            results_by_race[r.bracket_race_id].append(r)
+
+    races = []
+    for race in race_rows:
+        heat_count = FINAL_HEATS if race.stage == "final" else RACE_HEATS
+        results = [_result_row(r, heat_count) for r in results_by_race[race.id]]
+        # сначала места по порядку, потом недосчитанные — в порядке слотов
+        results.sort(key=lambda row: row[0])
+        races.append(
+            RaceView(
+                id=race.id,
+                number=race.number,
+                name=race.name,
+                short_label=race.short_label,
+                stage=race.stage,
+                bracket_side=race.bracket_side,
+                side_label=SIDE_LABELS.get(race.bracket_side),
+                heat_count=heat_count,
+                results=[row for _key, row in results],
+            )
+        )
+    return races
+
+
+def load_event_page(db: Session, event_id: int, with_analytics: bool = True) -> EventPage | None:
+    """Собирает данные страницы события. None — если события нет."""
+    info = load_event_info(db, event_id)
+    if info is None:
+        return None
+    return EventPage(
+        event=info,
+        qualification=load_qualification(db, event_id),
+        races=load_races(db, event_id),
+        analytics=load_event_analytics(db, [event_id]).get(event_id) if with_analytics else None,
+    )
@@ -0,0 +1,553 @@
+# backend/app/services/import_jobs.py
+
+"""
+Фоновые задачи импорта RH.
+
+Запрос только сохраняет загрузку в IMPORT_SPOOL_DIR (потоком, не держа
+файл в памяти), заводит строку import_jobs и сразу отвечает id задачи.
+Разбор JSON и запись идут в воркерах JobQueue — asyncio-задачах,
+запущенных в lifespan: JSON читается в потоке, запись — через
+run_db_write, в общей очереди к писателю, как и у админки.
+
+Статус живёт в таблице, поэтому его видит любой процесс uvicorn, а
+задачи, не начатые до перезапуска, подхватываются при старте. Задачу
+берёт тот, кто первым перевёл её из queued (UPDATE ... WHERE status).
+
+Пока задача в parsing/importing, воркер раз в IMPORT_HEARTBEAT_SECONDS
+обновляет её heartbeat_at. Восстановление (при старте и раз в
+IMPORT_SWEEP_SECONDS): задачи без отметки дольше IMPORT_STALE_SECONDS
+(воркер упал или процесс перезапущен) возвращаются в queued, пока
+попыток меньше IMPORT_MAX_ATTEMPTS, иначе — failed;
+файлы спула, не нужные ни одной живой задаче, удаляются. Если задачу не
+удалось взять (ошибка базы), она повторяется с паузой, а после
+IMPORT_MAX_ATTEMPTS попыток помечается failed.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import uuid
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Dict, List
+
+import anyio
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..core import changes
+from ..core.config import get_settings
+from ..db import SessionLocal, run_db_write
+from ..models.event import Event
+from ..models.import_job import ImportJob
+from . import laps, rh_json
+from .rh_import import import_qualification
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+KIND_RH_QUALIFICATION = "rh_qualification"
+
+QUEUED = "queued"
+PARSING = "parsing"
+IMPORTING = "importing"
+DONE = "done"
+FAILED = "failed"
+FINISHED = (DONE, FAILED)
+ACTIVE = (QUEUED, PARSING, IMPORTING)
+
+UPLOAD_PREFIX = ".upload-"
+
+CHUNK_SIZE = 256 * 1024
+
+
+class ImportJobError(ValueError):
+    """Загрузку нельзя импортировать: слишком большая, не JSON, нет лидерборда."""
+
+
+# ----------------------------------------------------------------
+# спул загрузок
+# ----------------------------------------------------------------
+
+def spool_dir() -> Path:
+    path = Path(settings.IMPORT_SPOOL_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _too_large() -> ImportJobError:
+    return ImportJobError(f"Файл импорта больше {settings.IMPORT_MAX_BYTES // (1024 * 1024)} МБ")
+
+
+def _new_spool_file() -> tuple[int, str]:
+    return tempfile.mkstemp(dir=spool_dir(), prefix=UPLOAD_PREFIX)
+
+
+def _publish(tmp_name: str) -> str:
+    name = f"{uuid.uuid4().hex}.json"
+    os.replace(tmp_name, spool_dir() / name)
+    return name
+
+
+def spool_file(source: BinaryIO) -> tuple[str, int]:
+    """Копирует файловый объект в спул кусками; возвращает (имя, размер)."""
+    fd, tmp_name = _new_spool_file()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := source.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.IMPORT_MAX_BYTES:
+                    raise _too_large()
+                out.write(chunk)
+        return _publish(tmp_name), size
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+async def spool_stream(chunks: AsyncIterator[bytes]) -> tuple[str, int]:
+    """То же для тела запроса (request.stream()): пишет по мере прихода."""
+    fd, tmp_name = _new_spool_file()
+    os.close(fd)
+    size = 0
+    try:
+        async with await anyio.open_file(tmp_name, "wb") as out:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > settings.IMPORT_MAX_BYTES:
+                    raise _too_large()
+                await out.write(chunk)
+        return _publish(tmp_name), size
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def _remove_payload(name: str) -> None:
+    try:
+        os.unlink(spool_dir() / name)
+    except FileNotFoundError:
+        pass
+
+
+# ----------------------------------------------------------------
+# разбор RH JSON
+# ----------------------------------------------------------------
+
+def read_qual_table(name: str) -> List[Dict[str, Any]]:
+    """Лидерборд by_consecutives из файла в спуле, без разбора остального экспорта."""
+    try:
+        with open(spool_dir() / name, "rb") as f:
+            sections = rh_json.extract_paths(f, rh_json.QUAL_PATHS)
+    except rh_json.RHJSONError as exc:
+        raise ImportJobError(f"Invalid JSON: {exc}") from None
+    for path in rh_json.QUAL_PATHS:
+        table = sections.get(path)
+        if isinstance(table, list):
+            return table
+    raise ImportJobError(
+        "No 'by_consecutives' leaderboard found in RH JSON (event_leaderboard/leaderboard)"
+    )
+
+
+def read_payload(name: str) -> tuple[List[Dict[str, Any]], List[laps.HeatLaps]]:
+    """Лидерборд и круги из заездов (второй проход по файлу, потоком)."""
+    qual_table = read_qual_table(name)
+    try:
+        with open(spool_dir() / name, "rb") as f:
+            heat_laps = laps.read_laps(f)
+    except rh_json.RHJSONError as exc:
+        raise ImportJobError(f"Invalid JSON: {exc}") from None
+    return qual_table, heat_laps
+
+
+# ----------------------------------------------------------------
+# строки import_jobs
+# ----------------------------------------------------------------
+
+def create_job(db: Session, kind: str, event_id: int, payload: str, payload_bytes: int) -> int | None:
+    """Заводит задачу; None — события нет (файл из спула тогда удаляется)."""
+    if db.get(Event, event_id) is None:
+        _remove_payload(payload)
+        return None
+    job = ImportJob(
+        kind=kind,
+        event_id=event_id,
+        status=QUEUED,
+        payload=payload,
+        payload_bytes=payload_bytes,
+    )
+    db.add(job)
+    db.flush()
+    # id — до commit: чтение после него снова заняло бы соединение писателя
+    # до конца запроса, а воркеру оно нужно сразу
+    job_id = job.id
+    db.commit()
+    return job_id
+
+
+def get_job(db: Session, job_id: int) -> ImportJob | None:
+    return db.get(ImportJob, job_id)
+
+
+def job_status(job: ImportJob) -> Dict[str, Any]:
+    """Статус задачи для JSON-ответа."""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "event_id": job.event_id,
+        "status": job.status,
+        "payload_bytes": job.payload_bytes,
+        "rows_total": job.rows_total,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "heartbeat_at": job.heartbeat_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def queued_job_ids(db: Session) -> list[int]:
+    stmt = select(ImportJob.id).where(ImportJob.status == QUEUED).order_by(ImportJob.id)
+    return list(db.scalars(stmt))
+
+
+def _claim(db: Session, job_id: int) -> tuple[int, str] | None:
+    """
+    queued → parsing; возвращает (event_id, payload). None — задачу уже
+    взял другой воркер или процесс.
+    """
+    now = datetime.utcnow()
+    claimed = db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status == QUEUED)
+        .values(
+            status=PARSING,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=ImportJob.attempts + 1,
+        )
+    ).rowcount
+    job = db.get(ImportJob, job_id) if claimed else None
+    found = (job.event_id, job.payload) if job is not None else None
+    # commit последним: сессия не должна держать соединение писателя,
+    # пока задача разбирает JSON
+    db.commit()
+    return found
+
+
+def _set_status(db: Session, job_id: int, **values: Any) -> None:
+    if values.get("status") in FINISHED:
+        values["finished_at"] = datetime.utcnow()
+    else:
+        values["heartbeat_at"] = datetime.utcnow()
+    db.execute(update(ImportJob).where(ImportJob.id == job_id).values(**values))
+    db.commit()
+
+
+def _beat(db: Session, job_id: int) -> None:
+    """Отметка воркера: задача ещё в работе."""
+    db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status.in_((PARSING, IMPORTING)))
+        .values(heartbeat_at=datetime.utcnow())
+    )
+    db.commit()
+
+
+def _fail(db: Session, job_id: int, error: str) -> None:
+    db.rollback()
+    _set_status(db, job_id, status=FAILED, error=error)
+
+
+def _fail_queued(db: Session, job_id: int, error: str) -> None:
+    """queued → failed, если задачу так никто и не взял."""
+    db.rollback()
+    db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status == QUEUED)
+        .values(status=FAILED, error=error, finished_at=datetime.utcnow())
+    )
+    db.commit()
+
+
+def recover_stale_jobs(db: Session) -> list[str]:
+    """
+    Задачи в parsing/importing без отметки воркера дольше
+    IMPORT_STALE_SECONDS брошены (воркер упал или процесс перезапущен
+    посреди разбора): возвращает их в queued или, если попытки кончились,
+    помечает failed. Возвращает payload'ы проваленных — их файлы больше
+    не нужны.
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=settings.IMPORT_STALE_SECONDS)
+    stale = db.execute(
+        select(
+            ImportJob.id,
+            ImportJob.status,
+            ImportJob.heartbeat_at,
+            ImportJob.attempts,
+            ImportJob.payload,
+        )
+        .where(ImportJob.status.in_((PARSING, IMPORTING)), ImportJob.heartbeat_at < cutoff)
+    ).all()
+
+    failed: list[str] = []
+    for job_id, status, heartbeat_at, attempts, payload in stale:
+        if attempts >= settings.IMPORT_MAX_ATTEMPTS:
+            values = dict(
+                status=FAILED,
+                error=f"Import interrupted ({attempts} attempts)",
+                finished_at=now,
+            )
+            failed.append(payload)
+        else:
+            values = dict(status=QUEUED, started_at=None, heartbeat_at=None)
+        # условие на status/heartbeat_at: воркер мог успеть отметиться
+        # или закончить задачу
+        db.execute(
+            update(ImportJob)
+            .where(
+                ImportJob.id == job_id,
+                ImportJob.status == status,
+                ImportJob.heartbeat_at == heartbeat_at,
+            )
+            .values(**values)
+        )
+    db.commit()
+    return failed
+
+
+def live_payloads(db: Session) -> set[str]:
+    """Файлы спула, которые ещё понадобятся: у задач queued/parsing/importing."""
+    stmt = select(ImportJob.payload).where(ImportJob.status.in_(ACTIVE))
+    return set(db.scalars(stmt))
+
+
+def sweep_spool(keep: set[str]) -> int:
+    """
+    Удаляет из спула недописанные загрузки (.upload-*) и payload'ы без
+    живой задачи. Только файлы старше IMPORT_STALE_SECONDS: свежие могут
+    принадлежать загрузке, задача для которой ещё не заведена.
+    """
+    cutoff = time.time() - settings.IMPORT_STALE_SECONDS
+    removed = 0
+    for path in spool_dir().iterdir():
+        if not path.is_file() or path.name in keep:
+            continue
+        try:
+            if path.stat().st_mtime >= cutoff:
+                continue
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        removed += 1
+    return removed
+
+
+def _run_qualification_import(
+    db: Session,
+    job_id: int,
+    event_id: int,
+    qual_table: List[Dict[str, Any]],
+    heat_laps: List[laps.HeatLaps],
+) -> Dict[str, int]:
+    # импорт, круги и отметка done — одной транзакцией;
+    # круги после квалы: её пилоты к этому моменту уже созданы
+    counts = import_qualification(db, event_id, qual_table)
+    counts.update(laps.store_event_laps(db, event_id, heat_laps))
+    db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id)
+        .values(status=DONE, result=json.dumps(counts), finished_at=datetime.utcnow())
+    )
+    db.commit()
+    return counts
+
+
+# ----------------------------------------------------------------
+# очередь
+# ----------------------------------------------------------------
+
+class JobQueue:
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[int] | None = None
+        self._workers: list[asyncio.Task] = []
+        # задачи в очереди или ждущие повтора: повторно из базы не ставятся
+        self._pending: set[int] = set()
+        # неудачные попытки взять задачу (_claim упал)
+        self._claim_errors: dict[int, int] = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self, workers: int | None = None) -> None:
+        """Запускает воркеров и ставит в очередь задачи, оставшиеся в queued."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        for _ in range(max(1, workers or settings.IMPORT_WORKERS)):
+            self._workers.append(asyncio.create_task(self._work()))
+
+        resumed = await self.recover()
+        if resumed:
+            logger.info("resumed %d queued import job(s)", resumed)
+        self._workers.append(asyncio.create_task(self._sweep()))
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._pending.clear()
+        self._claim_errors.clear()
+
+    async def recover(self) -> int:
+        """
+        Возвращает брошенные задачи в очередь (или в failed), чистит спул
+        и ставит в очередь queued-задачи, которых в ней нет. Возвращает,
+        сколько задач поставлено.
+        """
+        db = SessionLocal()
+        try:
+            failed = await run_db_write(recover_stale_jobs, db)
+            queued = await run_db_write(queued_job_ids, db)
+            keep = await run_db_write(live_payloads, db)
+        finally:
+            db.close()
+        for payload in failed:
+            _remove_payload(payload)
+        removed = await anyio.to_thread.run_sync(sweep_spool, keep)
+        if removed:
+            logger.info("removed %d orphaned import spool file(s)", removed)
+
+        submitted = 0
+        for job_id in queued:
+            if job_id not in self._pending:
+                self.submit(job_id)
+                submitted += 1
+        return submitted
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(settings.IMPORT_SWEEP_SECONDS)
+            try:
+                await self.recover()
+            except Exception:
+                logger.exception("import job recovery failed")
+
+    def submit(self, job_id: int) -> None:
+        if self._queue is None:
+            # воркеры не запущены (скрипт, тесты): задача останется queued
+            # и будет взята при следующем старте приложения
+            logger.info("import queue is not running; job %d stays queued", job_id)
+            return
+        if job_id in self._pending:
+            return
+        self._pending.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.process(job_id)
+            except Exception as exc:
+                logger.exception("import job %d crashed", job_id)
+                await self._retry(job_id, exc)
+            else:
+                self._claim_errors.pop(job_id, None)
+                self._pending.discard(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _retry(self, job_id: int, exc: Exception) -> None:
+        """
+        Задачу не удалось взять или записать её провал: повтор с паузой
+        1, 2, 4... с, после IMPORT_MAX_ATTEMPTS попыток — failed. Если не
+        выйдет и это, задачу подберёт recover(): она либо осталась queued,
+        либо застряла в parsing/importing.
+        """
+        errors = self._claim_errors.get(job_id, 0) + 1
+        if errors < settings.IMPORT_MAX_ATTEMPTS:
+            self._claim_errors[job_id] = errors
+            loop = asyncio.get_running_loop()
+            loop.call_later(2 ** (errors - 1), self._resubmit, job_id)
+            return
+
+        self._claim_errors.pop(job_id, None)
+        self._pending.discard(job_id)
+        db = SessionLocal()
+        try:
+            await run_db_write(_fail_queued, db, job_id, f"Import failed: {exc}")
+        except Exception:
+            logger.exception("could not mark import job %d failed", job_id)
+        finally:
+            db.close()
+
+    def _resubmit(self, job_id: int) -> None:
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+
+    async def _heartbeat(self, job_id: int) -> None:
+        """Отмечает задачу, пока идёт её разбор и запись (см. recover_stale_jobs)."""
+        while True:
+            await asyncio.sleep(settings.IMPORT_HEARTBEAT_SECONDS)
+            # своя сессия: основная занята фазой в другом потоке
+            db = SessionLocal()
+            try:
+                await run_db_write(_beat, db, job_id)
+            except Exception:
+                logger.exception("import job %d heartbeat failed", job_id)
+            finally:
+                db.close()
+
+    async def process(self, job_id: int) -> None:
+        """Выполняет задачу сразу (воркеры, бенчмарк); взятую кем-то ещё пропускает."""
+        db = SessionLocal()
+        heartbeat = None
+        try:
+            claimed = await run_db_write(_claim, db, job_id)
+            if claimed is None:
+                return
+            event_id, payload = claimed
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                # разбор — в обычном пуле потоков, писатель в это время свободен
+                qual_table, heat_laps = await anyio.to_thread.run_sync(read_payload, payload)
+                await run_db_write(
+                    _set_status, db, job_id, status=IMPORTING, rows_total=len(qual_table)
+                )
+                await run_db_write(
+                    _run_qualification_import, db, job_id, event_id, qual_table, heat_laps
+                )
+            except Exception as exc:
+                if not isinstance(exc, ImportJobError):
+                    logger.exception("import job %d failed", job_id)
+                # если не запишется и failed — задача останется в
+                # parsing/importing, файл нужен для повтора из recover()
+                await run_db_write(_fail, db, job_id, str(exc))
+                _remove_payload(payload)
+                return
+            _remove_payload(payload)
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+            db.close()
+        await changes.notify(event_id)
+
+
+jobs = JobQueue()
@@ -0,0 +1,340 @@
+# backend/app/services/lap_analytics.py
+
+"""
+Аналитика кругов: распределения по пилотам и событиям.
+
+Считается пакетом на NumPy по всем запрошенным событиям сразу: круги из
+lap_times склеиваются в один массив, сортируются по (пилот в событии,
+время) одним lexsort, а перцентили, среднее и σ каждой группы берутся
+индексной арифметикой и reduceat — без циклов Python по кругам.
+
+Лучший круг пилота — меньший из квалификации (best_lap_ms) и lap_times
+(там и заезды сетки). По лучшим кругам считаются разброс поля и отставание
+пилота от лучшего в процентах: трассы у событий разные, поэтому динамика
+пилота по датам строится по отставанию, а не по времени круга.
+
+Результат кэшируется по событию. Запись помнит поколение события
+(db.generations) на момент расчёта и пересчитывается, когда оно выросло,
+в том числе после записи другим процессом.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable
+
+import numpy as np
+from sqlalchemy import select, union
+from sqlalchemy.orm import Session
+
+from ..core import changes
+from ..core.config import get_settings
+from ..db import event_scope, generations
+from ..models.event import Event
+from ..models.lap_times import LapTimes
+from ..models.qualification import QualificationResult
+
+# среднее за 30 дней — «в месяц» для динамики пилота
+TREND_DAYS = 30
+
+
+@dataclass(frozen=True, slots=True)
+class PilotLapStats:
+    """Пилот в событии. Поля круга — None, если кругов в lap_times нет."""
+    pilot_id: int
+    laps: int
+    best_ms: int | None
+    p10_ms: int | None
+    p25_ms: int | None
+    median_ms: int | None
+    p75_ms: int | None
+    p90_ms: int | None
+    mean_ms: int | None
+    stdev_ms: int | None
+    # межквартильный размах к медиане, %: чем меньше, тем ровнее круги
+    consistency_pct: float | None
+    # отставание лучшего круга от лучшего в поле, %
+    gap_pct: float | None
+    # какая доля поля медленнее пилота, %
+    field_percentile: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class EventAnalytics:
+    event_id: int
+    date: date
+    pilots: dict[int, PilotLapStats]
+    laps: int
+    field_best_ms: int | None
+    field_median_best_ms: int | None
+    # медиана лучших кругов поля относительно самого быстрого, %
+    spread_pct: float | None
+    # распределение всех кругов события
+    p10_ms: int | None
+    median_ms: int | None
+    p90_ms: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class PilotEventAnalytics:
+    event_id: int
+    date: date
+    stats: PilotLapStats
+
+
+@dataclass(frozen=True, slots=True)
+class PilotAnalytics:
+    pilot_id: int
+    events: list[PilotEventAnalytics]  # по дате, от старых к новым
+    # наклон прямой по отставанию от лучшего, п.п. в месяц; < 0 — прогресс
+    trend_pct_per_month: float | None
+    # отставание в последнем событии минус в первом, п.п.
+    gap_change_pct: float | None
+
+
+# ----------------------------------------------------------------
+# расчёт
+# ----------------------------------------------------------------
+
+def _ms(value: float) -> int | None:
+    return None if not np.isfinite(value) else int(round(float(value)))
+
+
+def _pct(value: float) -> float | None:
+    return None if not np.isfinite(value) else round(float(value), 2)
+
+
+def _group_stats(values: np.ndarray, groups: np.ndarray, count: int) -> dict[str, np.ndarray]:
+    """
+    Статистики значений по группам 0..count-1 (массивы длины count,
+    пустая группа — NaN). Перцентили — линейная интерполяция, как
+    numpy.percentile по умолчанию.
+    """
+    stats = {name: np.full(count, np.nan) for name in (
+        "best", "p10", "p25", "p50", "p75", "p90", "mean", "stdev",
+    )}
+    sizes = np.bincount(groups, minlength=count)
+    stats["count"] = sizes
+    if not values.size:
+        return stats
+
+    ordered = values[np.lexsort((values, groups))]
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    filled = sizes > 0
+    n = sizes[filled]
+    first = starts[filled]
+
+    for q in (10, 25, 50, 75, 90):
+        pos = first + (n - 1) * (q / 100)
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.ceil(pos).astype(np.intp)
+        stats[f"p{q}"][filled] = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+    # непустые группы идут в ordered подряд — reduceat по их началам
+    mean = np.add.reduceat(ordered, first) / n
+    square = np.add.reduceat(ordered * ordered, first) / n
+    stats["best"][filled] = ordered[first]
+    stats["mean"][filled] = mean
+    stats["stdev"][filled] = np.sqrt(np.maximum(square - mean * mean, 0.0))
+    return stats
+
+
+def _load_laps(
+    db: Session, event_ids: list[int]
+) -> tuple[list[tuple[int, int]], np.ndarray, np.ndarray]:
+    """Ключи (событие, пилот), все круги подряд и номер ключа каждого круга."""
+    rows = db.execute(
+        select(LapTimes.event_id, LapTimes.pilot_id, LapTimes.laps)
+        .where(LapTimes.event_id.in_(event_ids))
+        .order_by(LapTimes.event_id, LapTimes.pilot_id)
+    ).all()
+    keys: dict[tuple[int, int], int] = {}
+    row_keys = [keys.setdefault((e, p), len(keys)) for e, p, _blob in rows]
+    blobs = [blob for _e, _p, blob in rows]
+    # BLOB — uint32 little-endian (services.laps)
+    values = np.frombuffer(b"".join(blobs), dtype="<u4").astype(np.float64)
+    sizes = np.fromiter((len(blob) // 4 for blob in blobs), dtype=np.intp, count=len(blobs))
+    groups = np.repeat(np.asarray(row_keys, dtype=np.intp), sizes)
+    return list(keys), values, groups
+
+
+def compute_event_analytics(db: Session, event_ids: Iterable[int]) -> dict[int, EventAnalytics]:
+    """Аналитика событий без кэша; несуществующих событий в ответе нет."""
+    ids = sorted(set(event_ids))
+    if not ids:
+        return {}
+
+    # даты событий и лучшие круги квалификации — одним запросом
+    dates: dict[int, date] = {}
+    qual_best: dict[int, dict[int, float]] = {}
+    stmt = (
+        select(Event.id, Event.date, QualificationResult.pilot_id, QualificationResult.best_lap_ms)
+        .outerjoin(QualificationResult, QualificationResult.event_id == Event.id)
+        .where(Event.id.in_(ids))
+    )
+    for event_id, event_date, pilot_id, best_lap_ms in db.execute(stmt):
+        dates[event_id] = event_date
+        if pilot_id is None:
+            continue
+        bests = qual_best.setdefault(event_id, {})
+        value = np.nan if best_lap_ms is None else float(best_lap_ms)
+        bests[pilot_id] = np.fmin(bests.get(pilot_id, np.nan), value)
+    if not dates:
+        return {}
+
+    keys, values, groups = _load_laps(db, list(dates))
+    per_pilot = _group_stats(values, groups, len(keys))
+    event_index = {event_id: i for i, event_id in enumerate(dates)}
+    key_events = np.asarray([event_index[e] for e, _p in keys], dtype=np.intp)
+    per_event = _group_stats(values, key_events[groups], len(event_index))
+
+    lap_keys: dict[int, dict[int, int]] = {}
+    for i, (event_id, pilot_id) in enumerate(keys):
+        lap_keys.setdefault(event_id, {})[pilot_id] = i
+
+    result = {}
+    for event_id, event_date in dates.items():
+        event_qual = qual_best.get(event_id, {})
+        laps_of = lap_keys.get(event_id, {})
+        pilot_ids = sorted(event_qual.keys() | laps_of.keys())
+
+        index = np.asarray([laps_of.get(p, -1) for p in pilot_ids], dtype=np.intp)
+        has_laps = index >= 0
+        stats = {}
+        for name in ("count", "best", "p10", "p25", "p50", "p75", "p90", "mean", "stdev"):
+            column = np.full(len(pilot_ids), np.nan)
+            column[has_laps] = per_pilot[name][index[has_laps]]
+            stats[name] = column
+
+        bests = np.asarray([event_qual.get(p, np.nan) for p in pilot_ids], dtype=np.float64)
+        bests = np.fmin(bests, stats["best"])
+        timed = np.sort(bests[~np.isnan(bests)])
+        fastest = timed[0] if timed.size else np.nan
+        median_best = np.median(timed) if timed.size else np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gaps = (bests - fastest) / fastest * 100
+            consistency = (stats["p75"] - stats["p25"]) / stats["p50"] * 100
+            spread = (median_best - fastest) / fastest * 100
+            # сколько пилотов медленнее каждого
+            slower = timed.size - np.searchsorted(timed, bests, side="right")
+            percentile = np.where(np.isnan(bests), np.nan, slower / (timed.size - 1) * 100)
+
+        pilots = {
+            pilot_id: PilotLapStats(
+                pilot_id=pilot_id,
+                laps=0 if np.isnan(stats["count"][j]) else int(stats["count"][j]),
+                best_ms=_ms(bests[j]),
+                p10_ms=_ms(stats["p10"][j]),
+                p25_ms=_ms(stats["p25"][j]),
+                median_ms=_ms(stats["p50"][j]),
+                p75_ms=_ms(stats["p75"][j]),
+                p90_ms=_ms(stats["p90"][j]),
+                mean_ms=_ms(stats["mean"][j]),
+                stdev_ms=_ms(stats["stdev"][j]),
+                consistency_pct=_pct(consistency[j]),
+                gap_pct=_pct(gaps[j]),
+                field_percentile=_pct(percentile[j]) if timed.size > 1 else None,
+            )
+            for j, pilot_id in enumerate(pilot_ids)
+        }
+
+        k = event_index[event_id]
+        result[event_id] = EventAnalytics(
+            event_id=event_id,
+            date=event_date,
+            pilots=pilots,
+            laps=int(per_event["count"][k]),
+            field_best_ms=_ms(fastest),
+            field_median_best_ms=_ms(median_best),
+            spread_pct=_pct(spread),
+            p10_ms=_ms(per_event["p10"][k]),
+            median_ms=_ms(per_event["p50"][k]),
+            p90_ms=_ms(per_event["p90"][k]),
+        )
+    return result
+
+
+# ----------------------------------------------------------------
+# кэш по событиям
+# ----------------------------------------------------------------
+
+class AnalyticsCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, tuple[int, EventAnalytics]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, event_id: int, generation: int) -> EventAnalytics | None:
+        with self._lock:
+            entry = self._entries.get(event_id)
+            if entry is None or entry[0] != generation:
+                return None
+            self._entries.move_to_end(event_id)
+            return entry[1]
+
+    def put(self, event_id: int, generation: int, analytics: EventAnalytics) -> None:
+        with self._lock:
+            self._entries[event_id] = (generation, analytics)
+            self._entries.move_to_end(event_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+analytics_cache = AnalyticsCache(max_entries=get_settings().ANALYTICS_CACHE_EVENTS)
+
+
+def load_event_analytics(db: Session, event_ids: Iterable[int]) -> dict[int, EventAnalytics]:
+    """Аналитика событий из кэша; недостающие считаются одним пакетом."""
+    # поколения — до расчёта: запись во время него сделает результат устаревшим сразу
+    current = generations.current()
+    found: dict[int, EventAnalytics] = {}
+    missing = []
+    for event_id in set(event_ids):
+        cached = analytics_cache.get(event_id, current.get(event_scope(event_id), 0))
+        if cached is None:
+            missing.append(event_id)
+        else:
+            found[event_id] = cached
+    for event_id, analytics in compute_event_analytics(db, missing).items():
+        analytics_cache.put(event_id, current.get(event_scope(event_id), 0), analytics)
+        found[event_id] = analytics
+    return found
+
+
+def load_pilot_analytics(db: Session, pilot_id: int) -> PilotAnalytics:
+    """Пилот по всем его событиям и динамика отставания от лучшего круга."""
+    event_ids = db.scalars(
+        union(
+            select(QualificationResult.event_id).where(QualificationResult.pilot_id == pilot_id),
+            select(LapTimes.event_id).where(LapTimes.pilot_id == pilot_id),
+        )
+    ).all()
+    events = sorted(
+        (
+            PilotEventAnalytics(a.event_id, a.date, a.pilots[pilot_id])
+            for a in load_event_analytics(db, event_ids).values()
+            if pilot_id in a.pilots
+        ),
+        key=lambda e: (e.date, e.event_id),
+    )
+
+    trend = change = None
+    dated = [(e.date, e.stats.gap_pct) for e in events if e.stats.gap_pct is not None]
+    if len({d for d, _gap in dated}) > 1:
+        days = np.asarray([(d - dated[0][0]).days for d, _gap in dated], dtype=np.float64)
+        gaps = np.asarray([gap for _d, gap in dated], dtype=np.float64)
+        trend = _pct(np.polyfit(days, gaps, 1)[0] * TREND_DAYS)
+        change = _pct(gaps[-1] - gaps[0])
+    return PilotAnalytics(pilot_id, events, trend, change)
+
+
+@changes.on_change
+def _clear_on_change(event_id: int | None) -> None:
+    # изменения события ловит сверка поколений; без события — сбрасываем всё
+    if event_id is None:
+        analytics_cache.clear()
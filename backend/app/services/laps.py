@@ -0,0 +1,219 @@
+# backend/app/services/laps.py
+
+"""
+Круги из экспорта RotorHazard.
+
+Раздел heats экспорта — все заезды с раундами и кругами каждого пилота,
+это большая часть файла. Он читается потоком (rh_json.iter_members), по
+заезду за раз. Круги одного пилота в одном раунде хранятся одной строкой
+lap_times: времена в мс упакованы в BLOB как массив uint32
+little-endian. Так таблица растёт на строку на раунд пилота, а не на
+каждый круг.
+
+load_laps() отдаёт круги как memoryview поверх BLOB без копирования и
+разбора — его можно передать в array/numpy (frombuffer) или читать как
+последовательность int.
+"""
+
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from ..models.lap_times import LapTimes
+from ..models.pilot import Pilot
+from . import rh_json
+
+# заезды: экспорт результатов и полный экспорт события
+HEAT_PATHS: tuple[rh_json.Path, ...] = (
+    ("heats",),
+    ("results", "heats"),
+)
+
+# uint32; "I" на всех распространённых платформах, "L" — на экзотике
+TYPECODE = next(code for code in "IL" if array(code).itemsize == 4)
+_MAX_MS = 2**32 - 1
+
+
+@dataclass(slots=True)
+class HeatLaps:
+    """Круги пилота в раунде заезда, как в файле RH."""
+    callsign: str
+    heat_id: int
+    round_id: int
+    heat_name: str | None
+    holeshot_ms: int | None
+    laps: array
+
+
+@dataclass(slots=True)
+class LapSeries:
+    """Круги пилота в раунде заезда из lap_times."""
+    event_id: int
+    pilot_id: int
+    heat_id: int
+    round_id: int
+    heat_name: str | None
+    holeshot_ms: int | None
+    laps: Sequence[int]  # memoryview формата uint32
+
+
+# ----------------------------------------------------------------
+# упаковка
+# ----------------------------------------------------------------
+
+def pack(laps: Iterable[int]) -> bytes:
+    packed = array(TYPECODE, laps)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack(blob: bytes) -> Sequence[int]:
+    """Вид на BLOB как на массив uint32; на big-endian — копия с перестановкой байт."""
+    if sys.byteorder == "little":
+        return memoryview(blob).cast(TYPECODE)
+    values = array(TYPECODE, blob)
+    values.byteswap()
+    return values
+
+
+# ----------------------------------------------------------------
+# разбор RH
+# ----------------------------------------------------------------
+
+def _int_or(value: Any, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _lap_ms(lap: Any) -> int | None:
+    if not isinstance(lap, dict) or lap.get("deleted"):
+        return None
+    try:
+        ms = round(float(lap["lap_time"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+    return ms if 0 <= ms <= _MAX_MS else None
+
+
+def _heat_laps(key: Any, heat: Any) -> Iterator[HeatLaps]:
+    if not isinstance(heat, dict):
+        return
+    heat_id = _int_or(heat.get("heat_id", key), 0)
+    heat_name = heat.get("displayname") or heat.get("note") or None
+    for position, rnd in enumerate(heat.get("rounds") or (), start=1):
+        if not isinstance(rnd, dict):
+            continue
+        round_id = _int_or(rnd.get("id"), position)
+        for node in rnd.get("nodes") or ():
+            if not isinstance(node, dict) or not node.get("callsign"):
+                continue
+            holeshot = None
+            laps = array(TYPECODE)
+            for number, lap in enumerate(node.get("laps") or ()):
+                ms = _lap_ms(lap)
+                if ms is None:
+                    continue
+                # круг 0 — от старта до первого пролёта ворот, не круг
+                if _int_or(lap.get("id"), number) == 0:
+                    holeshot = ms
+                else:
+                    laps.append(ms)
+            if laps or holeshot is not None:
+                yield HeatLaps(str(node["callsign"]), heat_id, round_id, heat_name, holeshot, laps)
+
+
+def read_laps(source: BinaryIO) -> List[HeatLaps]:
+    """Все круги из экспорта RH (файл с seek). Удалённые круги пропускаются."""
+    for path in HEAT_PATHS:
+        source.seek(0)
+        found = [
+            series
+            for key, heat in rh_json.iter_members(source, path)
+            for series in _heat_laps(key, heat)
+        ]
+        if found:
+            return found
+    return []
+
+
+# ----------------------------------------------------------------
+# запись и чтение
+# ----------------------------------------------------------------
+
+def store_event_laps(db: Session, event_id: int, series: Iterable[HeatLaps]) -> Dict[str, int]:
+    """
+    Перезаписывает круги события. Пилоты ищутся по позывному и не
+    создаются: круги тех, кого нет в базе, пропускаются.
+    Коммит делает вызывающий код.
+    """
+    db.execute(delete(LapTimes).where(LapTimes.event_id == event_id))
+
+    series = list(series)
+    callsigns = {s.callsign for s in series}
+    pilot_ids: Dict[str, int] = {}
+    if callsigns:
+        stmt = (
+            select(Pilot.id, Pilot.nickname)
+            .where(Pilot.nickname.in_(callsigns))
+            .order_by(Pilot.id.asc())
+        )
+        for pilot_id, nickname in db.execute(stmt):
+            # при дублях ника — самый ранний пилот, как в rh_import.resolve_pilots
+            pilot_ids.setdefault(nickname, pilot_id)
+
+    # повтор пилота в раунде — берём последнюю запись
+    rows: Dict[tuple[int, int, int], Dict[str, Any]] = {}
+    for s in series:
+        pilot_id = pilot_ids.get(s.callsign)
+        if pilot_id is None:
+            continue
+        rows[(pilot_id, s.heat_id, s.round_id)] = {
+            "event_id": event_id,
+            "pilot_id": pilot_id,
+            "heat_id": s.heat_id,
+            "round_id": s.round_id,
+            "heat_name": s.heat_name,
+            "holeshot_ms": s.holeshot_ms,
+            "laps": pack(s.laps),
+        }
+    if rows:
+        db.execute(insert(LapTimes).execution_options(render_nulls=True), list(rows.values()))
+
+    return {
+        "lap_series": len(rows),
+        "laps": sum(len(row["laps"]) // 4 for row in rows.values()),
+    }
+
+
+def load_laps(
+    db: Session,
+    event_id: int | None = None,
+    pilot_id: int | None = None,
+) -> List[LapSeries]:
+    """Круги события и/или пилота по заездам и раундам."""
+    if event_id is None and pilot_id is None:
+        raise ValueError("event_id or pilot_id is required")
+    stmt = select(
+        LapTimes.event_id,
+        LapTimes.pilot_id,
+        LapTimes.heat_id,
+        LapTimes.round_id,
+        LapTimes.heat_name,
+        LapTimes.holeshot_ms,
+        LapTimes.laps,
+    ).order_by(LapTimes.event_id, LapTimes.heat_id, LapTimes.round_id, LapTimes.pilot_id)
+    if event_id is not None:
+        stmt = stmt.where(LapTimes.event_id == event_id)
+    if pilot_id is not None:
+        stmt = stmt.where(LapTimes.pilot_id == pilot_id)
+    return [
+        LapSeries(*row[:-1], laps=unpack(row[-1]))
+        for row in db.execute(stmt)
+    ]
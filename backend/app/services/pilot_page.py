@@ -0,0 +1,43 @@
+# backend/app/services/pilot_page.py
+
+"""Read-model страницы пилота: профиль, статистика и участия в событиях."""
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from ..models.event import Event
+from ..models.pilot import Pilot
+from ..models.pilot_stats import PilotStats
+from ..models.qualification import QualificationResult
+
+
+def history_stmt(pilot_id: int) -> Select:
+    # все участия пилота в событиях по таблице квалификации
+    return (
+        select(QualificationResult, Event)
+        .join(Event, QualificationResult.event_id == Event.id)
+        .where(QualificationResult.pilot_id == pilot_id)
+        .order_by(Event.date.desc(), QualificationResult.rank.asc())
+    )
+
+
+def load_pilot_page(
+    db: Session, pilot_id: int
+) -> tuple[Pilot, PilotStats | None, list[dict]] | None:
+    pilot = db.get(Pilot, pilot_id)
+    if not pilot:
+        return None
+
+    stats = db.get(PilotStats, pilot_id)
+
+    rows = db.execute(history_stmt(pilot_id)).all()
+
+    participations = []
+    for q, e in rows:
+        participations.append(
+            {
+                "event": e,
+                "qual": q,
+            }
+        )
+    return pilot, stats, participations
@@ -0,0 +1,151 @@
+# backend/app/services/pilot_search.py
+
+"""
+Список пилотов: keyset-пагинация и поиск по FTS5 (таблица pilots_fts).
+
+Каждая сортировка — кортеж выражений по возрастанию с хвостом
+(nickname, id), поэтому порядок строгий и следующую страницу можно
+выбрать условием (ключи) > (ключи последней строки), без OFFSET.
+"""
+
+import base64
+import json
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import Select, column, func, literal, literal_column, select, table, tuple_
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..models.pilot import Pilot
+from ..models.pilot_stats import PilotStats
+
+# подставляется вместо NULL в ключах «меньше — лучше», чтобы такие пилоты шли в конце
+_MISSING = 1_000_000_000
+
+PILOT_SORTS = {
+    "nickname": (),
+    "events": (-func.coalesce(PilotStats.events_entered, 0),),
+    "best_rank": (func.coalesce(PilotStats.best_qual_rank, _MISSING),),
+    "best_lap": (func.coalesce(PilotStats.best_lap_ms, _MISSING),),
+    "podiums": (
+        -func.coalesce(PilotStats.podiums, 0),
+        -func.coalesce(PilotStats.wins, 0),
+    ),
+}
+DEFAULT_SORT = "nickname"
+
+pilots_fts = table("pilots_fts", column("rowid"), column("rank"))
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class PilotPage:
+    rows: list[tuple[Pilot, PilotStats | None]]
+    next_cursor: str | None
+
+
+def fts_query(text: str | None) -> str | None:
+    """Пользовательский ввод → префиксный запрос FTS5 ("ab"* "cd"*)."""
+    tokens = _TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _fts_match(query: str):
+    return literal_column("pilots_fts").op("MATCH")(query)
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None, size: int) -> list | None:
+    """Разбирает курсор; битый или чужой курсор считается отсутствующим."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        return None
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(v, (int, float, str)) for v in values)
+    ):
+        return None
+    return values
+
+
+def _sort_keys(sort: str) -> tuple:
+    return (*PILOT_SORTS[sort], Pilot.nickname, Pilot.id)
+
+
+def pilots_stmt(
+    sort: str = DEFAULT_SORT,
+    query: str | None = None,
+    after: str | None = None,
+    limit: int = 50,
+) -> Select:
+    """Запрос страницы списка: limit + 1 строка, лишняя — признак следующей."""
+    keys = _sort_keys(sort)
+    stmt = (
+        select(Pilot, PilotStats, *(k.label(f"sort_key_{i}") for i, k in enumerate(keys)))
+        .outerjoin(PilotStats, PilotStats.pilot_id == Pilot.id)
+        .order_by(*keys)
+        .limit(limit + 1)
+    )
+
+    match = fts_query(query)
+    if match:
+        stmt = stmt.where(
+            Pilot.id.in_(select(pilots_fts.c.rowid).where(_fts_match(match)))
+        )
+
+    last = decode_cursor(after, len(keys))
+    if last is not None:
+        stmt = stmt.where(tuple_(*keys) > tuple_(*(literal(v) for v in last)))
+    return stmt
+
+
+def list_pilots(
+    db: Session,
+    sort: str = DEFAULT_SORT,
+    query: str | None = None,
+    after: str | None = None,
+    limit: int | None = None,
+) -> PilotPage:
+    """Страница списка пилотов после курсора after."""
+    limit = limit or get_settings().PILOTS_PAGE_SIZE
+    stmt = pilots_stmt(sort, query, after, limit)
+
+    result = db.execute(stmt).all()
+    page, extra = result[:limit], result[limit:]
+
+    next_cursor = None
+    if extra:
+        next_cursor = encode_cursor(list(page[-1][2:]))
+
+    return PilotPage(
+        rows=[(row[0], row[1]) for row in page],
+        next_cursor=next_cursor,
+    )
+
+
+def search_pilots(db: Session, query: str | None, limit: int = 10) -> list[Pilot]:
+    """Подсказки для поиска: лучшие совпадения по bm25."""
+    match = fts_query(query)
+    if not match:
+        return []
+    stmt = (
+        select(Pilot)
+        .join(pilots_fts, pilots_fts.c.rowid == Pilot.id)
+        .where(_fts_match(match))
+        .order_by(pilots_fts.c.rank, Pilot.nickname)
+        .limit(limit)
+    )
+    return list(db.scalars(stmt))
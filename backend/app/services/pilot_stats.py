@@ -0,0 +1,156 @@
+# backend/app/services/pilot_stats.py
+
+"""
+Инкрементальное обновление таблицы pilot_stats.
+
+При изменении события пересчитываются только пилоты, которые в нём были
+до и после изменения: три агрегирующих запроса по индексам pilot_id,
+затем замена их строк. Страницы читают готовые строки.
+"""
+
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import case, delete, distinct, func, insert, select, union, union_all
+from sqlalchemy.orm import Session
+
+from ..models.bracket import BracketRace, BracketRaceResult
+from ..models.pilot_stats import PilotStats
+from ..models.qualification import QualificationResult
+
+# best3 считаем только по полной серии из трёх кругов подряд
+FULL_CONSECUTIVES = 3
+FINAL_STAGE = "final"
+
+
+def event_pilot_ids(db: Session, event_id: int) -> set[int]:
+    """Все пилоты события: из квалификации и из сетки."""
+    qual = select(QualificationResult.pilot_id).where(
+        QualificationResult.event_id == event_id
+    )
+    bracket = (
+        select(BracketRaceResult.pilot_id)
+        .join(BracketRace, BracketRaceResult.bracket_race_id == BracketRace.id)
+        .where(
+            BracketRace.event_id == event_id,
+            BracketRaceResult.pilot_id.is_not(None),
+        )
+    )
+    return set(db.scalars(union(qual, bracket)))
+
+
+def refresh_pilot_stats(db: Session, pilot_ids: Iterable[int]) -> int:
+    """Пересчитывает статистику указанных пилотов. Коммит — на вызывающем."""
+    ids = sorted({pid for pid in pilot_ids if pid is not None})
+    if not ids:
+        return 0
+
+    stats: dict[int, dict] = {}
+
+    def row(pilot_id: int) -> dict:
+        return stats.setdefault(
+            pilot_id,
+            {
+                "pilot_id": pilot_id,
+                "events_entered": 0,
+                "best_qual_rank": None,
+                "avg_qual_rank": None,
+                "best_lap_ms": None,
+                "best3_avg_ms": None,
+                "bracket_events": 0,
+                "bracket_races": 0,
+                "finals": 0,
+                "podiums": 0,
+                "wins": 0,
+            },
+        )
+
+    # события, где пилот был в квалификации или в сетке
+    participations = union_all(
+        select(
+            QualificationResult.pilot_id.label("pilot_id"),
+            QualificationResult.event_id.label("event_id"),
+        ).where(QualificationResult.pilot_id.in_(ids)),
+        select(
+            BracketRaceResult.pilot_id.label("pilot_id"),
+            BracketRace.event_id.label("event_id"),
+        )
+        .join(BracketRace, BracketRaceResult.bracket_race_id == BracketRace.id)
+        .where(BracketRaceResult.pilot_id.in_(ids)),
+    ).subquery()
+    events_stmt = select(
+        participations.c.pilot_id,
+        func.count(distinct(participations.c.event_id)),
+    ).group_by(participations.c.pilot_id)
+    for pilot_id, events_entered in db.execute(events_stmt):
+        row(pilot_id)["events_entered"] = events_entered
+
+    full_best3 = case(
+        (
+            func.coalesce(QualificationResult.consecutives_count, FULL_CONSECUTIVES)
+            >= FULL_CONSECUTIVES,
+            QualificationResult.best3_avg_ms,
+        )
+    )
+    qual_stmt = (
+        select(
+            QualificationResult.pilot_id,
+            func.min(QualificationResult.rank),
+            func.avg(QualificationResult.rank),
+            func.min(QualificationResult.best_lap_ms),
+            func.min(full_best3),
+        )
+        .where(QualificationResult.pilot_id.in_(ids))
+        .group_by(QualificationResult.pilot_id)
+    )
+    for pilot_id, best_rank, avg_rank, best_lap, best3 in db.execute(qual_stmt):
+        r = row(pilot_id)
+        r["best_qual_rank"] = best_rank
+        r["avg_qual_rank"] = round(avg_rank, 2) if avg_rank is not None else None
+        r["best_lap_ms"] = best_lap
+        r["best3_avg_ms"] = best3
+
+    is_final = BracketRace.stage == FINAL_STAGE
+    pos = BracketRaceResult.final_position
+    bracket_stmt = (
+        select(
+            BracketRaceResult.pilot_id,
+            func.count(distinct(BracketRace.event_id)),
+            func.count(BracketRaceResult.id),
+            func.sum(case((is_final, 1), else_=0)),
+            func.sum(case((is_final & (pos <= 3), 1), else_=0)),
+            func.sum(case((is_final & (pos == 1), 1), else_=0)),
+        )
+        .join(BracketRace, BracketRaceResult.bracket_race_id == BracketRace.id)
+        .where(BracketRaceResult.pilot_id.in_(ids))
+        .group_by(BracketRaceResult.pilot_id)
+    )
+    for pilot_id, b_events, b_races, finals, podiums, wins in db.execute(bracket_stmt):
+        r = row(pilot_id)
+        r["bracket_events"] = b_events
+        r["bracket_races"] = b_races
+        r["finals"] = finals or 0
+        r["podiums"] = podiums or 0
+        r["wins"] = wins or 0
+
+    db.execute(delete(PilotStats).where(PilotStats.pilot_id.in_(ids)))
+    if stats:
+        now = datetime.utcnow()
+        # render_nulls: иначе ORM бьёт строки на отдельные INSERT по набору не-NULL колонок
+        db.execute(
+            insert(PilotStats).execution_options(render_nulls=True),
+            [{**r, "updated_at": now} for r in stats.values()],
+        )
+    return len(ids)
+
+
+def refresh_event_pilot_stats(
+    db: Session,
+    event_id: int,
+    previous_pilot_ids: Iterable[int] = (),
+) -> int:
+    """
+    Пересчёт после изменения события: пилоты, которые в нём есть сейчас,
+    плюс те, что были до изменения (previous_pilot_ids).
+    """
+    return refresh_pilot_stats(db, event_pilot_ids(db, event_id) | set(previous_pilot_ids))
@@ -0,0 +1,247 @@
+# backend/app/services/posters.py
+
+"""
+Афиши событий.
+
+Загрузка идёт потоком: файл из формы копируется на диск кусками по
+CHUNK_SIZE с одновременным подсчётом хэша и проверкой размера, целиком
+в памяти он не оказывается. Имя файла — хэш содержимого
+(posters/<hash>.<ext>), поэтому ссылку на него можно кэшировать навсегда
+(core.static), а повторная загрузка той же картинки ничего не пишет.
+
+Рядом сразу кладутся уменьшенные копии <hash>_<ширина>.jpg
+(POSTER_WIDTHS, строит Pillow из requirements.txt): карточки на главной и
+в списках грузят их, а не многомегабайтное фото с телефона. Если Pillow
+всё же не установлен, при старте пишется предупреждение, а страницы
+получают оригинал.
+
+В events.poster хранится имя оригинала. Старые афиши
+static/posters/event_<id>.* подхватывает adopt_legacy() — команда
+`python -m backend.app.manage adopt-posters` (миграции файлы не трогают).
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from ..core.config import get_settings
+from ..core.static import STATIC_DIR
+
+try:  # в requirements.txt; без него варианты не строятся
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - зависит от окружения
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+if Image is None:  # pragma: no cover - зависит от окружения
+    logger.warning("Pillow is not installed: poster thumbnails are disabled, pages get originals")
+
+# чем Pillow отвечает на битую или обрезанную картинку
+DECODE_ERRORS: tuple[type[Exception], ...] = (OSError, SyntaxError, ValueError) + (
+    (Image.DecompressionBombError,) if Image is not None else ()
+)
+
+settings = get_settings()
+
+POSTER_DIR = STATIC_DIR / "posters"
+CHUNK_SIZE = 256 * 1024
+HASH_LENGTH = 16
+
+# сигнатуры форматов, которые принимаем
+SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+LEGACY_PATTERN = "event_{event_id}.{ext}"
+LEGACY_EXTENSIONS = ("jpg", "jpeg", "png", "webp", "gif")
+
+
+class PosterError(ValueError):
+    """Файл не подходит как афиша (не картинка или слишком большой)."""
+
+
+def _sniff(head: bytes) -> str:
+    for signature, ext in SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    raise PosterError("Афиша должна быть картинкой JPEG, PNG, WebP или GIF")
+
+
+def variant_name(key: str, width: int) -> str:
+    return f"{key.rsplit('.', 1)[0]}_{width}.jpg"
+
+
+def _check_image(path: Path) -> None:
+    """Полностью декодирует картинку: подпись формата ещё не значит, что файл цел."""
+    if Image is None:
+        return
+    with Image.open(path) as image:
+        image.load()
+
+
+def _remove_poster(key: str) -> None:
+    """Оригинал и все его варианты (и недописанные .tmp)."""
+    stem = key.rsplit(".", 1)[0]
+    leftovers = (*POSTER_DIR.glob(f"{stem}_*.jpg"), *POSTER_DIR.glob(f".{stem}_*.tmp"))
+    for path in (POSTER_DIR / key, *leftovers):
+        path.unlink(missing_ok=True)
+    _variants.pop(key, None)
+
+
+def save_poster(source: BinaryIO) -> str:
+    """
+    Копирует картинку из файлового объекта в хранилище и строит варианты.
+    Возвращает ключ (имя оригинала) для events.poster. Картинку, которую
+    Pillow не может прочитать, не сохраняет: PosterError.
+    """
+    POSTER_DIR.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.blake2b(digest_size=HASH_LENGTH // 2)
+    size = 0
+    ext = None
+    created = False
+
+    fd, tmp_name = tempfile.mkstemp(dir=POSTER_DIR, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := source.read(CHUNK_SIZE):
+                if ext is None:
+                    ext = _sniff(chunk)
+                size += len(chunk)
+                if size > settings.POSTER_MAX_BYTES:
+                    raise PosterError(
+                        f"Афиша больше {settings.POSTER_MAX_BYTES // (1024 * 1024)} МБ"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+        if ext is None:
+            raise PosterError("Пустой файл афиши")
+
+        key = f"{digest.hexdigest()}.{ext}"
+        target = POSTER_DIR / key
+        if target.exists():
+            os.unlink(tmp_name)
+        else:
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, target)
+            created = True
+            _check_image(target)
+        build_variants(key)
+    except BaseException as exc:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        # файл, сохранённый этим вызовом, без ссылки из events не нужен
+        if created:
+            _remove_poster(key)
+        if isinstance(exc, DECODE_ERRORS) and not isinstance(exc, PosterError):
+            logger.info("poster upload rejected: %s", exc)
+            raise PosterError("Не удалось прочитать картинку афиши") from None
+        raise
+    return key
+
+
+def build_variants(key: str) -> list[int]:
+    """Уменьшенные копии для POSTER_WIDTHS, которых ещё нет; возвращает построенные ширины."""
+    if Image is None:
+        return []
+    built = []
+    source = POSTER_DIR / key
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        for width in settings.POSTER_WIDTHS:
+            target = POSTER_DIR / variant_name(key, width)
+            if target.exists() or image.width <= width:
+                continue
+            height = round(image.height * width / image.width)
+            resized = image.resize((width, height), Image.LANCZOS)
+            tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            try:
+                resized.save(tmp, "JPEG", quality=82, optimize=True, progressive=True)
+                os.replace(tmp, target)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            built.append(width)
+    return built
+
+
+# ----------------------------------------------------------------
+# ссылки для шаблонов
+# ----------------------------------------------------------------
+
+# ключ → ширины готовых вариантов; имена по хэшу, так что набор не меняется
+_variants: dict[str, tuple[int, ...]] = {}
+
+
+def available_variants(key: str) -> tuple[int, ...]:
+    widths = _variants.get(key)
+    if widths is None:
+        widths = tuple(
+            width
+            for width in sorted(settings.POSTER_WIDTHS)
+            if (POSTER_DIR / variant_name(key, width)).is_file()
+        )
+        # пустой набор не запоминаем: варианты могут достроить позже
+        if widths:
+            _variants[key] = widths
+    return widths
+
+
+def poster_path(key: str, width: int | None = None) -> str:
+    """Путь внутри /static для оригинала или ближайшего варианта не уже width."""
+    if width is not None:
+        for available in available_variants(key):
+            if available >= width:
+                return f"posters/{variant_name(key, available)}"
+    return f"posters/{key}"
+
+
+def srcset_paths(key: str) -> list[tuple[str, int]]:
+    return [(f"posters/{variant_name(key, width)}", width) for width in available_variants(key)]
+
+
+# ----------------------------------------------------------------
+# старые афиши event_<id>.*
+# ----------------------------------------------------------------
+
+def _legacy_file(event_id: int) -> Path | None:
+    for ext in LEGACY_EXTENSIONS:
+        path = POSTER_DIR / LEGACY_PATTERN.format(event_id=event_id, ext=ext)
+        if path.is_file():
+            return path
+    return None
+
+
+def adopt_legacy(conn: Connection) -> int:
+    """Переносит posters/event_<id>.* в хэшированное хранилище для событий без афиши."""
+    adopted = 0
+    event_ids = conn.execute(text("SELECT id FROM events WHERE poster IS NULL")).scalars().all()
+    for event_id in event_ids:
+        path = _legacy_file(event_id)
+        if path is None:
+            continue
+        try:
+            with open(path, "rb") as f:
+                key = save_poster(f)
+        except PosterError:
+            logger.warning("skipping legacy poster %s: not an image", path)
+            continue
+        conn.execute(
+            text("UPDATE events SET poster = :key WHERE id = :id"),
+            {"key": key, "id": event_id},
+        )
+        adopted += 1
+    return adopted
@@ -0,0 +1,143 @@
+# backend/app/services/qual_ranking.py
+
+"""
+Места в квалификации по правилу проекта, а не по position из RH.
+
+Правило (RankingRule) — список критериев по порядку. Основной, series, —
+серия из N кругов подряд (consecutives в RH): сначала пилоты с полной
+серией по её времени, за ними с неполной — чем длиннее серия, тем выше,
+внутри по времени. Дальше тай-брейки: лучший круг, число кругов. При
+полном равенстве выше тот, кто выше у RH. Всё это — один составной ключ
+и одна сортировка; места уникальны, 1..n.
+
+Пилоты без времени (ни серии, ни лучшего круга) места не получают, как и
+раньше без position из RH.
+
+Место хранится в qualification_results.rank (индекс event_id, rank),
+позиция RH — в rh_position. Страница события читает строки уже в
+порядке rank. Смена правила — WHOOPMANIA_QUAL_RANKING_RULE и
+`python -m backend.app.manage rerank-qualification` для прошлых событий.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Sequence
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..models.qualification import QualificationResult
+from .pilot_stats import refresh_event_pilot_stats
+from .standings import recompute_event_standings
+
+# без значения — после всех, у кого оно есть
+_MISSING = float("inf")
+
+Row = Mapping[str, Any]
+
+
+def _asc(value: Any) -> Any:
+    return _MISSING if value is None else value
+
+
+def _time(value: int | None) -> float:
+    # RH пишет 0, если времени нет
+    return value if value else _MISSING
+
+
+@dataclass(frozen=True)
+class RankingRule:
+    # длина полной серии кругов подряд
+    consecutives: int = 3
+    # критерии по порядку (CRITERIA)
+    order: tuple[str, ...] = ("series", "best_lap", "laps")
+
+    def series_label(self, count: int | None) -> str | None:
+        """Префикс «2/» у времени неполной серии; None — серия полная."""
+        if count and count < self.consecutives:
+            return f"{count}/"
+        return None
+
+    def key(self, row: Row) -> tuple:
+        return tuple(CRITERIA[name](self, row) for name in self.order) + (
+            _asc(row.get("rh_position")),
+        )
+
+
+def _series(rule: RankingRule, row: Row) -> tuple:
+    time = _time(row.get("best3_avg_ms"))
+    if time == _MISSING:
+        return (rule.consecutives + 1, _MISSING)
+    # без consecutives_count серия считается полной, как в старых импортах
+    count = row.get("consecutives_count")
+    if count is None:
+        count = rule.consecutives
+    return (rule.consecutives - min(count, rule.consecutives), time)
+
+
+CRITERIA: dict[str, Callable[[RankingRule, Row], Any]] = {
+    "series": _series,
+    "best_lap": lambda rule, row: _time(row.get("best_lap_ms")),
+    "laps": lambda rule, row: -(row.get("laps_total") or 0),
+    "attempts": lambda rule, row: _asc(row.get("attempts_count")),
+}
+
+RANKING_RULES: dict[str, RankingRule] = {
+    "default": RankingRule(),
+    # форматы без серий: по лучшему кругу, серия — тай-брейк
+    "best_lap": RankingRule(order=("best_lap", "series", "laps")),
+}
+
+
+def get_rule() -> RankingRule:
+    return RANKING_RULES[get_settings().QUAL_RANKING_RULE]
+
+
+def _timed(row: Row) -> bool:
+    return bool(row.get("best3_avg_ms") or row.get("best_lap_ms"))
+
+
+def rank_rows(rows: Sequence[Row], rule: RankingRule) -> list[int | None]:
+    """Места для строк в их исходном порядке; None — пилот без времени."""
+    keys = [rule.key(row) + (i,) if _timed(row) else None for i, row in enumerate(rows)]
+    ordered = sorted((key for key in keys if key is not None))
+    ranks: list[int | None] = [None] * len(rows)
+    for place, key in enumerate(ordered, start=1):
+        ranks[key[-1]] = place
+    return ranks
+
+
+def rerank_event(db: Session, event_id: int, rule: RankingRule | None = None) -> int:
+    """
+    Пересчитывает места квалификации события по правилу; при изменениях
+    обновляет pilot_stats и зачёт. Возвращает число изменённых строк.
+    Коммит — на вызывающем.
+    """
+    rule = rule or get_rule()
+    q = QualificationResult
+    rows = db.execute(
+        select(
+            q.id,
+            q.rank,
+            q.rh_position,
+            q.best3_avg_ms,
+            q.consecutives_count,
+            q.best_lap_ms,
+            q.laps_total,
+            q.attempts_count,
+        )
+        .where(q.event_id == event_id)
+        .order_by(q.id)
+    ).mappings().all()
+
+    changed = [
+        {"id": row["id"], "rank": rank}
+        for row, rank in zip(rows, rank_rows(rows, rule))
+        if row["rank"] != rank
+    ]
+    if changed:
+        # UPDATE по первичному ключу одним executemany
+        db.execute(update(QualificationResult), changed)
+        refresh_event_pilot_stats(db, event_id)
+        recompute_event_standings(db, event_id)
+    return len(changed)
@@ -0,0 +1,107 @@
+# backend/app/services/rh_import.py
+
+"""
+Импорт квалификации из экспорта RotorHazard.
+
+Весь импорт — одна транзакция с фиксированным числом запросов: удаление
+старой квалы, один SELECT ... IN по позывным, один bulk INSERT новых пилотов
+и один bulk INSERT результатов. Места считаются здесь же
+(services.qual_ranking), position из RH сохраняется в rh_position. В той же транзакции пересчитываются
+pilot_stats для пилотов события и его вклад в сезонный зачёт.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from ..models.pilot import Pilot
+from ..models.qualification import QualificationResult
+from .pilot_stats import event_pilot_ids, refresh_event_pilot_stats
+from .qual_ranking import get_rule, rank_rows
+from .standings import recompute_event_standings
+
+
+def _int_or_none(value: Any) -> int | None:
+    return int(value) if value is not None else None
+
+
+def resolve_pilots(db: Session, nicknames: Iterable[str]) -> tuple[Dict[str, int], int]:
+    """
+    Находит id пилотов по никам одним запросом, недостающих создаёт одним INSERT.
+    Возвращает (ник → id, сколько пилотов создано).
+    """
+    wanted = set(nicknames)
+    if not wanted:
+        return {}, 0
+
+    ids: Dict[str, int] = {}
+    stmt = (
+        select(Pilot.id, Pilot.nickname)
+        .where(Pilot.nickname.in_(wanted))
+        .order_by(Pilot.id.asc())
+    )
+    for pilot_id, nickname in db.execute(stmt):
+        # при дублях ника берём самого раннего пилота
+        ids.setdefault(nickname, pilot_id)
+
+    missing = sorted(wanted - ids.keys())
+    if missing:
+        now = datetime.utcnow()
+        created = db.execute(
+            insert(Pilot).returning(Pilot.id, Pilot.nickname),
+            [{"nickname": n, "created_at": now} for n in missing],
+        )
+        for pilot_id, nickname in created:
+            ids[nickname] = pilot_id
+
+    return ids, len(missing)
+
+
+def import_qualification(
+    db: Session,
+    event_id: int,
+    qual_table: List[Dict[str, Any]],
+) -> Dict[str, int]:
+    """
+    Перезаписывает квалификацию события строками лидерборда RH (by_consecutives).
+    Коммит делает вызывающий код.
+    """
+    previous_pilot_ids = event_pilot_ids(db, event_id)
+
+    # Удаляем старую квалу при повторном импорте
+    replaced = db.execute(
+        delete(QualificationResult).where(QualificationResult.event_id == event_id)
+    ).rowcount
+
+    nicknames = [row.get("callsign") or "Unknown" for row in qual_table]
+    pilot_ids, pilots_created = resolve_pilots(db, nicknames)
+
+    rows = [
+        {
+            "event_id": event_id,
+            "pilot_id": pilot_ids[nickname],
+            "rh_position": row.get("position"),
+            "best_lap_ms": _int_or_none(row.get("fastest_lap_raw")),
+            "best3_avg_ms": _int_or_none(row.get("consecutives_raw")),
+            "laps_total": row.get("laps"),
+            "attempts_count": row.get("starts"),
+            "consecutives_count": row.get("consecutives_base"),  # 3,2,1,0
+        }
+        for nickname, row in zip(nicknames, qual_table)
+    ]
+    # места — по своему правилу, позиция RH остаётся для справки и тай-брейка
+    for row, rank in zip(rows, rank_rows(rows, get_rule())):
+        row["rank"] = rank
+    if rows:
+        db.execute(insert(QualificationResult).execution_options(render_nulls=True), rows)
+
+    refresh_event_pilot_stats(db, event_id, previous_pilot_ids)
+    recompute_event_standings(db, event_id)
+
+    return {
+        "imported": len(rows),
+        "pilots_created": pilots_created,
+        "replaced": replaced,
+    }
@@ -0,0 +1,372 @@
+# backend/app/services/rh_json.py
+
+"""
+Потоковое чтение экспорта RotorHazard.
+
+Полный экспорт сезона — десятки МБ (все заезды, круги, пилоты), а
+импорту нужны небольшие разделы вроде event_leaderboard.by_consecutives.
+extract_paths() читает файл кусками и собирает в объекты только значения
+по запрошенным путям; остальное проматывается без разбора, память
+ограничена размером куска и самого нужного раздела. Когда все пути
+найдены, чтение прекращается.
+
+iter_members() так же потоком отдаёт по одному члены большого раздела
+(заезды heats со всеми кругами): в памяти — только текущий заезд.
+
+С установленным ijson разбор идёт через него (C-бэкенд yajl2_c, если
+собран); без него — встроенный сканер на регулярных выражениях.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Iterable, Iterator
+
+try:  # необязательная зависимость
+    import ijson
+except ImportError:  # pragma: no cover - зависит от окружения
+    ijson = None
+
+CHUNK_SIZE = 256 * 1024
+
+Path = tuple[str, ...]
+
+# лидерборд квалификации: новый формат и старый
+QUAL_PATHS: tuple[Path, ...] = (
+    ("event_leaderboard", "by_consecutives"),
+    ("leaderboard", "by_consecutives"),
+)
+
+
+class RHJSONError(ValueError):
+    """Файл не разбирается как JSON."""
+
+
+def extract_paths(source: BinaryIO, paths: Iterable[Path]) -> dict[Path, Any]:
+    """
+    Значения по путям из ключей объектов, например ("leaderboard", "by_consecutives").
+    Отсутствующих путей в результате нет.
+    """
+    wanted = frozenset(tuple(p) for p in paths)
+    if not wanted:
+        return {}
+    if ijson is not None:
+        return _extract_ijson(source, wanted)
+    found: dict[Path, Any] = {}
+    _Scanner(source).walk((), wanted, found)
+    return found
+
+
+def iter_members(source: BinaryIO, path: Path) -> Iterator[tuple[str | int, Any]]:
+    """
+    (ключ, значение) для каждого члена объекта по пути path, для массива —
+    (индекс, значение). Раздела нет — ничего.
+    """
+    if ijson is not None:
+        yield from _iter_ijson(source, ".".join(path))
+        return
+    scanner = _Scanner(source)
+    if scanner.seek(tuple(path)):
+        yield from scanner.members()
+
+
+# ----------------------------------------------------------------
+# ijson
+# ----------------------------------------------------------------
+
+class _WithoutBOM:
+    """Файл без BOM UTF-8 в начале: встроенный сканер его пропускает, ijson — нет."""
+
+    def __init__(self, source: BinaryIO) -> None:
+        self._source = source
+        head = b""
+        while len(head) < len(codecs.BOM_UTF8):
+            chunk = source.read(len(codecs.BOM_UTF8) - len(head))
+            if not chunk:
+                break
+            head += chunk
+        self._head = b"" if head == codecs.BOM_UTF8 else head
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._head or size == 0:
+            return self._source.read(size)
+        head, self._head = self._head, b""
+        return head
+
+
+def _parse_ijson(source: BinaryIO) -> Iterator[tuple[str, str, Any]]:
+    return ijson.parse(_WithoutBOM(source), buf_size=CHUNK_SIZE, use_float=True)
+
+
+def _extract_ijson(source: BinaryIO, wanted: frozenset[Path]) -> dict[Path, Any]:
+    prefixes = {".".join(path): path for path in wanted}
+    found: dict[Path, Any] = {}
+    builder = None
+    target = None
+    try:
+        for prefix, event, value in _parse_ijson(source):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == target and event in ("end_map", "end_array"):
+                    found[prefixes[target]] = builder.value
+                    builder = None
+                    if len(found) == len(wanted):
+                        break
+                continue
+            if prefix in prefixes and event != "map_key" and prefixes[prefix] not in found:
+                if event in ("start_map", "start_array"):
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    target = prefix
+                else:
+                    found[prefixes[prefix]] = value
+                    if len(found) == len(wanted):
+                        break
+    except ijson.JSONError as exc:
+        raise RHJSONError(str(exc)) from None
+    return found
+
+
+def _iter_ijson(source: BinaryIO, target: str) -> Iterator[tuple[str | int, Any]]:
+    container = None
+    builder = None
+    depth = 0
+    key: str | int = 0
+    index = 0
+    try:
+        for prefix, event, value in _parse_ijson(source):
+            if container is None:
+                if prefix == target and event in ("start_map", "start_array"):
+                    container = event
+                continue
+            if builder is None:
+                if prefix == target and event == "map_key":
+                    key = value
+                    continue
+                if prefix == target and event in ("end_map", "end_array"):
+                    return
+                member = key if container == "start_map" else index
+                index += 1
+                if event in ("start_map", "start_array"):
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    depth = 1
+                else:
+                    yield member, value
+                continue
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+                if depth == 0:
+                    yield member, builder.value
+                    builder = None
+    except ijson.JSONError as exc:
+        raise RHJSONError(str(exc)) from None
+
+
+# ----------------------------------------------------------------
+# встроенный сканер
+# ----------------------------------------------------------------
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# всё до ближайшей скобки, целые строки — одним куском
+_SKIP_RUN = re.compile(r'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+_SCALAR = re.compile(r"[^\s,\]}]+")
+
+
+class _Scanner:
+    """
+    Курсор по JSON из файла. Буфер хранит непрочитанный хвост; пока
+    собирается нужное значение (от _mark), уже просмотренная его часть
+    при подкачке уходит в список _held и склеивается один раз, когда
+    значение дочитано: большой раздел не копируется на каждом куске.
+    """
+
+    def __init__(self, source: BinaryIO, chunk_size: int = CHUNK_SIZE) -> None:
+        self._source = source
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buf = ""
+        self._pos = 0
+        self._mark: int | None = None
+        self._held: list[str] = []
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._source.read(self._chunk_size)
+        text = self._decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self._eof = True
+        if self._mark is not None:
+            self._held.append(self._buf[self._mark:self._pos])
+            self._mark = 0
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return bool(text) or not self._eof
+
+    def _begin(self) -> None:
+        """Отмечает начало значения под курсором."""
+        self.peek()
+        self._mark = self._pos
+        self._held.clear()
+
+    def _taken(self) -> str:
+        """Текст от отметки до курсора."""
+        text = self._buf[self._mark:self._pos]
+        if self._held:
+            self._held.append(text)
+            text = "".join(self._held)
+        return text
+
+    def _release(self) -> None:
+        self._mark = None
+        self._held.clear()
+
+    def _fail(self, message: str) -> RHJSONError:
+        return RHJSONError(f"{message} near {self._buf[self._pos:self._pos + 40]!r}")
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise self._fail("unexpected end of JSON")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._fail(f"expected {char!r}")
+        self._pos += 1
+
+    def _skip_string(self) -> None:
+        self.expect('"')
+        while True:
+            match = _STRING_TAIL.match(self._buf, self._pos)
+            if match is not None:
+                self._pos = match.end()
+                return
+            if not self._fill():
+                raise self._fail("unterminated string")
+
+    def read_key(self) -> str:
+        self._begin()
+        try:
+            self._skip_string()
+            return json.loads(self._taken())
+        finally:
+            self._release()
+
+    def skip_value(self) -> None:
+        char = self.peek()
+        if char == '"':
+            self._skip_string()
+        elif char in "{[":
+            depth = 0
+            while True:
+                self._pos = _SKIP_RUN.match(self._buf, self._pos).end()
+                # кусок кончился, возможно посреди строки — подкачиваем
+                if self._pos == len(self._buf) or self._buf[self._pos] == '"':
+                    if not self._fill():
+                        raise self._fail("unexpected end of JSON")
+                    continue
+                depth += 1 if self._buf[self._pos] in "{[" else -1
+                self._pos += 1
+                if depth == 0:
+                    return
+        else:
+            while True:
+                match = _SCALAR.match(self._buf, self._pos)
+                if match is None:
+                    raise self._fail("unexpected character")
+                # число могло оборваться на границе куска
+                if match.end() < len(self._buf) or not self._fill():
+                    self._pos = match.end()
+                    return
+
+    def read_value(self) -> Any:
+        self._begin()
+        try:
+            self.skip_value()
+            return json.loads(self._taken())
+        except ValueError as exc:
+            raise RHJSONError(str(exc)) from None
+        finally:
+            self._release()
+
+    def walk(self, prefix: Path, wanted: frozenset[Path], found: dict[Path, Any]) -> None:
+        """Обходит значение по пути prefix; нужное кладёт в found."""
+        if prefix in wanted:
+            found[prefix] = self.read_value()
+            return
+        depth = len(prefix)
+        if self.peek() != "{" or not any(
+            path[:depth] == prefix and path not in found for path in wanted
+        ):
+            self.skip_value()
+            return
+
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_key()
+            self.expect(":")
+            self.walk(prefix + (key,), wanted, found)
+            if len(found) == len(wanted):
+                return  # остаток файла не нужен
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise self._fail("expected ',' or '}'")
+
+    def seek(self, path: Path) -> bool:
+        """Встаёт на значение по пути path; False — пути в файле нет."""
+        for key in path:
+            if self.peek() != "{":
+                return False
+            self.expect("{")
+            while True:
+                if self.peek() == "}":
+                    return False
+                if self.read_key() == key:
+                    self.expect(":")
+                    break
+                self.expect(":")
+                self.skip_value()
+                if self.peek() == ",":
+                    self._pos += 1
+        return True
+
+    def members(self) -> Iterator[tuple[str | int, Any]]:
+        """Члены объекта или массива под курсором, по одному."""
+        opening = self.peek()
+        if opening not in "{[":
+            return
+        closing = "}" if opening == "{" else "]"
+        self._pos += 1
+        if self.peek() == closing:
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            if opening == "{":
+                key: str | int = self.read_key()
+                self.expect(":")
+            else:
+                key = index
+            yield key, self.read_value()
+            index += 1
+            char = self.peek()
+            self._pos += 1
+            if char == closing:
+                return
+            if char != ",":
+                raise self._fail(f"expected ',' or {closing!r}")
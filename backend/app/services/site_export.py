@@ -0,0 +1,292 @@
+# backend/app/services/site_export.py
+
+"""
+Экспорт публичных страниц в статический каталог для nginx.
+
+Страницы рендерит само приложение: SiteExporter вызывает его как ASGI
+(без сети и без httpx), поэтому HTML совпадает с тем, что отдал бы
+uvicorn. /events/4 пишется в <каталог>/events/4/index.html, рядом —
+.gz (и .br), чтобы nginx отдавал сжатое через gzip_static.
+
+Зависимости: страница события зависит от своего события, страница
+пилота — от событий, где он летал, списки и зачёт — от всех. В
+<каталог>/.manifest.json хранится, какие пилоты были у каждого события
+при последней сборке. После изменения события пересобираются только его
+страница, страницы его пилотов (прежних и нынешних — кого убрали
+повторным импортом, тоже) и списки. Изменение без события — полная сборка.
+
+Полная сборка: `python -m backend.app.manage export-site`. Если задан
+WHOOPMANIA_SITE_EXPORT_DIR, приложение само пересобирает затронутые
+страницы после каждой своей записи (core.changes.on_local_change —
+при нескольких процессах пересобирает тот, кто писал).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import urlsplit
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core import changes
+from ..core.compression import compress, supported_encodings
+from ..core.config import get_settings
+from ..core.static import ENCODING_SUFFIXES
+from ..db import ReadSessionLocal, run_db
+from ..models.event import Event
+from ..models.pilot import Pilot
+from .pilot_stats import event_pilot_ids
+from .standings import list_seasons
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = ".manifest.json"
+
+# страницы, которые зависят от любого изменения
+LIST_PAGES = ("/", "/events", "/pilots", "/standings")
+
+
+@dataclass
+class ExportResult:
+    written: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.written} written, {self.unchanged} unchanged, {self.removed} removed"
+
+
+def page_file(root: Path, path: str) -> Path:
+    """/events/4 → <root>/events/4/index.html"""
+    return root.joinpath(*[part for part in path.split("/") if part], "index.html")
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, target)
+
+
+def _remove(target: Path) -> bool:
+    removed = False
+    for path in (target, *(target.with_name(target.name + s) for s in ENCODING_SUFFIXES.values())):
+        try:
+            path.unlink()
+            removed = True
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+# ----------------------------------------------------------------
+# зависимости
+# ----------------------------------------------------------------
+
+def _with_read_session(loader, *args):
+    with ReadSessionLocal() as db:
+        return loader(db, *args)
+
+
+def _all_targets(db: Session) -> tuple[list[int], list[int], list[int]]:
+    events = list(db.scalars(select(Event.id).order_by(Event.id)))
+    pilots = list(db.scalars(select(Pilot.id).order_by(Pilot.id)))
+    return events, pilots, list_seasons(db)
+
+
+def _event_pilots(db: Session, event_ids: Iterable[int]) -> dict[int, list[int]]:
+    return {event_id: sorted(event_pilot_ids(db, event_id)) for event_id in event_ids}
+
+
+def _load_full(db: Session) -> tuple[list[int], list[int], list[int], dict[int, list[int]]]:
+    events, pilots, seasons = _all_targets(db)
+    return events, pilots, seasons, _event_pilots(db, events)
+
+
+def _load_event(db: Session, event_id: int) -> tuple[list[int], list[int]]:
+    return list_seasons(db), sorted(event_pilot_ids(db, event_id))
+
+
+# ----------------------------------------------------------------
+# рендер через ASGI
+# ----------------------------------------------------------------
+
+class SiteExporter:
+    def __init__(self, app, root: Path | str, base_url: str) -> None:
+        self.app = app
+        self.root = Path(root)
+        url = urlsplit(base_url)
+        self._scheme = url.scheme or "http"
+        self._host = url.netloc or "localhost"
+        self._server = (url.hostname or "localhost", url.port or (443 if self._scheme == "https" else 80))
+        self._lock = asyncio.Lock()
+        self._pending: set[int | None] = set()
+        self._task: asyncio.Task | None = None
+
+    # --- манифест ---
+
+    def _read_manifest(self) -> dict[int, list[int]]:
+        try:
+            raw = json.loads((self.root / MANIFEST).read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+        return {int(event_id): pilots for event_id, pilots in raw.get("event_pilots", {}).items()}
+
+    def _write_manifest(self, event_pilots: dict[int, list[int]]) -> None:
+        data = {"event_pilots": {str(k): v for k, v in sorted(event_pilots.items())}}
+        _write_atomic(self.root / MANIFEST, json.dumps(data).encode())
+
+    # --- страницы ---
+
+    async def _get(self, path: str) -> tuple[int, bytes]:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": self._scheme,
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", self._host.encode())],
+            "server": self._server,
+            "client": ("127.0.0.1", 0),
+        }
+        status = 500
+        body: list[bytes] = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, b"".join(body)
+
+    async def _export(self, paths: Iterable[str], result: ExportResult) -> None:
+        for path in paths:
+            target = page_file(self.root, path)
+            status, body = await self._get(path)
+            if status == 404:
+                result.removed += _remove(target)
+                continue
+            if status != 200:
+                raise RuntimeError(f"{path}: HTTP {status}")
+            try:
+                if target.read_bytes() == body:
+                    result.unchanged += 1
+                    continue
+            except FileNotFoundError:
+                pass
+            _write_atomic(target, body)
+            for encoding in supported_encodings():
+                variant = target.with_name(target.name + ENCODING_SUFFIXES[encoding])
+                _write_atomic(variant, compress(body, encoding))
+            result.written += 1
+
+    @staticmethod
+    def _season_pages(seasons: Iterable[int]) -> list[str]:
+        return [f"/standings/{season}" for season in seasons]
+
+    async def build_all(self) -> ExportResult:
+        """Полная сборка; страницы удалённых событий и пилотов убираются."""
+        async with self._lock:
+            events, pilots, seasons, event_pilots = await run_db(_with_read_session, _load_full)
+            pages = [
+                *LIST_PAGES,
+                *self._season_pages(seasons),
+                *(f"/events/{e}" for e in events),
+                *(f"/pilots/{p}" for p in pilots),
+            ]
+            result = ExportResult()
+            await self._export(pages, result)
+
+            # всё, чего больше нет в базе
+            keep = {page_file(self.root, page) for page in pages}
+            for section in ("events", "pilots", "standings"):
+                for stale in (self.root / section).glob("*/index.html"):
+                    if stale not in keep:
+                        _remove(stale)
+                        shutil.rmtree(stale.parent, ignore_errors=True)
+                        result.removed += 1
+            self._write_manifest(event_pilots)
+            return result
+
+    async def build_event(self, event_id: int) -> ExportResult:
+        """Страница события, его пилоты (прежние и нынешние) и списки."""
+        async with self._lock:
+            manifest = self._read_manifest()
+            seasons, pilots = await run_db(_with_read_session, _load_event, event_id)
+            affected = sorted(set(manifest.get(event_id, ())) | set(pilots))
+            result = ExportResult()
+            await self._export(
+                [
+                    *LIST_PAGES,
+                    *self._season_pages(seasons),
+                    f"/events/{event_id}",
+                    *(f"/pilots/{p}" for p in affected),
+                ],
+                result,
+            )
+            if pilots:
+                manifest[event_id] = pilots
+            else:
+                manifest.pop(event_id, None)
+            self._write_manifest(manifest)
+            return result
+
+    # --- пересборка после записи ---
+
+    def schedule(self, event_id: int | None) -> None:
+        """Ставит пересборку в фон; изменения, пришедшие во время сборки, склеиваются."""
+        self._pending.add(event_id)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while self._pending:
+            pending, self._pending = self._pending, set()
+            try:
+                if None in pending:
+                    result = await self.build_all()
+                else:
+                    result = ExportResult()
+                    for event_id in sorted(pending):
+                        part = await self.build_event(event_id)
+                        result.written += part.written
+                        result.unchanged += part.unchanged
+                        result.removed += part.removed
+                logger.info("static site rebuilt for %s: %s", sorted(pending, key=str), result)
+            except Exception:
+                logger.exception("static site rebuild failed")
+
+
+_exporter: SiteExporter | None = None
+
+
+def attach(app) -> SiteExporter | None:
+    """Включает пересборку после записи, если задан WHOOPMANIA_SITE_EXPORT_DIR."""
+    global _exporter
+    settings = get_settings()
+    if not settings.SITE_EXPORT_DIR:
+        return None
+    _exporter = SiteExporter(app, settings.SITE_EXPORT_DIR, settings.SITE_EXPORT_BASE_URL)
+    return _exporter
+
+
+@changes.on_local_change
+def _rebuild_on_change(event_id: int | None) -> None:
+    if _exporter is not None:
+        _exporter.schedule(event_id)
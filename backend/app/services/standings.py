@@ -0,0 +1,218 @@
+# backend/app/services/standings.py
+
+"""
+Сезонный зачёт.
+
+Сезон — календарный год события; в зачёт идут только гонки (EventType.RACE).
+Очки за событие = очки за место в квалификации + очки за результат в сетке
+(лучший по всем гонкам пилота), по схеме из POINTS_SCHEMES.
+
+Вклады хранятся по событиям (standings_contributions). При переимпорте или
+правке события пересчитывается только оно: новые вклады сравниваются со
+старыми, и в season_standings прибавляется разница.
+"""
+
+from dataclasses import dataclass, field
+from typing import Mapping
+
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..models.bracket import BracketRace, BracketRaceResult
+from ..models.event import Event, EventType
+from ..models.pilot import Pilot
+from ..models.qualification import QualificationResult
+from ..models.standings import SeasonStanding, StandingsContribution
+
+
+@dataclass(frozen=True)
+class PointsScheme:
+    # очки за место в квалификации: qual[rank - 1]
+    qual: tuple[float, ...]
+    # очки за место (final_position) в гонке сетки данной стадии;
+    # за событие берётся лучший результат пилота по всем его гонкам
+    bracket: Mapping[str, tuple[float, ...]] = field(default_factory=dict)
+
+    def qual_points(self, rank: int | None) -> float:
+        if rank is None or rank < 1 or rank > len(self.qual):
+            return 0.0
+        return float(self.qual[rank - 1])
+
+    def bracket_points(self, stage: str, position: int | None) -> float:
+        table = self.bracket.get(stage, ())
+        if position is None or position < 1 or position > len(table):
+            return 0.0
+        return float(table[position - 1])
+
+
+POINTS_SCHEMES: dict[str, PointsScheme] = {
+    # топ-16 квалы: 16..1; в сетке очки дают места, на которых пилот выбывает,
+    # и все места финала
+    "default": PointsScheme(
+        qual=tuple(range(16, 0, -1)),
+        bracket={
+            "final": (40, 32, 26, 22),
+            "semi": (0, 0, 18, 16),
+            "lower_1_4": (0, 0, 13, 12),
+            "lower_1_8": (0, 0, 9, 8),
+            "lower_1_16": (0, 0, 5, 4),
+        },
+    ),
+}
+
+
+def get_scheme() -> PointsScheme:
+    return POINTS_SCHEMES[get_settings().STANDINGS_SCHEME]
+
+
+def _round(value: float) -> float:
+    return round(value, 3)
+
+
+def compute_event_contributions(
+    db: Session,
+    event_id: int,
+    scheme: PointsScheme,
+) -> dict[int, tuple[float, float]]:
+    """pilot_id → (очки за квалу, очки за сетку) для одного события."""
+    result: dict[int, list[float]] = {}
+
+    qual_stmt = select(QualificationResult.pilot_id, func.min(QualificationResult.rank)).where(
+        QualificationResult.event_id == event_id
+    ).group_by(QualificationResult.pilot_id)
+    for pilot_id, rank in db.execute(qual_stmt):
+        result.setdefault(pilot_id, [0.0, 0.0])[0] = scheme.qual_points(rank)
+
+    bracket_stmt = (
+        select(BracketRaceResult.pilot_id, BracketRace.stage, BracketRaceResult.final_position)
+        .join(BracketRace, BracketRaceResult.bracket_race_id == BracketRace.id)
+        .where(
+            BracketRace.event_id == event_id,
+            BracketRaceResult.pilot_id.is_not(None),
+        )
+    )
+    for pilot_id, stage, position in db.execute(bracket_stmt):
+        entry = result.setdefault(pilot_id, [0.0, 0.0])
+        entry[1] = max(entry[1], scheme.bracket_points(stage, position))
+
+    return {pilot_id: (q, b) for pilot_id, (q, b) in result.items()}
+
+
+def recompute_event_standings(db: Session, event_id: int) -> int:
+    """
+    Пересчитывает вклад события в зачёт и применяет разницу к итогам сезона.
+    Коммит — на вызывающем. Возвращает число затронутых строк зачёта.
+    """
+    old_rows = db.execute(
+        select(
+            StandingsContribution.season,
+            StandingsContribution.pilot_id,
+            StandingsContribution.points,
+        ).where(StandingsContribution.event_id == event_id)
+    ).all()
+
+    event = db.get(Event, event_id)
+    new: dict[int, tuple[float, float]] = {}
+    season = None
+    if event is not None and event.event_type == EventType.RACE:
+        season = event.date.year
+        new = compute_event_contributions(db, event_id, get_scheme())
+
+    # (season, pilot_id) → [дельта очков, дельта числа событий]
+    deltas: dict[tuple[int, int], list[float]] = {}
+    for old_season, pilot_id, points in old_rows:
+        d = deltas.setdefault((old_season, pilot_id), [0.0, 0])
+        d[0] -= points
+        d[1] -= 1
+
+    db.execute(
+        delete(StandingsContribution).where(StandingsContribution.event_id == event_id)
+    )
+    if new:
+        rows = []
+        for pilot_id, (qual_points, bracket_points) in new.items():
+            points = _round(qual_points + bracket_points)
+            rows.append(
+                {
+                    "event_id": event_id,
+                    "pilot_id": pilot_id,
+                    "season": season,
+                    "qual_points": qual_points,
+                    "bracket_points": bracket_points,
+                    "points": points,
+                }
+            )
+            d = deltas.setdefault((season, pilot_id), [0.0, 0])
+            d[0] += points
+            d[1] += 1
+        db.execute(insert(StandingsContribution), rows)
+
+    changed = [
+        {"season": s, "pilot_id": p, "points": _round(d[0]), "events": d[1]}
+        for (s, p), d in deltas.items()
+        if d[0] or d[1]
+    ]
+    if changed:
+        stmt = sqlite_insert(SeasonStanding)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SeasonStanding.season, SeasonStanding.pilot_id],
+            set_={
+                "points": func.round(SeasonStanding.points + stmt.excluded.points, 3),
+                "events": SeasonStanding.events + stmt.excluded.events,
+            },
+        )
+        db.execute(stmt, changed)
+        db.execute(
+            delete(SeasonStanding).where(
+                tuple_(SeasonStanding.season, SeasonStanding.pilot_id).in_(
+                    [(row["season"], row["pilot_id"]) for row in changed]
+                ),
+                SeasonStanding.events <= 0,
+            )
+        )
+    return len(changed)
+
+
+def rebuild_standings(db: Session) -> int:
+    """Полный пересчёт (например, после смены схемы очков). Коммит — на вызывающем."""
+    db.execute(delete(StandingsContribution))
+    db.execute(delete(SeasonStanding))
+    event_ids = db.scalars(select(Event.id).order_by(Event.id)).all()
+    for event_id in event_ids:
+        recompute_event_standings(db, event_id)
+    return len(event_ids)
+
+
+# ----------------------------------------------------------------
+# чтение
+# ----------------------------------------------------------------
+
+@dataclass
+class StandingRow:
+    position: int
+    pilot_id: int
+    nickname: str
+    points: float
+    events: int
+
+
+def list_seasons(db: Session) -> list[int]:
+    stmt = select(SeasonStanding.season).distinct().order_by(SeasonStanding.season.desc())
+    return list(db.scalars(stmt))
+
+
+def load_standings(db: Session, season: int) -> list[StandingRow]:
+    """Таблица сезона по убыванию очков; равные очки делят место."""
+    stmt = (
+        select(SeasonStanding.pilot_id, Pilot.nickname, SeasonStanding.points, SeasonStanding.events)
+        .join(Pilot, Pilot.id == SeasonStanding.pilot_id)
+        .where(SeasonStanding.season == season)
+        .order_by(SeasonStanding.points.desc(), Pilot.nickname.asc())
+    )
+    rows: list[StandingRow] = []
+    for index, (pilot_id, nickname, points, events) in enumerate(db.execute(stmt), start=1):
+        position = rows[-1].position if rows and rows[-1].points == points else index
+        rows.append(StandingRow(position, pilot_id, nickname, points, events))
+    return rows
@@ -0,0 +1,15 @@
+# backend/bench/__init__.py
+
+"""
+Нагрузочный прогон публичных страниц и импорта RH с бюджетом SQL-запросов.
+
+    python -m backend.bench                       # синтетическая БД по умолчанию
+    python -m backend.bench --events 50 --pilots 2000 --qual-rows 96 -n 200 -c 8
+    python -m backend.bench --db /tmp/bench.db --keep   # оставить сгенерированную БД
+
+Генерирует SQLite-базу (события, пилоты, квалификация, полные сетки),
+прогоняет роуты через ASGI-приложение в процессе — без HTTP-клиента и
+сервера — и печатает p50/p99, пропускную способность и число SQL на
+запрос. Код возврата 1, если какой-то роут превысил свой бюджет запросов
+(N+1) или ответил ошибкой.
+"""
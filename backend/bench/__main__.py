@@ -0,0 +1,81 @@
+# backend/bench/__main__.py
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.bench")
+    parser.add_argument("--events", type=int, default=12)
+    parser.add_argument("--pilots", type=int, default=400)
+    parser.add_argument("--qual-rows", type=int, default=64, help="строк квалификации на событие")
+    parser.add_argument("--bracket-size", type=int, default=16, help="8/16/32, 0 — без сеток")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-n", "--requests", type=int, default=100, help="запросов на роут")
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("--warm", action="store_true", help="не сбрасывать кэш страниц между запросами")
+    parser.add_argument("--only", action="append", help="прогнать только этот роут (можно несколько)")
+    parser.add_argument("--db", help="путь к файлу синтетической БД (по умолчанию — временный)")
+    parser.add_argument("--keep", action="store_true", help="не удалять временную БД после прогона")
+    args = parser.parse_args(argv)
+
+    tmpdir = None
+    if args.db:
+        db_path = Path(args.db)
+    else:
+        tmpdir = tempfile.mkdtemp(prefix="whoopmania-bench-")
+        db_path = Path(tmpdir) / "bench.db"
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    # настройки читаются при импорте приложения — URL выставляем до него
+    os.environ["WHOOPMANIA_DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from ..app import migrations
+    from ..app.db import SessionLocal, engine, read_engine
+    from . import runner
+    from .synth import SynthConfig, generate
+
+    started = time.perf_counter()
+    migrations.upgrade(engine)
+    config = SynthConfig(
+        events=args.events,
+        pilots=args.pilots,
+        qual_rows=args.qual_rows,
+        bracket_size=args.bracket_size,
+        seed=args.seed,
+    )
+    with SessionLocal() as db:
+        fixture = generate(db, config)
+    print(
+        f"synthetic db {db_path}: {config.events} events, {config.pilots} pilots, "
+        f"{config.qual_rows} qual rows/event, bracket {config.bracket_size or '—'} "
+        f"({time.perf_counter() - started:.1f}s)"
+    )
+
+    results, failed = asyncio.run(
+        runner.run(
+            fixture,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            warm=args.warm,
+            only=set(args.only) if args.only else None,
+        )
+    )
+    print(runner.report(results, args.warm))
+
+    engine.dispose()
+    read_engine.dispose()
+    if tmpdir is not None and not args.keep:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+# backend/bench/runner.py
+
+"""Прогон роутов: задержки, пропускная способность, SQL на запрос, бюджеты."""
+
+import asyncio
+import contextvars
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event as sa_event
+
+from ..app import db as app_db
+from ..app.core.page_cache import page_cache
+from ..app.services.import_jobs import jobs
+from . import asgi
+from .synth import Fixture
+
+# счётчик SQL текущего запроса; anyio переносит контекст в поток run_db
+_statements: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    "bench_statements", default=None
+)
+
+
+def _count_statement(*args: Any, **kwargs: Any) -> None:
+    counter = _statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def install_statement_counter() -> None:
+    for engine in (app_db.engine, app_db.read_engine):
+        sa_event.listen(engine, "before_cursor_execute", _count_statement)
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    method: str
+    # i-я итерация → (путь, query, тело)
+    make: Callable[[Fixture, int], tuple[str, dict, bytes]]
+    # максимум SQL-запросов на один запрос при холодном кэше страниц
+    budget: int
+    # что доделать после ответа в том же замере (фоновая задача импорта)
+    follow_up: Callable[[asgi.Response], Awaitable[None]] | None = None
+
+
+def _get(path: Callable[[Fixture, int], str], query: dict | None = None):
+    return lambda fx, i: (path(fx, i), query or {}, b"")
+
+
+def _pick(items: list, i: int):
+    return items[i % len(items)]
+
+
+def _rh_payload(fx: Fixture, i: int) -> tuple[str, dict, bytes]:
+    event_id = _pick(fx.event_ids, i)
+    start = (i * 7) % max(len(fx.nicknames) - 64, 1)
+    rows = [
+        {
+            "callsign": nickname,
+            "position": rank,
+            "consecutives_raw": 45000 + rank * 50,
+            "fastest_lap_raw": 14000 + rank * 20,
+            "laps": 30,
+            "starts": 5,
+            "consecutives_base": 3,
+        }
+        for rank, nickname in enumerate(fx.nicknames[start:start + 64], start=1)
+    ]
+    body = json.dumps({"event_leaderboard": {"by_consecutives": rows}}).encode()
+    return f"/qual/import_rh/{event_id}", {}, body
+
+
+async def _run_import_job(response: asgi.Response) -> None:
+    # роут только ставит задачу; замер включает и сам импорт
+    if response.status == 202:
+        await jobs.process(json.loads(response.body)["job_id"])
+
+
+CASES = [
+    Case("index", "GET", _get(lambda fx, i: "/"), budget=1),
+    Case("events_list", "GET", _get(lambda fx, i: "/events"), budget=1),
+    Case(
+        "event_detail",
+        "GET",
+        _get(lambda fx, i: f"/events/{_pick(fx.bracket_event_ids or fx.event_ids, i)}"),
+        # 4 + аналитика кругов, если её нет в кэше (services.lap_analytics)
+        budget=6,
+    ),
+    Case("pilots_list", "GET", _get(lambda fx, i: "/pilots"), budget=1),
+    Case(
+        "pilots_list_search",
+        "GET",
+        _get(lambda fx, i: "/pilots", {"q": "Pilot 00", "sort": "best_rank"}),
+        budget=1,
+    ),
+    # 3 + события пилота и их аналитика кругов при промахе её кэша
+    Case("pilot_detail", "GET", _get(lambda fx, i: f"/pilots/{_pick(fx.pilot_ids, i * 13)}"), budget=6),
+    Case("standings", "GET", _get(lambda fx, i: "/standings"), budget=2),
+    # пишет в базу — идёт последним
+    # 20 на импорт + строка задачи: создание, захват, смена статуса
+    Case("import_rh_qualification", "POST", _rh_payload, budget=26, follow_up=_run_import_job),
+]
+
+
+@dataclass
+class CaseResult:
+    case: Case
+    latencies_ms: list[float] = field(default_factory=list)
+    statements: list[int] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    wall_s: float = 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies_ms) / self.wall_s if self.wall_s else 0.0
+
+    @property
+    def max_statements(self) -> int:
+        return max(self.statements, default=0)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.max_statements > self.case.budget
+
+
+async def _one(app: Any, case: Case, fx: Fixture, i: int, warm: bool, result: CaseResult) -> None:
+    path, query, body = case.make(fx, i)
+    headers = {"content-type": "application/json"} if body else {}
+    if not warm:
+        page_cache.invalidate()
+
+    counter = [0]
+    token = _statements.set(counter)
+    started = time.perf_counter()
+    try:
+        response = await asgi.request(app, case.method, path, query=query, body=body, headers=headers)
+        if case.follow_up is not None:
+            await case.follow_up(response)
+    finally:
+        _statements.reset(token)
+    result.latencies_ms.append((time.perf_counter() - started) * 1000)
+    result.statements.append(counter[0])
+    if response.status >= 400:
+        result.errors.append(f"{case.method} {path} → {response.status}")
+
+
+async def run_case(
+    app: Any,
+    case: Case,
+    fx: Fixture,
+    requests: int,
+    concurrency: int,
+    warm: bool,
+) -> CaseResult:
+    result = CaseResult(case)
+    # прогрев: первый запрос компилирует шаблоны и открывает соединения
+    await _one(app, case, fx, 0, warm, CaseResult(case))
+
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+
+    async def worker() -> None:
+        while not queue.empty():
+            await _one(app, case, fx, queue.get_nowait(), warm, result)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.wall_s = time.perf_counter() - started
+    return result
+
+
+def report(results: list[CaseResult], warm: bool) -> str:
+    title = "warm page cache" if warm else "cold page cache"
+    lines = [
+        f"{'route':<26}{'p50 ms':>9}{'p99 ms':>9}{'req/s':>9}{'sql/req':>9}{'budget':>8}  status  ({title})"
+    ]
+    for r in results:
+        status = "ok"
+        if r.errors:
+            status = "ERROR"
+        elif r.over_budget and not warm:
+            status = "OVER BUDGET"
+        lines.append(
+            f"{r.case.name:<26}{r.percentile(0.5):>9.2f}{r.percentile(0.99):>9.2f}"
+            f"{r.throughput:>9.1f}{r.max_statements:>9}{r.case.budget:>8}  {status}"
+        )
+        for error in r.errors[:3]:
+            lines.append(f"    !! {error}")
+    return "\n".join(lines)
+
+
+async def run(
+    fx: Fixture,
+    requests: int,
+    concurrency: int,
+    warm: bool,
+    only: set[str] | None = None,
+) -> tuple[list[CaseResult], bool]:
+    from ..app.main import app
+
+    install_statement_counter()
+    results = []
+    for case in CASES:
+        if only and case.name not in only:
+            continue
+        results.append(await run_case(app, case, fx, requests, concurrency, warm))
+
+    failed = any(r.errors or (r.over_budget and not warm) for r in results)
+    return results, failed
@@ -0,0 +1,122 @@
+# backend/bench/synth.py
+
+"""Синтетическая база для бенчмарка: события, пилоты, квалификация, сетки."""
+
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from ..app.models.event import Event, EventType
+from ..app.models.pilot import Pilot
+from ..app.models.qualification import QualificationResult
+from ..app.services import bracket
+from ..app.services.pilot_stats import refresh_pilot_stats
+from ..app.services.standings import rebuild_standings
+
+FIRST_DATE = date(2024, 1, 13)
+
+
+@dataclass(frozen=True)
+class SynthConfig:
+    events: int = 12
+    pilots: int = 400
+    qual_rows: int = 64
+    # 0 — без сеток; иначе размер из bracket.BRACKET_FORMATS
+    bracket_size: int = 16
+    seed: int = 1
+
+
+@dataclass
+class Fixture:
+    """Id, по которым бенчмарк ходит в роуты."""
+    event_ids: list[int]
+    bracket_event_ids: list[int]
+    pilot_ids: list[int]
+    nicknames: list[str]
+
+
+def _play_bracket(rng: random.Random, races: list) -> None:
+    """Разыгрывает сетку: в каждом вылете случайная расстановка 3/2/1/0."""
+    specs = {spec.number: spec for spec in bracket.format_for(len(races))}
+    for race in races:
+        previous = bracket.placements(races)
+        entries = [r for r in race.results if r.pilot_id is not None]
+        for field in bracket.HEAT_FIELDS[: specs[race.number].heats]:
+            points = [3, 2, 1, 0][: len(entries)]
+            rng.shuffle(points)
+            for r, p in zip(entries, points):
+                setattr(r, field, p)
+        bracket.advance(races, {race.number}, previous)
+
+
+def generate(db: Session, config: SynthConfig) -> Fixture:
+    """Заполняет пустую базу (схема уже создана миграциями) и коммитит."""
+    rng = random.Random(config.seed)
+    now = datetime.utcnow()
+
+    db.execute(
+        insert(Pilot),
+        [
+            {"nickname": f"Pilot {i:05d}", "city": rng.choice(["Москва", "Казань", "Тверь"]), "created_at": now}
+            for i in range(1, config.pilots + 1)
+        ],
+    )
+    pilot_ids = list(db.scalars(select(Pilot.id).order_by(Pilot.id)))
+
+    db.execute(
+        insert(Event),
+        [
+            {
+                "name": f"Bench #{i}",
+                "event_type": EventType.RACE,
+                "date": FIRST_DATE + timedelta(days=14 * i),
+                "location": "Bench Arena",
+            }
+            for i in range(config.events)
+        ],
+    )
+    event_ids = list(db.scalars(select(Event.id).order_by(Event.id)))
+
+    rows_per_event = min(config.qual_rows, len(pilot_ids))
+    for event_id in event_ids:
+        entrants = rng.sample(pilot_ids, rows_per_event)
+        db.execute(
+            insert(QualificationResult),
+            [
+                {
+                    "event_id": event_id,
+                    "pilot_id": pilot_id,
+                    "rank": rank,
+                    "best_lap_ms": 14000 + rank * 23 + rng.randint(0, 400),
+                    "best3_avg_ms": 45000 + rank * 61 + rng.randint(0, 900),
+                    "laps_total": rng.randint(10, 40),
+                    "attempts_count": rng.randint(2, 6),
+                    "consecutives_count": 3 if rank <= rows_per_event * 3 // 4 else rng.randint(0, 2),
+                }
+                for rank, pilot_id in enumerate(entrants, start=1)
+            ],
+        )
+
+    bracket_event_ids = []
+    if config.bracket_size:
+        for event_id in event_ids:
+            bracket.create_bracket(db, event_id, config.bracket_size)
+            db.flush()
+            _play_bracket(rng, bracket.load_bracket(db, event_id))
+            bracket_event_ids.append(event_id)
+        db.flush()
+
+    refresh_pilot_stats(db, pilot_ids)
+    rebuild_standings(db)
+    db.commit()
+
+    nicknames = list(db.scalars(select(Pilot.nickname).order_by(Pilot.id)))
+    return Fixture(
+        event_ids=event_ids,
+        bracket_event_ids=bracket_event_ids,
+        pilot_ids=pilot_ids,
+        nicknames=nicknames,
+    )
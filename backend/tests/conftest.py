@@ -0,0 +1,23 @@
+# backend/tests/conftest.py
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app import migrations, models  # noqa: F401  # все модели
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Отдельная база в tmp со схемой из миграций, рабочая не трогается."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    migrations.upgrade(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
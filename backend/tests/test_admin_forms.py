@@ -0,0 +1,18 @@
+# backend/tests/test_admin_forms.py
+
+from backend.app.api.routes.admin import _parse_bracket_form
+
+
+def test_parse_bracket_form():
+    form = {
+        "br_7_nickname": " Ёж ",
+        "br_7_r1": "3",
+        "br_8_r2": "",
+        "csrf": "x",
+    }
+    assert _parse_bracket_form(form) == {7: {"nickname": "Ёж", "r1": "3"}, 8: {"r2": ""}}
+
+
+def test_parse_bracket_form_skips_malformed_keys():
+    form = {"br_5": "x", "br_": "x", "br_5_": "x", "br_x_r1": "1", "br_7_r1": "2"}
+    assert _parse_bracket_form(form) == {7: {"r1": "2"}}
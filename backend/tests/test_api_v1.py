@@ -0,0 +1,46 @@
+# backend/tests/test_api_v1.py
+
+from datetime import date
+
+from backend.app.api.routes import api_v1
+from backend.app.models.event import Event
+from backend.app.models.pilot import Pilot
+from backend.app.models.qualification import QualificationResult
+
+
+def _pages(db, pilot_id, limit):
+    items, after = [], None
+    while True:
+        page, after = api_v1._list_pilot_events(db, pilot_id, after, limit)
+        assert len(page) <= limit
+        items.extend(page)
+        if after is None:
+            return items
+
+
+def test_pilot_events_keyset_pages(db):
+    pilot, other = Pilot(nickname="ёж"), Pilot(nickname="ворон")
+    # два события в один день: порядок всё равно строгий
+    days = [date(2025, 1, 5), date(2025, 3, 1), date(2025, 3, 1), date(2025, 2, 9), date(2024, 12, 1)]
+    events = [Event(name=f"Этап {i}", date=day) for i, day in enumerate(days)]
+    db.add_all([pilot, other, *events])
+    db.flush()
+    db.add_all(
+        QualificationResult(event_id=event.id, pilot_id=pilot.id, rank=i + 1)
+        for i, event in enumerate(events)
+    )
+    db.add(QualificationResult(event_id=events[0].id, pilot_id=other.id, rank=9))
+    db.commit()
+
+    expected = [(e.date, e.id) for e in sorted(events, key=lambda e: (e.date, e.id), reverse=True)]
+    for limit in (1, 2, 3, 5, 50):
+        items = _pages(db, pilot.id, limit)
+        assert [(p["event"].date, p["event"].id) for p in items] == expected
+        assert {p["qual"].pilot_id for p in items} == {pilot.id}
+
+    first, after = api_v1._list_pilot_events(db, pilot.id, None, 5)
+    assert after is None and len(first) == 5
+    # битый курсор — первая страница
+    assert api_v1._list_pilot_events(db, pilot.id, "не-курсор", 2)[0] == first[:2]
+    assert api_v1._list_pilot_events(db, other.id, None, 5)[0][0]["event"].id == events[0].id
+    assert api_v1._list_pilot_events(db, other.id + 100, None, 5) is None
@@ -0,0 +1,266 @@
+# backend/tests/test_bracket.py
+
+from collections import Counter
+from datetime import date
+
+import pytest
+
+from backend.app import models  # noqa: F401  # все мапперы для relationship
+from backend.app.models.bracket import BracketRace, BracketRaceResult
+from backend.app.models.event import Event
+from backend.app.models.pilot import Pilot
+from backend.app.models.qualification import QualificationResult
+from backend.app.services import bracket
+from backend.app.services.bracket import BRACKET_FORMATS, Place, Seed
+
+SIZES = sorted(BRACKET_FORMATS)
+
+
+def test_formats():
+    assert SIZES == [8, 16, 32]
+    assert bracket.DEFAULT_FORMAT in BRACKET_FORMATS
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_races_are_numbered_and_full(size):
+    specs = BRACKET_FORMATS[size]
+    # двойное выбывание: гонок на две меньше, чем пилотов
+    assert len(specs) == size - 2
+    assert [spec.number for spec in specs] == list(range(1, len(specs) + 1))
+    assert all(len(spec.feeds) == bracket.SLOTS for spec in specs)
+    assert all(spec.heats <= len(bracket.HEAT_FIELDS) for spec in specs)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_every_qualifier_is_seeded_once(size):
+    seeds = [feed.rank for spec in BRACKET_FORMATS[size] for feed in spec.feeds if isinstance(feed, Seed)]
+    assert sorted(seeds) == list(range(1, size + 1))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_places_flow_forward_and_are_used_once(size):
+    specs = BRACKET_FORMATS[size]
+    by_number = {spec.number: spec for spec in specs}
+    used = Counter(
+        (feed.race, feed.position)
+        for spec in specs
+        for feed in spec.feeds
+        if isinstance(feed, Place) and feed.race < spec.number
+    )
+    places = [feed for spec in specs for feed in spec.feeds if isinstance(feed, Place)]
+    # ссылки только на более ранние гонки и только на места 1..4
+    assert sum(used.values()) == len(places)
+    assert all(1 <= place.position <= bracket.SLOTS for place in places)
+    assert max(used.values()) == 1
+
+    for spec in specs:
+        consumed = {pos for (race, pos) in used if race == spec.number}
+        if spec.stage == "final":
+            assert consumed == set()
+        elif spec.bracket_side == "upper":
+            # из верхней сетки проигравшие уходят в нижнюю
+            assert consumed == {1, 2, 3, 4}
+        else:
+            # из нижней (и полуфинала) 3 и 4 места выбывают
+            assert consumed == {1, 2}
+    assert by_number[len(specs)].stage == "final"
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_single_final_with_five_heats(size):
+    specs = BRACKET_FORMATS[size]
+    finals = [spec for spec in specs if spec.stage == "final"]
+    assert [spec.number for spec in finals] == [len(specs)]
+    assert finals[0].heats == 5 and finals[0].bracket_side == "final"
+    assert all(spec.heats == 3 for spec in specs if spec.stage != "final")
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_size_from_race_count(size):
+    count = len(BRACKET_FORMATS[size])
+    assert bracket.size_for(count) == size
+    assert bracket.format_for(count) is BRACKET_FORMATS[size]
+
+
+def test_unknown_race_count():
+    assert bracket.size_for(5) is None
+    assert bracket.format_for(5) is None
+
+
+# ----------------------------------------------------------------
+# места в гонке
+# ----------------------------------------------------------------
+
+def _race(*heats_by_slot):
+    race = BracketRace(number=1, stage="upper_1_8", short_label="1/8", bracket_side="upper")
+    for slot, heats in enumerate(heats_by_slot, start=1):
+        fields = dict(zip(bracket.HEAT_FIELDS, heats))
+        race.results.append(BracketRaceResult(slot_index=slot, pilot_id=100 + slot, **fields))
+    return race
+
+
+def test_place_race_by_total_then_last_heat_then_slot():
+    race = _race((3, 0, 1), (2, 1, 3), (1, 3, 2), (0, 2, 0))
+    # 4, 6, 6, 2: у 2 и 3 равенство, в третьем вылете 3 > 2
+    assert bracket.place_race(race) == {1: 102, 2: 103, 3: 101, 4: 104}
+    assert [r.total_points for r in race.results] == [4.0, 6.0, 6.0, 2.0]
+
+
+def test_place_race_tie_break_uses_a_heat_everyone_rode():
+    # у слота 1 есть четвёртый вылет, у остальных — нет: сравнивается третий
+    race = _race((3, 0, 0, 3), (0, 3, 3), (1, 1, 1), (0, 0, 2))
+    assert bracket.place_race(race) == {1: 102, 2: 101, 3: 103, 4: 104}
+
+
+def test_place_race_equal_heats_fall_back_to_slot():
+    race = _race((2, 1), (2, 1), (0, 0), (0, 0))
+    assert bracket.place_race(race) == {1: 101, 2: 102, 3: 103, 4: 104}
+
+
+def test_place_race_waits_for_everyone():
+    race = _race((3, 2), (2, 3), (1,), (None,))
+    assert bracket.place_race(race) == {}
+    assert all(r.final_position is None for r in race.results)
+
+
+# ----------------------------------------------------------------
+# продвижение по сетке
+# ----------------------------------------------------------------
+
+@pytest.fixture
+def bracket8(db):
+    """Событие, 8 пилотов с местами 1..8 в квалификации и сетка на 8."""
+    event = Event(name="Этап", date=date(2025, 5, 1))
+    pilots = [Pilot(nickname=f"seed{rank}") for rank in range(1, 9)]
+    db.add_all([event, *pilots])
+    db.flush()
+    db.add_all(
+        QualificationResult(event_id=event.id, pilot_id=pilot.id, rank=rank)
+        for rank, pilot in enumerate(pilots, start=1)
+    )
+    db.flush()
+    bracket.create_bracket(db, event.id, 8)
+    db.commit()
+    seed = {rank: pilot.id for rank, pilot in enumerate(pilots, start=1)}
+    return event.id, seed
+
+
+def _slots(race):
+    return {r.slot_index: r.pilot_id for r in race.results}
+
+
+def _score(race, *finish):
+    """Пилоты finish приезжают в этом порядке во всех трёх вылетах."""
+    points = {pilot_id: 3 - place for place, pilot_id in enumerate(finish)}
+    for r in race.results:
+        for f in bracket.HEAT_FIELDS[:3]:
+            setattr(r, f, points.get(r.pilot_id))
+
+
+def _advance(db, event_id, edit):
+    races = bracket.load_bracket(db, event_id)
+    previous = bracket.placements(races)
+    numbers = edit({race.number: race for race in races})
+    touched = bracket.advance(races, numbers, previous)
+    db.commit()
+    return {race.number: race for race in bracket.load_bracket(db, event_id)}, touched
+
+
+def test_create_bracket_seeds_first_races(db, bracket8):
+    event_id, seed = bracket8
+    races = {race.number: race for race in bracket.load_bracket(db, event_id)}
+    assert len(races) == 6
+    assert _slots(races[1]) == {1: seed[1], 2: seed[4], 3: seed[5], 4: seed[8]}
+    assert _slots(races[2]) == {1: seed[2], 2: seed[3], 3: seed[6], 4: seed[7]}
+    assert set(_slots(races[4]).values()) == {None}
+
+
+def test_advance_fills_upper_and_lower_races(db, bracket8):
+    event_id, seed = bracket8
+
+    def play_first(races):
+        _score(races[1], seed[4], seed[1], seed[8], seed[5])
+        _score(races[2], seed[2], seed[3], seed[6], seed[7])
+        return {1, 2}
+
+    races, touched = _advance(db, event_id, play_first)
+    assert {r.slot_index: r.final_position for r in races[1].results} == {1: 2, 2: 1, 3: 4, 4: 3}
+    # 1/4 верхней: первые двое обеих гонок; нижняя 1/8: последние двое
+    assert _slots(races[4]) == {1: seed[4], 2: seed[1], 3: seed[2], 4: seed[3]}
+    assert _slots(races[3]) == {1: seed[8], 2: seed[5], 3: seed[6], 4: seed[7]}
+    assert set(_slots(races[5]).values()) == {None}
+    assert touched == {1, 2, 3, 4}
+
+    def play_rest(races):
+        _score(races[3], seed[6], seed[8], seed[5], seed[7])
+        _score(races[4], seed[1], seed[2], seed[4], seed[3])
+        return {3, 4}
+
+    races, _ = _advance(db, event_id, play_rest)
+    # полуфинал: двое из нижней и двое проигравших 1/4; финал: двое из 1/4
+    assert _slots(races[5]) == {1: seed[6], 2: seed[8], 3: seed[4], 4: seed[3]}
+    assert _slots(races[6]) == {1: seed[1], 2: seed[2], 3: None, 4: None}
+
+
+def test_changed_result_resets_the_chain(db, bracket8):
+    event_id, seed = bracket8
+
+    def play(races):
+        _score(races[1], seed[1], seed[4], seed[5], seed[8])
+        _score(races[2], seed[2], seed[3], seed[6], seed[7])
+        return {1, 2}
+
+    def play_quarter(races):
+        _score(races[4], seed[1], seed[2], seed[4], seed[3])
+        return {4}
+
+    _advance(db, event_id, play)
+    races, _ = _advance(db, event_id, play_quarter)
+    assert _slots(races[6])[1] == seed[1]
+
+    def replay_first(races):
+        _score(races[1], seed[5], seed[4], seed[1], seed[8])
+        return {1}
+
+    races, touched = _advance(db, event_id, replay_first)
+    # в 1/4 другой состав: её результаты сброшены, финал и полуфинал — следом
+    assert _slots(races[4]) == {1: seed[5], 2: seed[4], 3: seed[2], 4: seed[3]}
+    assert all(r.points_r1 is None and r.final_position is None for r in races[4].results)
+    assert _slots(races[3]) == {1: seed[1], 2: seed[8], 3: seed[6], 4: seed[7]}
+    assert _slots(races[6]) == {1: None, 2: None, 3: None, 4: None}
+    assert _slots(races[5])[3] is None and _slots(races[5])[4] is None
+    assert {1, 3, 4, 5, 6} <= touched
+
+
+def test_manually_edited_race_is_left_alone(db, bracket8):
+    event_id, seed = bracket8
+    races = {race.number: race for race in bracket.load_bracket(db, event_id)}
+    # организатор сам посадил пилота в 1/4 до конца первой гонки
+    next(r for r in races[4].results if r.slot_index == 1).pilot_id = seed[7]
+    db.commit()
+
+    def play_first(races):
+        _score(races[1], seed[1], seed[4], seed[5], seed[8])
+        return {1}
+
+    races, touched = _advance(db, event_id, play_first)
+    assert _slots(races[4]) == {1: seed[7], 2: None, 3: None, 4: None}
+    assert _slots(races[3])[1] == seed[5]
+    assert 4 not in touched
+
+
+def test_bracket_not_from_tables_is_only_placed():
+    # сетка, созданная до движка: гонок столько, сколько нет ни в одном формате
+    races = []
+    for number in range(1, 4):
+        race = BracketRace(number=number, stage="upper_1_8", short_label="1/8", bracket_side="upper")
+        for slot in range(1, 5):
+            race.results.append(BracketRaceResult(slot_index=slot, pilot_id=10 * number + slot))
+        races.append(race)
+    _score(races[0], 14, 13, 12, 11)
+
+    touched = bracket.advance(races, {1}, {})
+    assert touched == {1}
+    assert {r.pilot_id: r.final_position for r in races[0].results} == {14: 1, 13: 2, 12: 3, 11: 4}
+    assert [r.pilot_id for r in races[1].results] == [21, 22, 23, 24]
+    assert all(r.final_position is None for r in races[1].results)
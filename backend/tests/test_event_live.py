@@ -0,0 +1,83 @@
+# backend/tests/test_event_live.py
+
+from datetime import date
+
+from backend.app.models.event import EventType
+from backend.app.services.event_live import diff, snapshot
+from backend.app.services.event_page import EventInfo, EventPage, QualRow, RaceResultRow, RaceView
+
+
+def qual(qual_id, pilot_id, rank, laps_total=10):
+    return QualRow(
+        id=qual_id, rank=rank, pilot_id=pilot_id, nickname=f"p{pilot_id}", top16=rank <= 16,
+        best3="0:40.000", bestlap="0:13.000", laps=str(laps_total), attempts="3",
+        best3_ms=40_000, consec=3, rh_position=rank, bestlap_ms=13_000,
+        laps_total=laps_total, attempts_count=3,
+    )
+
+
+def result(result_id, pilot_id, pos="—"):
+    return RaceResultRow(
+        id=result_id, pilot_id=pilot_id, nickname=f"p{pilot_id}", heats=("—",) * 3, total="—",
+        pos=pos, slot_index=1, points=(None,) * 3, total_points=None, final_position=None,
+    )
+
+
+def race(race_id, results):
+    return RaceView(
+        id=race_id, number=race_id, name=f"Race {race_id}", short_label="1/8", stage="upper_1_8",
+        bracket_side="upper", side_label="Верхняя сетка", heat_count=3, results=results,
+    )
+
+
+def page(qualification, races):
+    info = EventInfo(
+        id=1, name="Event", event_type=EventType.RACE, date=date(2025, 1, 1),
+        location=None, description=None, poster=None,
+    )
+    return EventPage(event=info, qualification=qualification, races=races)
+
+
+def test_snapshot_keys_qualification_by_pilot():
+    state = snapshot(page([qual(101, 7, 1), qual(102, 9, 2)], [race(1, [result(11, 7), result(12, 9)])]))
+    assert state["races"] == [1]
+    assert set(state["qual"]) == {"7", "9"}
+    assert "id" not in state["qual"]["7"]
+    assert state["results"]["12"]["order"] == 1
+    assert state["results"]["12"]["race_id"] == 1
+
+
+def test_reimport_with_new_row_ids_is_no_change():
+    races = [race(1, [result(11, 7)])]
+    old = snapshot(page([qual(101, 7, 1), qual(102, 9, 2)], races))
+    new = snapshot(page([qual(201, 7, 1), qual(202, 9, 2)], races))
+    assert diff(old, new) == {"reload": False, "qual": {}, "results": {}}
+
+
+def test_diff_sends_changed_rows_whole_and_removed_as_none():
+    races = [race(1, [result(11, 7), result(12, 9)])]
+    old = snapshot(page([qual(101, 7, 1), qual(102, 9, 2), qual(103, 5, 3)], races))
+    new = snapshot(
+        page(
+            [qual(101, 9, 1), qual(102, 7, 2, laps_total=12), qual(104, 6, 3)],
+            [race(1, [result(12, 9, pos="1"), result(11, 7, pos="2")])],
+        )
+    )
+    changes = diff(old, new)
+    assert changes["reload"] is False
+    assert changes["qual"] == {
+        "9": new["qual"]["9"],
+        "7": new["qual"]["7"],
+        "6": new["qual"]["6"],
+        "5": None,
+    }
+    assert changes["qual"]["7"]["laps_total"] == 12
+    assert changes["results"] == {"11": new["results"]["11"], "12": new["results"]["12"]}
+    assert changes["results"]["12"]["order"] == 0
+
+
+def test_diff_asks_for_reload_when_races_change():
+    old = snapshot(page([], [race(1, [])]))
+    new = snapshot(page([], [race(1, []), race(2, [])]))
+    assert diff(old, new)["reload"] is True
+    assert diff(new, snapshot(page([], [])))["reload"] is True
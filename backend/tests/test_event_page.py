@@ -0,0 +1,40 @@
+# backend/tests/test_event_page.py
+
+from datetime import date
+
+from backend.app.models.event import Event
+from backend.app.models.pilot import Pilot
+from backend.app.models.qualification import QualificationResult
+from backend.app.services import bracket, event_page
+
+
+def test_load_event_page(db):
+    event = Event(name="Этап", date=date(2025, 5, 1))
+    pilots = [Pilot(nickname=f"seed{rank}") for rank in range(1, 10)]
+    db.add_all([event, *pilots])
+    db.flush()
+    db.add_all(
+        QualificationResult(event_id=event.id, pilot_id=pilot.id, rank=rank)
+        for rank, pilot in enumerate(pilots[:8], start=1)
+    )
+    # без места в квалификации на странице не показывается
+    db.add(QualificationResult(event_id=event.id, pilot_id=pilots[8].id, rank=None))
+    db.flush()
+    bracket.create_bracket(db, event.id, 8)
+    db.commit()
+
+    page = event_page.load_event_page(db, event.id, with_analytics=False)
+    assert [row.rank for row in page.qualification] == list(range(1, 9))
+
+    races = bracket.load_bracket(db, event.id)
+    assert [race.number for race in page.races] == sorted(race.number for race in races)
+    for view, race in zip(page.races, sorted(races, key=lambda r: r.number)):
+        assert view.id == race.id
+        assert sorted(row.slot_index for row in view.results) == sorted(
+            r.slot_index for r in race.results
+        )
+    first = page.races[0]
+    assert {row.nickname for row in first.results} <= {p.nickname for p in pilots[:8]}
+    assert len(first.results) == 4
+
+    assert event_page.load_event_page(db, event.id + 1) is None
@@ -0,0 +1,101 @@
+# backend/tests/test_import_jobs.py
+
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models.event import Event
+from backend.app.models.import_job import ImportJob
+from backend.app.services import import_jobs
+from backend.app.services.import_jobs import FAILED, IMPORTING, PARSING, QUEUED
+
+
+@pytest.fixture
+def event_id(db):
+    event = Event(name="Этап", date=date(2025, 5, 1))
+    db.add(event)
+    db.commit()
+    return event.id
+
+
+def _job(db, event_id, status, started, heartbeat, attempts=1):
+    job = ImportJob(
+        kind=import_jobs.KIND_RH_QUALIFICATION,
+        event_id=event_id,
+        status=status,
+        payload=f"{status}-{attempts}.json",
+        started_at=started,
+        heartbeat_at=heartbeat,
+        attempts=attempts,
+    )
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def test_recover_uses_heartbeat_not_start_time(db, event_id):
+    now = datetime.utcnow()
+    long_ago = now - timedelta(seconds=import_jobs.settings.IMPORT_STALE_SECONDS * 3)
+    stale = long_ago + timedelta(seconds=1)
+    running = _job(db, event_id, PARSING, long_ago, now)  # давно начат, но жив
+    abandoned = _job(db, event_id, IMPORTING, long_ago, stale)
+    exhausted = _job(
+        db, event_id, PARSING, long_ago, stale, attempts=import_jobs.settings.IMPORT_MAX_ATTEMPTS
+    )
+
+    failed = import_jobs.recover_stale_jobs(db)
+
+    db.expire_all()
+    assert db.get(ImportJob, running).status == PARSING
+    requeued = db.get(ImportJob, abandoned)
+    assert (requeued.status, requeued.started_at, requeued.heartbeat_at) == (QUEUED, None, None)
+    assert db.get(ImportJob, exhausted).status == FAILED
+    assert failed == [db.get(ImportJob, exhausted).payload]
+
+
+def test_beat_only_touches_active_jobs(db, event_id):
+    old = datetime.utcnow() - timedelta(hours=1)
+    active = _job(db, event_id, IMPORTING, old, old)
+    finished = _job(db, event_id, FAILED, old, old)
+    import_jobs._beat(db, active)
+    import_jobs._beat(db, finished)
+    db.expire_all()
+    assert db.get(ImportJob, active).heartbeat_at > old
+    assert db.get(ImportJob, finished).heartbeat_at == old
+
+
+def test_long_parse_keeps_job_alive(db, engine, event_id, tmp_path, monkeypatch):
+    monkeypatch.setattr(import_jobs, "SessionLocal", sessionmaker(autoflush=False, bind=engine))
+    monkeypatch.setattr(import_jobs.settings, "IMPORT_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(import_jobs.settings, "IMPORT_HEARTBEAT_SECONDS", 0.05)
+    monkeypatch.setattr(import_jobs.settings, "IMPORT_STALE_SECONDS", 0.3)
+    monkeypatch.setattr(import_jobs.changes, "notify", lambda event_id: asyncio.sleep(0))
+    (tmp_path / "big.json").write_text("{}")
+    job_id = import_jobs.create_job(db, import_jobs.KIND_RH_QUALIFICATION, event_id, "big.json", 2)
+
+    recovered = []
+
+    def slow_read(name):
+        # разбор дольше IMPORT_STALE_SECONDS; восстановление идёт рядом
+        session = sessionmaker(autoflush=False, bind=engine)()
+        try:
+            for _ in range(8):
+                time.sleep(0.1)
+                recovered.extend(import_jobs.recover_stale_jobs(session))
+                job = session.get(ImportJob, job_id)
+                assert job.status == PARSING
+                session.expire_all()
+        finally:
+            session.close()
+        raise import_jobs.ImportJobError("stop")
+
+    monkeypatch.setattr(import_jobs, "read_payload", slow_read)
+    asyncio.run(import_jobs.JobQueue().process(job_id))
+
+    db.expire_all()
+    job = db.get(ImportJob, job_id)
+    assert (job.status, job.error, job.attempts) == (FAILED, "stop", 1)
+    assert recovered == []
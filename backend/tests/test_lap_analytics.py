@@ -0,0 +1,58 @@
+# backend/tests/test_lap_analytics.py
+
+import numpy as np
+import pytest
+
+from backend.app.services.lap_analytics import _group_stats
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _expected(values, groups, count):
+    """То же по группам по отдельности — через numpy.percentile и std."""
+    result = {name: [] for name in ("best", "mean", "stdev", *(f"p{q}" for q in PERCENTILES))}
+    for group in range(count):
+        part = values[groups == group]
+        if not part.size:
+            for items in result.values():
+                items.append(np.nan)
+            continue
+        result["best"].append(part.min())
+        result["mean"].append(part.mean())
+        result["stdev"].append(part.std())
+        for q in PERCENTILES:
+            result[f"p{q}"].append(np.percentile(part, q))
+    return {name: np.array(items) for name, items in result.items()}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_group_stats_match_numpy(seed):
+    rng = np.random.default_rng(seed)
+    count = 12
+    sizes = rng.integers(0, 9, size=count)
+    sizes[rng.integers(count)] = 0  # хотя бы одна пустая группа
+    groups = np.repeat(np.arange(count), sizes)
+    rng.shuffle(groups)
+    values = rng.integers(9_000, 40_000, size=groups.size).astype(np.float64)
+
+    stats = _group_stats(values, groups, count)
+    expected = _expected(values, groups, count)
+
+    assert stats["count"].tolist() == sizes.tolist()
+    for name, want in expected.items():
+        np.testing.assert_allclose(stats[name], want, rtol=1e-9, atol=1e-6, err_msg=name)
+
+
+def test_group_stats_single_value_and_ties():
+    values = np.array([13_000.0, 15_000.0, 15_000.0, 15_000.0])
+    groups = np.array([0, 1, 1, 1])
+    stats = _group_stats(values, groups, 2)
+    assert stats["best"].tolist() == [13_000.0, 15_000.0]
+    assert stats["p10"].tolist() == [13_000.0, 15_000.0]
+    assert stats["stdev"].tolist() == [0.0, 0.0]
+
+
+def test_group_stats_without_laps():
+    stats = _group_stats(np.array([], dtype=np.float64), np.array([], dtype=np.intp), 3)
+    assert stats["count"].tolist() == [0, 0, 0]
+    assert np.isnan(stats["p50"]).all() and np.isnan(stats["mean"]).all()
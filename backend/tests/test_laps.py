@@ -0,0 +1,84 @@
+# backend/tests/test_laps.py
+
+import io
+import json
+import sys
+
+import pytest
+
+from backend.app.services import laps, rh_json
+
+
+@pytest.fixture(autouse=True)
+def builtin_scanner(monkeypatch):
+    monkeypatch.setattr(rh_json, "ijson", None)
+
+
+def test_pack_is_little_endian_uint32():
+    assert laps.pack([1, 2**32 - 1]) == b"\x01\x00\x00\x00\xff\xff\xff\xff"
+    assert laps.pack([]) == b""
+
+
+@pytest.mark.parametrize("values", [[], [0], [14_250, 13_998, 61_000], [2**32 - 1]])
+def test_unpack_round_trip(values):
+    assert list(laps.unpack(laps.pack(values))) == values
+
+
+def test_unpack_is_a_view_without_copy():
+    if sys.byteorder != "little":
+        pytest.skip("на big-endian unpack копирует")
+    view = laps.unpack(laps.pack([5, 6]))
+    assert isinstance(view, memoryview)
+    assert view.format == laps.TYPECODE and view.itemsize == 4
+
+
+def _lap(lap_id, ms, deleted=False):
+    return {"id": lap_id, "lap_time": ms, "deleted": deleted}
+
+
+def _export(heats, nested=False):
+    data = {"results": {"heats": heats}} if nested else {"heats": heats}
+    return io.BytesIO(json.dumps(data).encode())
+
+
+HEATS = {
+    "3": {
+        "heat_id": 3,
+        "displayname": "Heat 3",
+        "rounds": [
+            {
+                "id": 7,
+                "nodes": [
+                    {
+                        "callsign": "Ёж",
+                        "laps": [
+                            _lap(0, 2_100.4),
+                            _lap(1, 14_250.6),
+                            _lap(2, 99_999, deleted=True),
+                            _lap(3, 13_998),
+                        ],
+                    },
+                    {"callsign": "", "laps": [_lap(1, 15_000)]},
+                    {"callsign": "Пусто", "laps": []},
+                ],
+            },
+            {"nodes": [{"callsign": "Ворон", "laps": [_lap(1, 20_000), {"lap_time": "bad"}]}]},
+        ],
+    },
+}
+
+
+@pytest.mark.parametrize("nested", [False, True])
+def test_read_laps(nested):
+    series = laps.read_laps(_export(HEATS, nested))
+    got = [(s.callsign, s.heat_id, s.round_id, s.heat_name, s.holeshot_ms, list(s.laps)) for s in series]
+    assert got == [
+        # круг 0 — holeshot, удалённый круг пропущен, мс округляются
+        ("Ёж", 3, 7, "Heat 3", 2_100, [14_251, 13_998]),
+        # раунд без id — номер по порядку
+        ("Ворон", 3, 2, "Heat 3", None, [20_000]),
+    ]
+
+
+def test_read_laps_without_heats():
+    assert laps.read_laps(io.BytesIO(b'{"pilots": {}}')) == []
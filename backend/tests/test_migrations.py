@@ -0,0 +1,17 @@
+# backend/tests/test_migrations.py
+
+from backend.app import migrations
+
+
+def test_latest_version(engine):
+    with engine.connect() as conn:
+        assert migrations.current_version(conn) == migrations.latest_version()
+    assert migrations.pending(engine) == []
+
+
+def test_hot_queries_use_indexes(engine):
+    report = migrations.check_query_plans(engine)
+    assert [query.name for query, _plan, _problems in report] == [
+        query.name for query in migrations.hot_queries()
+    ]
+    assert {query.name: problems for query, _plan, problems in report if problems} == {}
@@ -0,0 +1,69 @@
+# backend/tests/test_posters.py
+
+import io
+
+import pytest
+
+from backend.app.services import posters
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture(autouse=True)
+def poster_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(posters, "POSTER_DIR", tmp_path)
+    monkeypatch.setattr(posters.settings, "POSTER_WIDTHS", (480, 960))
+    posters._variants.clear()
+    return tmp_path
+
+
+def _jpeg(width=1200, height=800) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(buf, "JPEG")
+    return buf.getvalue()
+
+
+def test_save_poster_stores_original_and_variants(poster_dir):
+    data = _jpeg()
+    key = posters.save_poster(io.BytesIO(data))
+    assert key.endswith(".jpg")
+    assert (poster_dir / key).read_bytes() == data
+    assert posters.available_variants(key) == (480, 960)
+    # та же картинка ещё раз — тот же ключ, ничего нового
+    assert posters.save_poster(io.BytesIO(data)) == key
+    assert len(list(poster_dir.iterdir())) == 3
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        _jpeg()[:2000],  # обрезанная загрузка
+        b"\x89PNG\r\n\x1a\n" + b"\x00" * 64,  # подпись PNG, внутри мусор
+        _jpeg(200, 100)[:300],  # мельче вариантов: проверяется сам оригинал
+    ],
+    ids=["truncated", "garbage", "small-truncated"],
+)
+def test_unreadable_image_is_rejected_and_cleaned_up(poster_dir, data):
+    with pytest.raises(posters.PosterError):
+        posters.save_poster(io.BytesIO(data))
+    assert list(poster_dir.iterdir()) == []
+
+
+def test_not_an_image(poster_dir):
+    with pytest.raises(posters.PosterError):
+        posters.save_poster(io.BytesIO(b"<html>"))
+    with pytest.raises(posters.PosterError):
+        posters.save_poster(io.BytesIO(b""))
+    assert list(poster_dir.iterdir()) == []
+
+
+def test_failed_variant_removes_partial_files(poster_dir, monkeypatch):
+    def broken_save(self, fp, *args, **kwargs):
+        open(fp, "wb").write(b"partial")
+        raise OSError("disk full")
+
+    data = _jpeg()
+    monkeypatch.setattr(Image.Image, "save", broken_save)
+    with pytest.raises(posters.PosterError):
+        posters.save_poster(io.BytesIO(data))
+    assert list(poster_dir.iterdir()) == []
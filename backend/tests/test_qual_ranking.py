@@ -0,0 +1,80 @@
+# backend/tests/test_qual_ranking.py
+
+from backend.app.services.qual_ranking import RANKING_RULES, RankingRule, rank_rows
+
+DEFAULT = RANKING_RULES["default"]
+
+
+def row(best3=None, consec=None, best_lap=None, laps=None, attempts=None, rh=None):
+    return {
+        "best3_avg_ms": best3,
+        "consecutives_count": consec,
+        "best_lap_ms": best_lap,
+        "laps_total": laps,
+        "attempts_count": attempts,
+        "rh_position": rh,
+    }
+
+
+def test_full_series_beats_partial_and_partial_by_length():
+    rows = [
+        row(best3=30_000, consec=2, best_lap=9_000, rh=1),  # неполная серия, быстрее всех
+        row(best3=45_000, consec=3, best_lap=14_000, rh=2),
+        row(best3=40_000, consec=3, best_lap=13_000, rh=3),
+        row(best3=20_000, consec=1, best_lap=20_000, rh=4),
+    ]
+    assert rank_rows(rows, DEFAULT) == [3, 2, 1, 4]
+
+
+def test_missing_consecutives_count_is_a_full_series():
+    rows = [row(best3=41_000, rh=1), row(best3=40_000, consec=2, rh=2)]
+    assert rank_rows(rows, DEFAULT) == [1, 2]
+
+
+def test_zero_consecutives_count_is_not_a_full_series():
+    rows = [row(best3=30_000, consec=0, rh=1), row(best3=40_000, consec=3, rh=2)]
+    assert rank_rows(rows, DEFAULT) == [2, 1]
+
+
+def test_tie_breaks_best_lap_then_laps_then_rh_position():
+    rows = [
+        row(best3=40_000, consec=3, best_lap=13_500, laps=10, rh=1),
+        row(best3=40_000, consec=3, best_lap=13_000, laps=8, rh=2),
+        row(best3=40_000, consec=3, best_lap=13_500, laps=12, rh=3),
+        row(best3=40_000, consec=3, best_lap=13_500, laps=12, rh=4),
+    ]
+    assert rank_rows(rows, DEFAULT) == [4, 1, 2, 3]
+
+
+def test_untimed_pilots_get_no_rank_and_rh_zero_is_no_time():
+    rows = [
+        row(laps=0, rh=1),
+        row(best3=0, best_lap=0, rh=2),
+        row(best_lap=15_000, rh=3),
+        row(best3=40_000, consec=3, rh=4),
+    ]
+    assert rank_rows(rows, DEFAULT) == [None, None, 2, 1]
+
+
+def test_ranks_are_unique_and_dense():
+    rows = [row(best3=40_000, consec=3) for _ in range(5)]
+    assert sorted(rank_rows(rows, DEFAULT)) == [1, 2, 3, 4, 5]
+    assert rank_rows([], DEFAULT) == []
+
+
+def test_best_lap_rule():
+    rows = [
+        row(best3=40_000, consec=3, best_lap=13_500, rh=1),
+        row(best3=45_000, consec=2, best_lap=13_000, rh=2),
+    ]
+    assert rank_rows(rows, DEFAULT) == [1, 2]
+    assert rank_rows(rows, RANKING_RULES["best_lap"]) == [2, 1]
+
+
+def test_custom_series_length_and_label():
+    rule = RankingRule(consecutives=2)
+    rows = [row(best3=30_000, consec=2, rh=2), row(best3=20_000, consec=1, rh=1)]
+    assert rank_rows(rows, rule) == [1, 2]
+    assert rule.series_label(1) == "1/"
+    assert rule.series_label(2) is None
+    assert DEFAULT.series_label(None) is None
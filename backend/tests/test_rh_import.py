@@ -0,0 +1,135 @@
+# backend/tests/test_rh_import.py
+
+from datetime import date
+
+import pytest
+from sqlalchemy import event as sa_event, func, select
+
+from backend.app.models.event import Event
+from backend.app.models.pilot import Pilot
+from backend.app.models.pilot_stats import PilotStats
+from backend.app.models.qualification import QualificationResult
+from backend.app.services.rh_import import import_qualification, resolve_pilots
+
+
+def rh_row(callsign, position, best3=None, best_lap=None, laps=None):
+    return {
+        "callsign": callsign,
+        "position": position,
+        "consecutives_raw": best3,
+        "consecutives_base": 3 if best3 else None,
+        "fastest_lap_raw": best_lap,
+        "laps": laps,
+        "starts": 2,
+    }
+
+
+FIRST = [
+    rh_row("Ёж", 1, best3=40_000, best_lap=13_000, laps=12),
+    rh_row("Ворон", 2, best3=42_000, best_lap=13_500, laps=11),
+    rh_row("Сова", 3, best_lap=15_000, laps=4),
+    rh_row(None, 4),
+]
+
+
+@pytest.fixture
+def event_id(db):
+    event = Event(name="Этап", date=date(2025, 5, 1))
+    # Ёж уже летал — дважды под одним ником; берётся ранний
+    db.add_all([event, Pilot(nickname="Ёж"), Pilot(nickname="Ёж")])
+    db.commit()
+    return event.id
+
+
+def _pilot_ids(db):
+    return dict(db.execute(select(Pilot.nickname, func.min(Pilot.id)).group_by(Pilot.nickname)).all())
+
+
+def _qual(db, event_id):
+    rows = db.execute(
+        select(Pilot.nickname, QualificationResult.rank, QualificationResult.rh_position)
+        .join(Pilot, Pilot.id == QualificationResult.pilot_id)
+        .where(QualificationResult.event_id == event_id)
+        .order_by(QualificationResult.rh_position)
+    )
+    return [tuple(row) for row in rows]
+
+
+def test_import_creates_missing_pilots_and_reuses_existing(db, event_id):
+    existing = _pilot_ids(db)["Ёж"]
+    counts = import_qualification(db, event_id, FIRST)
+    db.commit()
+
+    assert counts == {"imported": 4, "pilots_created": 3, "replaced": 0}
+    ids = _pilot_ids(db)
+    assert ids["Ёж"] == existing
+    assert set(ids) == {"Ёж", "Ворон", "Сова", "Unknown"}
+    # без времени — без места
+    assert _qual(db, event_id) == [("Ёж", 1, 1), ("Ворон", 2, 2), ("Сова", 3, 3), ("Unknown", None, 4)]
+    assert db.get(PilotStats, existing).events_entered == 1
+
+
+def test_resolve_pilots_in_one_pass(db, event_id):
+    ids, created = resolve_pilots(db, ["Ёж", "Ёж", "Новый"])
+    assert created == 1
+    assert ids["Ёж"] == _pilot_ids(db)["Ёж"]
+    assert resolve_pilots(db, []) == ({}, 0)
+
+
+def test_reimport_replaces_rows(db, event_id):
+    import_qualification(db, event_id, FIRST)
+    db.commit()
+    dropped = _pilot_ids(db)["Сова"]
+    assert db.get(PilotStats, dropped).events_entered == 1
+
+    second = [
+        rh_row("Ворон", 1, best3=39_000, best_lap=12_900, laps=13),
+        rh_row("Ёж", 2, best3=40_000, best_lap=13_000, laps=12),
+    ]
+    counts = import_qualification(db, event_id, second)
+    db.commit()
+
+    assert counts == {"imported": 2, "pilots_created": 0, "replaced": 4}
+    assert _qual(db, event_id) == [("Ворон", 1, 1), ("Ёж", 2, 2)]
+    # статистика пилота, которого убрали повторным импортом, тоже пересчитана:
+    # событий у него больше нет — нет и строки
+    db.expire_all()
+    assert db.get(PilotStats, dropped) is None
+
+
+def test_failed_import_rolls_back_whole_transaction(db, event_id):
+    import_qualification(db, event_id, FIRST)
+    db.commit()
+    before_pilots = _pilot_ids(db)
+    before_qual = _qual(db, event_id)
+
+    broken = [rh_row("Новичок", 1, best3=40_000), rh_row("Ёж", 2, best3="не число")]
+    with pytest.raises(ValueError):
+        import_qualification(db, event_id, broken)
+    db.rollback()
+
+    assert _pilot_ids(db) == before_pilots
+    assert _qual(db, event_id) == before_qual
+
+
+def test_import_does_not_commit_and_query_count_is_fixed(db, engine, event_id):
+    statements = []
+    commits = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sa_event.listen(engine, "before_cursor_execute", count)
+    sa_event.listen(engine, "commit", lambda conn: commits.append(conn))
+    try:
+        import_qualification(db, event_id, FIRST[:2])
+        small = len(statements)
+        db.rollback()
+        statements.clear()
+        many = [rh_row(f"p{i}", i, best3=40_000 + i, laps=10) for i in range(1, 41)]
+        import_qualification(db, event_id, many)
+        assert len(statements) == small
+        db.rollback()
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", count)
+    assert commits == []
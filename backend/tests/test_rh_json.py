@@ -0,0 +1,121 @@
+# backend/tests/test_rh_json.py
+
+import io
+import json
+
+import pytest
+
+from backend.app.services import rh_json
+
+
+class Trickle(io.RawIOBase):
+    """Файл, отдающий не больше step байт за read(): куски рвут токены и UTF-8."""
+
+    def __init__(self, data: bytes, step: int) -> None:
+        self._data = data
+        self._pos = 0
+        self._step = step
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._data[self._pos:self._pos + min(len(buffer), self._step)]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+
+EXPORT = {
+    "pilots": {"1": {"callsign": "Пилот \"1\"", "note": "{не объект} [и не массив]"}},
+    "heats": {
+        "1": {"displayname": "Заезд 1", "rounds": [{"id": 1, "nodes": []}]},
+        "2": {"displayname": "Заезд\\2", "rounds": []},
+    },
+    "event_leaderboard": {
+        "by_consecutives": [
+            {"callsign": "Ёж", "position": 1, "consecutives": "0:41.120", "laps": 12},
+            {"callsign": "Ворон", "position": 2, "consecutives": None, "laps": 0.5e1},
+        ],
+        "meta": {"primary_leaderboard": "by_consecutives"},
+    },
+    "empty": {},
+    "numbers": [0, -1.5, 1e-3, True, False, None],
+}
+DATA = json.dumps(EXPORT, ensure_ascii=False, indent=1).encode()
+STEPS = [1, 2, 3, 7, 64, len(DATA)]
+
+
+@pytest.fixture(autouse=True, params=["builtin", "ijson"])
+def backend(request, monkeypatch):
+    # одни и те же случаи — для встроенного сканера и для ijson
+    if request.param == "builtin":
+        monkeypatch.setattr(rh_json, "ijson", None)
+    else:
+        monkeypatch.setattr(rh_json, "ijson", pytest.importorskip("ijson"))
+    return request.param
+
+
+@pytest.mark.parametrize("step", STEPS)
+def test_extract_paths_across_chunk_boundaries(step):
+    found = rh_json.extract_paths(
+        Trickle(DATA, step),
+        [*rh_json.QUAL_PATHS, ("numbers",), ("pilots", "1", "note"), ("missing",)],
+    )
+    assert found == {
+        ("event_leaderboard", "by_consecutives"): EXPORT["event_leaderboard"]["by_consecutives"],
+        ("numbers",): EXPORT["numbers"],
+        ("pilots", "1", "note"): EXPORT["pilots"]["1"]["note"],
+    }
+
+
+@pytest.mark.parametrize("step", [1, 2, 64])
+def test_extract_paths_skips_utf8_bom_and_empty_request(step):
+    data = b"\xef\xbb\xbf" + DATA
+    assert rh_json.extract_paths(Trickle(data, step), [("empty",)]) == {("empty",): {}}
+    assert list(rh_json.iter_members(Trickle(data, step), ("empty",))) == []
+    assert rh_json.extract_paths(io.BytesIO(data), []) == {}
+
+
+@pytest.mark.parametrize("step", STEPS)
+def test_iter_members_of_object(step):
+    members = list(rh_json.iter_members(Trickle(DATA, step), ("heats",)))
+    assert members == list(EXPORT["heats"].items())
+
+
+@pytest.mark.parametrize("step", STEPS)
+def test_iter_members_of_array(step):
+    path = ("event_leaderboard", "by_consecutives")
+    members = list(rh_json.iter_members(Trickle(DATA, step), path))
+    assert members == list(enumerate(EXPORT["event_leaderboard"]["by_consecutives"]))
+
+
+@pytest.mark.parametrize("path", [("missing",), ("numbers", "0"), ("empty",), ("heats", "3")])
+def test_iter_members_of_absent_or_empty_section(path):
+    assert list(rh_json.iter_members(io.BytesIO(DATA), path)) == []
+
+
+@pytest.mark.parametrize("data", [b"", b'{"a": [1, 2', b'{"a" 1}', b'{"a": [1 2]}'])
+def test_malformed_json_raises(data):
+    with pytest.raises(rh_json.RHJSONError):
+        rh_json.extract_paths(io.BytesIO(data), [("a",), ("b",)])
+
+
+def test_large_value_is_not_recopied_per_chunk(backend, monkeypatch):
+    # раздел во много раз больше куска: буфер сканера не растёт вместе с ним
+    if backend != "builtin":
+        pytest.skip("буфер встроенного сканера")
+    rows = [{"callsign": f"pilot{i}", "laps": [i, i + 0.5]} for i in range(5000)]
+    data = json.dumps({"skip": [1, "x"], "heats": rows, "tail": 1}).encode()
+    sizes = []
+    fill = rh_json._Scanner._fill
+
+    def spy(self):
+        sizes.append(len(self._buf))
+        return fill(self)
+
+    monkeypatch.setattr(rh_json._Scanner, "_fill", spy)
+    found = rh_json.extract_paths(Trickle(data, 64), [("heats",)])
+    assert found == {("heats",): rows}
+    assert len(sizes) > len(data) // 64
+    assert max(sizes) <= 128